@@ -0,0 +1,196 @@
+# aml_rules.py
+
+"""
+Motor declarativo de regras AML sobre janelas de tempo deslizantes.
+
+Cada regra declara um filtro de transações, uma janela (ex.: '24h', '3D', '7D') e uma
+condição sobre os agregados da janela (soma, quantidade, entradas, saídas e razão
+saídas/entradas). Todas as regras são avaliadas numa única passada: as transações são
+ordenadas por data uma vez, as colunas de todas as regras são acumuladas juntas
+(soma de prefixos) e cada janela vira apenas uma busca binária sobre o índice temporal.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# Regras padrão, derivadas dos detectores de estruturação, mula financeira e
+# pass-through espalhados pelos parsers.
+REGRAS_AML_PADRAO = [
+    {
+        'nome': 'pix_volume_24h',
+        'tipo': 'Volume Elevado de PIX (24h)',
+        'janela': '24h',
+        'filtro': {'descricao': r'pix'},
+        'condicao': {'soma_min': 10000},
+        'alerta': 'Alto volume movimentado via PIX em 24 horas. Verificar origem/destino dos recursos.'
+    },
+    {
+        'nome': 'pix_pequenos_24h',
+        'tipo': 'Múltiplos PIX de Baixo Valor (24h)',
+        'janela': '24h',
+        'filtro': {'descricao': r'pix', 'valor_abs_max': 500},
+        'condicao': {'qtd_min': 10},
+        'alerta': 'Muitas transferências PIX pequenas em 24 horas. Possível atividade de mula financeira.'
+    },
+    {
+        'nome': 'pequenas_saidas_3d',
+        'tipo': 'Possível Estruturação (Pequenas Saídas em 3 dias)',
+        'janela': '3D',
+        'filtro': {'fluxo': 'saida', 'valor_abs_max': 1000},
+        'condicao': {'qtd_min': 15, 'soma_min': 4500},
+        'alerta': 'Muitas saídas de baixo valor em 3 dias. Pode ser tentativa de disfarçar transações maiores.'
+    },
+    {
+        'nome': 'valores_redondos_3d',
+        'tipo': 'Valores Redondos Repetidos (3 dias)',
+        'janela': '3D',
+        'filtro': {'valor_abs_min': 1000, 'multiplo_de': 1000},
+        'condicao': {'qtd_min': 3},
+        'alerta': 'Repetição de valores redondos altos em poucos dias. Possível fracionamento de valores.'
+    },
+    {
+        'nome': 'passagem_7d',
+        'tipo': 'Pass-through (Saídas/Entradas em 7 dias)',
+        'janela': '7D',
+        'filtro': {'doc_type': 'extrato_bancario'},
+        'condicao': {'entrada_min': 10000, 'razao_saida_entrada_min': 0.95},
+        'alerta': 'Quase todo o valor recebido na semana foi repassado. Verificar origem/destino.'
+    },
+]
+
+_CONDICOES_VALIDAS = {'soma_min', 'qtd_min', 'entrada_min', 'saida_min', 'razao_saida_entrada_min'}
+_FILTROS_VALIDOS = {'fluxo', 'descricao', 'valor_abs_min', 'valor_abs_max', 'multiplo_de', 'doc_type'}
+
+
+def _validar_regra(regra: dict) -> None:
+    """Valida a estrutura declarativa de uma regra."""
+    for chave in ('nome', 'janela', 'condicao'):
+        if chave not in regra:
+            raise ValueError(f"Regra AML sem a chave obrigatória '{chave}': {regra}")
+    desconhecidas = set(regra['condicao']) - _CONDICOES_VALIDAS
+    if desconhecidas or not regra['condicao']:
+        raise ValueError(f"Condição inválida na regra '{regra['nome']}': {sorted(desconhecidas) or 'vazia'}")
+    desconhecidos = set(regra.get('filtro', {})) - _FILTROS_VALIDOS
+    if desconhecidos:
+        raise ValueError(f"Filtro inválido na regra '{regra['nome']}': {sorted(desconhecidos)}")
+    if regra.get('filtro', {}).get('fluxo') not in (None, 'entrada', 'saida'):
+        raise ValueError(f"Fluxo inválido na regra '{regra['nome']}': use 'entrada' ou 'saida'.")
+
+
+def _mascara_descricao(descricoes: np.ndarray, padrao: str) -> np.ndarray:
+    """Aplica o padrão apenas ao conjunto de descrições únicas e propaga o resultado."""
+    codigos, unicas = pd.factorize(descricoes, use_na_sentinel=True)
+    regex = re.compile(padrao, re.IGNORECASE)
+    casa_unica = np.fromiter((bool(regex.search(str(d))) for d in unicas), dtype=bool, count=len(unicas))
+    return np.where(codigos >= 0, casa_unica[np.maximum(codigos, 0)], False)
+
+
+def _mascara_filtro(filtro: dict, valores: np.ndarray, descricoes: np.ndarray, doc_types: np.ndarray) -> np.ndarray:
+    """Constrói a máscara booleana das transações que entram nos agregados da regra."""
+    mascara = np.ones(len(valores), dtype=bool)
+    absolutos = np.abs(valores)
+    if filtro.get('fluxo') == 'entrada':
+        mascara &= valores >= 0
+    elif filtro.get('fluxo') == 'saida':
+        mascara &= valores < 0
+    if 'valor_abs_min' in filtro:
+        mascara &= absolutos >= filtro['valor_abs_min']
+    if 'valor_abs_max' in filtro:
+        mascara &= absolutos < filtro['valor_abs_max']
+    if 'multiplo_de' in filtro:
+        mascara &= np.isclose(np.remainder(absolutos, filtro['multiplo_de']), 0)
+    if 'doc_type' in filtro:
+        mascara &= doc_types == filtro['doc_type']
+    if 'descricao' in filtro and mascara.any():
+        mascara &= _mascara_descricao(descricoes, filtro['descricao'])
+    return mascara
+
+
+def avaliar_regras(transactions_df: pd.DataFrame, regras: list[dict] | None = None) -> list[dict]:
+    """
+    Avalia todas as regras de janela deslizante numa única passada sobre as transações
+    ordenadas por data. Retorna um alerta por regra e por dia, no mesmo formato de
+    detectar_movimentacoes_suspeitas (DATA, TIPO, DESCRICAO, VALOR, ALERTA).
+    """
+    regras = REGRAS_AML_PADRAO if regras is None else regras
+    alertas = []
+    if transactions_df.empty or not regras:
+        return alertas
+    for regra in regras:
+        _validar_regra(regra)
+
+    datas = pd.to_datetime(transactions_df['date'], errors='coerce')
+    valores = pd.to_numeric(transactions_df['value'], errors='coerce')
+    validas = (datas.notna() & valores.notna()).to_numpy()
+    if not validas.any():
+        return alertas
+
+    # Índice temporal ordenado (uma única ordenação estável para todas as regras)
+    tempos = datas.to_numpy(dtype='datetime64[ns]')[validas]
+    ordem = np.argsort(tempos, kind='stable')
+    tempos = tempos[ordem]
+    valores = valores.to_numpy(dtype=float)[validas][ordem]
+    descricoes = transactions_df['description'].to_numpy()[validas][ordem] if 'description' in transactions_df else np.full(len(tempos), None)
+    doc_types = transactions_df['doc_type'].to_numpy()[validas][ordem] if 'doc_type' in transactions_df else np.full(len(tempos), None)
+
+    # Colunas de todas as regras numa única matriz: soma, quantidade, entradas e saídas filtradas
+    colunas = []
+    for regra in regras:
+        mascara = _mascara_filtro(regra.get('filtro', {}), valores, descricoes, doc_types)
+        colunas.append(np.where(mascara, np.abs(valores), 0.0))
+        colunas.append(mascara.astype(float))
+        colunas.append(np.where(mascara & (valores >= 0), valores, 0.0))
+        colunas.append(np.where(mascara & (valores < 0), -valores, 0.0))
+    acumulado = np.zeros((len(tempos) + 1, len(colunas)))
+    np.cumsum(np.column_stack(colunas), axis=0, out=acumulado[1:])
+
+    # Janela (t - janela, t]: o limite esquerdo de cada linha é uma busca binária no índice ordenado
+    inicios_por_janela = {}
+    for indice, regra in enumerate(regras):
+        janela = pd.Timedelta(regra['janela'])
+        if janela not in inicios_por_janela:
+            inicios_por_janela[janela] = np.searchsorted(tempos, tempos - janela.to_timedelta64(), side='right')
+        inicios = inicios_por_janela[janela]
+        agregados = acumulado[1:, 4 * indice:4 * indice + 4] - acumulado[inicios, 4 * indice:4 * indice + 4]
+        soma, qtd, entrada, saida = (agregados[:, k] for k in range(4))
+        qtd = np.rint(qtd)
+
+        condicao = regra['condicao']
+        disparou = qtd > 0
+        if 'soma_min' in condicao:
+            disparou &= soma >= condicao['soma_min']
+        if 'qtd_min' in condicao:
+            disparou &= qtd >= condicao['qtd_min']
+        if 'entrada_min' in condicao:
+            disparou &= entrada >= condicao['entrada_min']
+        if 'saida_min' in condicao:
+            disparou &= saida >= condicao['saida_min']
+        razao = np.divide(saida, entrada, out=np.zeros_like(saida), where=entrada > 0)
+        if 'razao_saida_entrada_min' in condicao:
+            disparou &= razao >= condicao['razao_saida_entrada_min']
+
+        posicoes = np.flatnonzero(disparou)
+        if not len(posicoes):
+            continue
+
+        # Um alerta por regra e por dia: a janela de maior volume daquele dia
+        dias = tempos[posicoes].astype('datetime64[D]')
+        por_dia = pd.DataFrame({'dia': dias, 'soma': soma[posicoes], 'pos': posicoes})
+        maiores = por_dia.loc[por_dia.groupby('dia', sort=True)['soma'].idxmax(), 'pos'].to_numpy()
+        for pos in maiores:
+            descricao = f"{int(qtd[pos])} transações somando R$ {soma[pos]:,.2f} na janela de {regra['janela']}"
+            if entrada[pos] > 0 or 'razao_saida_entrada_min' in condicao:
+                descricao += f" (entradas R$ {entrada[pos]:,.2f}, saídas R$ {saida[pos]:,.2f}, razão {razao[pos]:.2f})"
+            alertas.append({
+                'DATA': pd.Timestamp(tempos[pos]).strftime('%d/%m/%Y'),
+                'TIPO': regra.get('tipo', regra['nome']),
+                'DESCRICAO': descricao + '.',
+                'VALOR': f"R$ {soma[pos]:,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
+                'ALERTA': regra.get('alerta', f"Regra AML '{regra['nome']}' disparada."),
+                'REGRA': regra['nome']
+            })
+
+    return alertas
@@ -0,0 +1,294 @@
+# balance_index.py
+
+"""
+Índice de saldo acumulado das transações, ordenadas por data, e conciliação com o saldo
+informado pelo extrato.
+
+O saldo acumulado é calculado uma única vez e mantido junto com o mínimo, a contagem de
+transações com saldo negativo e os dias em que o saldo ficou negativo. Consultas de saldo
+numa data são uma busca binária (O(log n)); mínimo e dias negativos são O(1). Transações
+posteriores à última indexada são anexadas em O(k); transações mais antigas forçam a
+reconstrução do índice. O índice pode ser salvo junto aos dados do cliente (.npz), com a
+assinatura do histórico de que foi calculado: na carga, a assinatura salva é lida sozinha e
+comparada com a atual, sem recalcular o índice.
+
+Quando o parser informa o saldo do extrato (coluna 'balance'), o índice usa esse saldo como
+âncora dentro da série da conta (banco e conta): o saldo da conta em cada transação é o último
+saldo informado por ela mais os lançamentos seguintes dela, e as transações anteriores ao
+primeiro saldo informado partem do saldo de abertura deduzido dele (em vez de zero). Contas
+sem saldo informado acumulam a partir de zero. O saldo consolidado do índice é a soma dos
+saldos atuais de todas as contas: cada transação o altera pela variação do saldo da sua conta.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+_NS_POR_DIA = 86_400 * 10**9
+# Nome do arquivo do índice no diretório do cliente (ao lado das partições do TransactionStore)
+ARQUIVO_INDICE_SALDO = 'indice_saldo_extrato.npz'
+# Série das transações sem banco nem conta (e de anexar() sem `series`)
+_SERIE_SEM_CONTA = '|'
+
+
+def chaves_series(transactions_df: pd.DataFrame) -> np.ndarray:
+    """Série de saldo de cada transação: banco e conta (sem diferença de maiúsculas e espaços)."""
+    partes = [
+        transactions_df[coluna].fillna('').astype(str).str.strip().str.upper() if coluna in transactions_df.columns
+        else pd.Series('', index=transactions_df.index)
+        for coluna in ('bank', 'account')
+    ]
+    return (partes[0] + '|' + partes[1]).to_numpy(dtype=str)
+
+
+class RunningBalanceIndex:
+    """Saldo acumulado por transação, com consultas por data e métricas de saldo negativo."""
+
+    def __init__(self, datas=None, valores=None, saldos_informados=None, series=None):
+        self._n = 0
+        self._datas = np.empty(0, dtype=np.int64)  # Nanossegundos desde a época, em ordem
+        self._valores = np.empty(0, dtype=np.float64)
+        self._informados = np.empty(0, dtype=np.float64)  # Saldo do extrato (NaN se ausente)
+        self._series = np.empty(0, dtype=np.int64)  # Código da série (banco e conta) de cada transação
+        self._saldos = np.empty(0, dtype=np.float64)  # Saldo consolidado (soma das séries)
+        self._chaves_series = []  # Código -> chave da série
+        self._codigo_por_chave = {}
+        datas = np.asarray(datas if datas is not None else [], dtype='datetime64[ns]').astype(np.int64)
+        self._reconstruir(
+            datas,
+            np.asarray(valores if valores is not None else [], dtype=np.float64),
+            np.asarray(saldos_informados, dtype=np.float64) if saldos_informados is not None else np.full(len(datas), np.nan),
+            self._codificar_series(series, len(datas))
+        )
+
+    @classmethod
+    def de_transacoes(cls, transactions_df: pd.DataFrame, doc_type: str | None = 'extrato_bancario') -> 'RunningBalanceIndex':
+        """Monta o índice com as transações válidas (data e valor) do tipo de documento pedido (None = todas)."""
+        return cls(*cls._datas_valores(transactions_df, doc_type))
+
+    @staticmethod
+    def _datas_valores(transactions_df: pd.DataFrame, doc_type: str | None) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        if transactions_df.empty:
+            return np.empty(0, dtype='datetime64[ns]'), np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64), np.empty(0, dtype=str)
+        datas = pd.to_datetime(transactions_df['date'], errors='coerce')
+        valores = pd.to_numeric(transactions_df['value'], errors='coerce')
+        validas = datas.notna() & valores.notna()
+        if doc_type is not None:
+            validas &= transactions_df['doc_type'] == doc_type
+        validas = validas.to_numpy()
+        if 'balance' in transactions_df.columns:
+            informados = pd.to_numeric(transactions_df['balance'], errors='coerce').to_numpy(dtype=np.float64)[validas]
+        else:
+            informados = np.full(int(validas.sum()), np.nan)
+        series = chaves_series(transactions_df)[validas]
+        return datas.to_numpy(dtype='datetime64[ns]')[validas], valores.to_numpy(dtype=np.float64)[validas], informados, series
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def saldo_minimo(self) -> float:
+        """Menor saldo acumulado (0.0 se não houver transações)."""
+        return self._minimo
+
+    @property
+    def contagem_negativos(self) -> int:
+        """Quantidade de transações após as quais o saldo ficou negativo."""
+        return self._contagem_negativos
+
+    @property
+    def dias_negativos(self) -> int:
+        """Quantidade de dias distintos com alguma transação deixando o saldo negativo."""
+        return len(self._dias_negativos)
+
+    @property
+    def saldo_final(self) -> float:
+        return float(self._saldos[self._n - 1]) if self._n else 0.0
+
+    def saldo_em(self, data) -> float:
+        """Saldo acumulado ao fim do instante `data` (0.0 antes da primeira transação)."""
+        posicao = np.searchsorted(self._datas[:self._n], pd.Timestamp(data).as_unit('ns').value, side='right')
+        return float(self._saldos[posicao - 1]) if posicao else 0.0
+
+    def saldos(self) -> pd.Series:
+        """Saldo acumulado após cada transação, indexado pela data."""
+        return pd.Series(self._saldos[:self._n].copy(), index=pd.DatetimeIndex(self._datas[:self._n].view('datetime64[ns]')), name='running_balance')
+
+    @property
+    def ancorado(self) -> bool:
+        """Se algum saldo informado pelo extrato ancora os saldos do índice."""
+        return bool(self._series_ancoradas)
+
+    def anexar(self, datas, valores, saldos_informados=None, series=None) -> None:
+        """
+        Acrescenta transações (`series`: chave da conta de cada uma; None = uma conta só). Se
+        todas forem posteriores à última indexada (e não trouxerem o primeiro saldo informado de
+        uma conta já indexada, que mudaria o saldo de abertura dela), a atualização é O(k).
+        """
+        datas = np.asarray(datas, dtype='datetime64[ns]').astype(np.int64)
+        valores = np.asarray(valores, dtype=np.float64)
+        informados = np.asarray(saldos_informados, dtype=np.float64) if saldos_informados is not None else np.full(len(datas), np.nan)
+        codigos = self._codificar_series(series, len(datas))
+        if not len(datas):
+            return
+        ordem = np.argsort(datas, kind='stable')
+        datas, valores, informados, codigos = datas[ordem], valores[ordem], informados[ordem], codigos[ordem]
+
+        fora_de_ordem = self._n and datas[0] < self._datas[self._n - 1]
+        series_com_saldo = np.unique(codigos[~np.isnan(informados)]).tolist()
+        nova_abertura = any(codigo in self._ultimo_por_serie and codigo not in self._series_ancoradas for codigo in series_com_saldo)
+        if fora_de_ordem or nova_abertura:
+            # Os saldos já indexados mudam: reconstrói tudo
+            self._reconstruir(
+                np.concatenate([self._datas[:self._n], datas]),
+                np.concatenate([self._valores[:self._n], valores]),
+                np.concatenate([self._informados[:self._n], informados]),
+                np.concatenate([self._series[:self._n], codigos])
+            )
+            return
+
+        saldos = self._consolidar(valores, informados, codigos, self.saldo_final)
+        self._garantir_capacidade(self._n + len(datas))
+        self._datas[self._n:self._n + len(datas)] = datas
+        self._valores[self._n:self._n + len(datas)] = valores
+        self._informados[self._n:self._n + len(datas)] = informados
+        self._series[self._n:self._n + len(datas)] = codigos
+        self._saldos[self._n:self._n + len(datas)] = saldos
+        self._n += len(datas)
+        self._atualizar_metricas(datas, saldos)
+
+    def anexar_transacoes(self, transactions_df: pd.DataFrame, doc_type: str | None = 'extrato_bancario') -> None:
+        self.anexar(*self._datas_valores(transactions_df, doc_type))
+
+    def salvar(self, caminho: str, assinatura: str = '') -> None:
+        """Grava o índice; `assinatura` identifica o histórico de origem (ex.: TransactionStore.assinatura())."""
+        np.savez(caminho, datas=self._datas[:self._n], valores=self._valores[:self._n], informados=self._informados[:self._n],
+                 series=self._series[:self._n], chaves_series=np.array(self._chaves_series, dtype=str),
+                 assinatura=np.array(assinatura))
+
+    @staticmethod
+    def assinatura_salva(caminho: str) -> str | None:
+        """Assinatura gravada com o índice (None se o arquivo não existe ou não a tem), sem ler os arrays."""
+        if not os.path.exists(caminho):
+            return None
+        with np.load(caminho) as dados:  # O .npz só lê do disco os membros acessados
+            return str(dados['assinatura']) if 'assinatura' in dados.files else None
+
+    @classmethod
+    def carregar(cls, caminho: str) -> 'RunningBalanceIndex':
+        with np.load(caminho) as dados:
+            informados = dados['informados'] if 'informados' in dados.files else None
+            series = dados['chaves_series'][dados['series']] if 'series' in dados.files else None
+            return cls(dados['datas'].view('datetime64[ns]'), dados['valores'], informados, series)
+
+    def _codificar_series(self, series, tamanho: int) -> np.ndarray:
+        """Códigos inteiros das chaves de série (novas chaves recebem o próximo código)."""
+        if series is None:
+            series = np.full(tamanho, _SERIE_SEM_CONTA)
+        codigos, chaves = pd.factorize(np.asarray(series, dtype=str))
+        for chave in chaves:
+            if chave not in self._codigo_por_chave:
+                self._codigo_por_chave[chave] = len(self._chaves_series)
+                self._chaves_series.append(chave)
+        return np.array([self._codigo_por_chave[chave] for chave in chaves], dtype=np.int64)[codigos] if len(chaves) else np.empty(0, dtype=np.int64)
+
+    def _consolidar(self, valores: np.ndarray, informados: np.ndarray, codigos: np.ndarray, saldo_anterior: float) -> np.ndarray:
+        """
+        Saldo consolidado após cada lançamento (em ordem de data): cada série é ancorada no
+        próprio saldo informado e o consolidado soma a variação do saldo da série de cada linha.
+        """
+        variacoes = np.empty(len(valores), dtype=np.float64)
+        for codigo in np.unique(codigos).tolist():
+            da_serie = codigos == codigo
+            anterior = self._ultimo_por_serie.get(codigo)
+            saldos_serie = _saldos_ancorados(valores[da_serie], informados[da_serie], anterior or 0.0, retroagir=anterior is None)
+            variacoes[da_serie] = np.diff(saldos_serie, prepend=anterior or 0.0)
+            self._ultimo_por_serie[codigo] = float(saldos_serie[-1])
+            if not np.isnan(informados[da_serie]).all():
+                self._series_ancoradas.add(codigo)
+        return saldo_anterior + np.cumsum(variacoes)
+
+    def _reconstruir(self, datas: np.ndarray, valores: np.ndarray, informados: np.ndarray, codigos: np.ndarray) -> None:
+        ordem = np.argsort(datas, kind='stable')  # Empates mantêm a ordem de chegada
+        self._datas, self._valores, self._informados, self._series = datas[ordem], valores[ordem], informados[ordem], codigos[ordem]
+        self._ultimo_por_serie = {}  # Código da série -> saldo da série após sua última transação
+        self._series_ancoradas = set()
+        self._saldos = self._consolidar(self._valores, self._informados, self._series, 0.0)
+        self._n = len(self._datas)
+        self._minimo = 0.0
+        self._contagem_negativos = 0
+        self._dias_negativos = set()
+        self._atualizar_metricas(self._datas, self._saldos)
+
+    def _atualizar_metricas(self, datas: np.ndarray, saldos: np.ndarray) -> None:
+        if not len(saldos):
+            return
+        minimo = float(saldos.min())
+        self._minimo = minimo if self._n == len(saldos) else min(self._minimo, minimo)
+        negativos = saldos < 0
+        self._contagem_negativos += int(negativos.sum())
+        self._dias_negativos.update(np.unique(datas[negativos] // _NS_POR_DIA).tolist())
+
+    def _garantir_capacidade(self, tamanho: int) -> None:
+        if tamanho <= len(self._datas):
+            return
+        capacidade = max(tamanho, 2 * len(self._datas), 1024)
+        for nome in ('_datas', '_valores', '_informados', '_series', '_saldos'):
+            atual = getattr(self, nome)
+            novo = np.empty(capacidade, dtype=atual.dtype)
+            novo[:self._n] = atual[:self._n]
+            setattr(self, nome, novo)
+
+
+def _saldos_ancorados(valores: np.ndarray, informados: np.ndarray, saldo_anterior: float, retroagir: bool) -> np.ndarray:
+    """
+    Saldo após cada lançamento: saldo anterior mais o acumulado, corrigido pelo último saldo
+    informado (NaN = não informado). Com `retroagir`, os lançamentos antes do primeiro saldo
+    informado também são corrigidos por ele (saldo de abertura deduzido do extrato).
+    """
+    acumulado = saldo_anterior + np.cumsum(valores)
+    ajuste = pd.Series(informados - acumulado).ffill()
+    if retroagir:
+        ajuste = ajuste.bfill()
+    return acumulado + ajuste.fillna(0.0).to_numpy()
+
+
+def reconciliar_saldos(transacoes: pd.DataFrame, por: str | None = 'documento', tolerancia: float = 0.005) -> pd.DataFrame:
+    """
+    Confere, linha a linha e na ordem do extrato, se saldo anterior + lançamentos == saldo
+    informado. Só as linhas com 'balance' são conferidas; lançamentos sem saldo entre elas
+    entram na soma. Com `por`, cada grupo (documento) é conferido separadamente.
+
+    Acrescenta à cópia retornada:
+    - 'saldo_esperado' e 'diferenca_saldo' (informado - esperado; NaN na primeira linha do grupo);
+    - 'conciliacao': 'ok', 'lacuna' (diferença = soma dos lançamentos que faltam) ou
+      'duplicada' (linha idêntica à anterior, inclusive no saldo; fica fora da soma para não
+      acusar lacuna nas linhas seguintes); NA se não conferida.
+    """
+    resultado = transacoes.copy()
+    saldos = pd.to_numeric(resultado['balance'], errors='coerce') if 'balance' in resultado.columns else pd.Series(np.nan, index=resultado.index)
+    valores = pd.to_numeric(resultado['value'], errors='coerce').fillna(0.0)
+    grupos = resultado[por] if por is not None and por in resultado.columns else pd.Series(0, index=resultado.index)
+
+    # Linha repetida: mesma data, descrição, valor e saldo da linha conferida anterior
+    conferidas = saldos.notna()
+    chave = [c for c in ('date', 'description', 'value') if c in resultado.columns]
+    linhas = resultado.loc[conferidas, chave].assign(balance=saldos[conferidas])
+    repetida = (linhas == linhas.groupby(grupos[conferidas], sort=False).shift()).all(axis=1)
+    repetida = repetida.reindex(resultado.index, fill_value=False)
+
+    conferidas &= ~repetida
+    acumulado = valores.where(~repetida, 0.0).groupby(grupos, sort=False).cumsum()
+    saldo_anterior = saldos[conferidas].groupby(grupos[conferidas], sort=False).shift()
+    acumulado_anterior = acumulado[conferidas].groupby(grupos[conferidas], sort=False).shift()
+
+    resultado['saldo_esperado'] = (saldo_anterior + acumulado[conferidas] - acumulado_anterior).reindex(resultado.index)
+    resultado['diferenca_saldo'] = saldos - resultado['saldo_esperado']
+
+    diferenca = resultado['diferenca_saldo'].abs()
+    resultado['conciliacao'] = pd.Series(
+        np.select([repetida, diferenca <= tolerancia, diferenca > tolerancia], ['duplicada', 'ok', 'lacuna'], default=''),
+        index=resultado.index
+    ).replace('', pd.NA)
+    return resultado
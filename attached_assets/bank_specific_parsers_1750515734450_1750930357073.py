@@ -3,12 +3,13 @@
 import re
 from datetime import datetime
 import pandas as pd
+from transaction_regex import OrcamentoRegex, descricao_ate
 
 # Importa as funções auxiliares de parsing de data e valor
 # from data_parsing import parse_date_string, parse_financial_value, _identificar_tipo_transacao_simples
 
 
-def parse_nubank_extrato_pdf(text_content: str, doc_type: str) -> list[dict]:
+def parse_nubank_extrato_pdf(text_content: str, doc_type: str, orcamento: OrcamentoRegex = None) -> list[dict]:
     """
     Parser específico para extratos do Nubank em PDF (texto extraído via pdfplumber ou OCR).
     Adapta a saída para o formato de transação padrão do sistema.
@@ -16,14 +17,19 @@ def parse_nubank_extrato_pdf(text_content: str, doc_type: str) -> list[dict]:
     transactions = []
     lines = text_content.split('\n')
     current_year = datetime.now().year
+    orcamento = orcamento or OrcamentoRegex()
+
+    # Padrão Nubank: DD/MM - Descrição - R$ VALOR (pode haver saldo no final da linha)
+    # Ex: 12/03 - Pix recebido de FULANO - R$ 20.000,00 Saldo R$ 5.851,34
+    # Padrão flexível para capturar o valor corretamente, com ou sem "R$"; ancorado no início
+    # da linha e possessivo, para não retroceder em linhas enormes de OCR
+    padrao_nubank = re.compile(r'(\d{1,2}/\d{1,2})[ \t]++-[ \t]++' + descricao_ate(r'-[ \t]*+R?+\$?+[ \t]*+(-?[\d.,]++)', r'\S'))
 
     for line in lines:
+        if orcamento.vencido():
+            break
         line_clean = line.strip()
-        # Padrão Nubank: DD/MM - Descrição - R$ VALOR (pode haver saldo no final da linha)
-        # Ex: 12/03 - Pix recebido de FULANO - R$ 20.000,00 Saldo R$ 5.851,34
-        # Padrão flexível para capturar o valor corretamente, com ou sem "R$"
-        padrao_nubank = r'(\d{1,2}/\d{1,2})\s+-\s+(.+?)\s+-\s*R?\$?\s*([-]?[\d\.,]+)(?:\s+Saldo R?\$?\s*[\d\.,]+)?'
-        match = re.search(padrao_nubank, line_clean)
+        match = padrao_nubank.match(line_clean)
 
         if match:
             data_raw = match.group(1)
@@ -54,7 +60,7 @@ def parse_nubank_extrato_pdf(text_content: str, doc_type: str) -> list[dict]:
             })
     return transactions
 
-def parse_c6_fatura_pdf(text_content: str, doc_type: str) -> list[dict]:
+def parse_c6_fatura_pdf(text_content: str, doc_type: str, orcamento: OrcamentoRegex = None) -> list[dict]:
     """
     Parser específico para faturas do C6 Bank em PDF (texto extraído via pdfplumber ou OCR).
     Adapta a saída para o formato de transação padrão do sistema.
@@ -62,8 +68,24 @@ def parse_c6_fatura_pdf(text_content: str, doc_type: str) -> list[dict]:
     transactions = []
     lines = text_content.split('\n')
     current_year = datetime.now().year
+    orcamento = orcamento or OrcamentoRegex()
+    
+    # Padrões para transações de fatura C6 (ancorados no início da linha e possessivos):
+    # 1. "DD MMM Estabelecimento R$ VALOR" (comum em resumos de fatura)
+    # Ex: "01 mai IFD IMPERIO DO CALDO L 102,99"
+    # 2. Linhas de tabelas OCR com "Data Tipo Descrição Valor" (do seu extrato C6 como "Débito de Cartão")
+    # Ex: "12/03 Débito de Cartão MEEP PA CLUBE NAUTICO SETE LAGOAS BRA R$ 31,00"
+    # 3. Inclusão de Pagamento/Estorno: "DD MMM Inclusao de Pagamento R$ VALOR"
+    padrao_fatura_compra = re.compile(r'(\d{1,2}[ \t]++[A-Za-z]{3,}+)[ \t]++' + descricao_ate(r'R?+\$?+[ \t]*+([\d.,]++)', r'\S'), re.IGNORECASE)
+    padrao_tabular_extrato_style = re.compile(
+        r'(\d{2}/\d{2})[ \t]++(Entrada PIX|Saida PIX|Débito de Cartão|Pagamento|Outros gastos)[ \t]++'
+        + descricao_ate(r'(R\$?+[ \t]*+-?[\d.,]++)', r'\S'),
+        re.IGNORECASE
+    )
     
     for line in lines:
+        if orcamento.vencido():
+            break
         line_clean = line.strip()
         
         # Ignorar linhas de cabeçalho, rodapé e resumos que não são transações individuais de compra/crédito
@@ -75,18 +97,8 @@ def parse_c6_fatura_pdf(text_content: str, doc_type: str) -> list[dict]:
         ]):
             continue
         
-        # Padrões para transações de fatura C6:
-        # 1. "DD MMM Estabelecimento R$ VALOR" (comum em resumos de fatura)
-        # Ex: "01 mai IFD IMPERIO DO CALDO L 102,99"
-        # 2. Linhas de tabelas OCR com "Data Tipo Descrição Valor" (do seu extrato C6 como "Débito de Cartão")
-        # Ex: "12/03 Débito de Cartão MEEP PA CLUBE NAUTICO SETE LAGOAS BRA R$ 31,00"
-        # 3. Inclusão de Pagamento/Estorno: "DD MMM Inclusao de Pagamento R$ VALOR"
-        
-        padrao_fatura_compra = r'(\d{1,2}\s+[A-Za-z]{3,})\s+(.+?)\s+R?\$?\s*([\d\.,]+)'
-        padrao_tabular_extrato_style = r'(\d{2}/\d{2})\s+(Entrada PIX|Saida PIX|Débito de Cartão|Pagamento|Outros gastos)\s+(.+?)\s+(R\$?\s*[-]?[\d\.,]+)'
-        
-        match_fatura_compra = re.search(padrao_fatura_compra, line_clean, re.IGNORECASE)
-        match_tabular_extrato = re.search(padrao_tabular_extrato_style, line_clean, re.IGNORECASE)
+        match_fatura_compra = padrao_fatura_compra.match(line_clean)
+        match_tabular_extrato = padrao_tabular_extrato_style.match(line_clean)
 
         data_raw, description, value_str, original_type_op = None, None, None, None
 
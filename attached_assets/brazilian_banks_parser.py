@@ -12,152 +12,192 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 import json
 
+from aml_rules import avaliar_regras
+from keyword_matcher import KeywordMatcher, mascara_palavras_chave
+from parser_registry import REGISTRO_PARSERS, carregar_funcao
+from transaction_regex import OrcamentoRegex, descricao_ate, padrao_linha
+
+def _compilar_padroes_linha(padroes: List[str]) -> tuple[re.Pattern, list[int]]:
+    """
+    Junta padrões de linha (data, descrição, valor) numa única regex ancorada no início de cada
+    linha: a linha gera no máximo uma transação, a da primeira alternativa que casar.
+    Retorna a regex e o número do primeiro grupo (data) de cada alternativa.
+    """
+    alternativas, grupos_iniciais, grupo = [], [], 1
+    for i, padrao in enumerate(padroes):
+        alternativas.append(f'(?P<alt{i}>{padrao})')
+        grupos_iniciais.append(grupo + 1)
+        grupo += 1 + re.compile(padrao).groups
+    return re.compile(r'^[ \t]*+(?:' + '|'.join(alternativas) + ')', re.MULTILINE), grupos_iniciais
+
+
 class BrazilianBanksParser:
     """Parser unificado para todos os bancos brasileiros"""
     
+    # Palavras-chave de apostas compiladas uma única vez para todas as instâncias
+    GAMBLING_MATCHER = KeywordMatcher(['BET', 'CASA', 'JOGO', 'APOSTA', 'CASINO', 'BINGO', 'POKER'], normalizar=str.upper)
+    
+    # Linhas genéricas "data descrição valor"; a data completa vem antes da curta, que também a casaria
+    GENERIC_STATEMENT_LINE = _compilar_padroes_linha([
+        r'(\d{2}/\d{2}/\d{4})[ \t]++' + descricao_ate(r'([\d.,]++)'),
+        r'(\d{2}-\d{2}-\d{4})[ \t]++' + descricao_ate(r'([\d.,]++)'),
+        r'(\d{2}/\d{2})[ \t]++' + descricao_ate(r'([\d.,]++)'),
+    ])
+    GENERIC_CREDIT_CARD_LINE = _compilar_padroes_linha([
+        r'(\d{2}/\d{2})[ \t]++' + descricao_ate(r'([\d.,]++)'),
+        r'(\d{2} [A-Z]{3})[ \t]++' + descricao_ate(r'R\$[ \t]*+([\d.,]++)', r'[^R$\s]'),
+        r'(\d{2}-\d{2})[ \t]++' + descricao_ate(r'([\d.,]++)'),
+    ])
+    
+    # Linhas de transação por banco, ancoradas no início da linha e possessivas (custo linear)
+    # Itaú: data | descrição | valor C/D | saldo C/D
+    ITAU_LINE = padrao_linha(r'(\d{2}/\d{2}/\d{4})[ \t]++' + descricao_ate(r'([\d.,]++)[ \t]++([CD])[ \t]++([\d.,]++)[ \t]++([CD])'))
+    # Bradesco: data | descrição | documento (opcional) | valor | saldo (opcional)
+    BRADESCO_LINE = padrao_linha(r'(\d{2}/\d{2})[ \t]++' + descricao_ate(r'(?>(\d++)[ \t]++(?=[\d.,]))?+([\d.,]++)[-+]?+(?:[ \t]*+([\d.,]++))?+'))
+    # Santander (e formato alternativo do BB): data | descrição | valor C/D
+    SANTANDER_LINE = padrao_linha(r'(\d{2}/\d{2}/\d{4})[ \t]++' + descricao_ate(r'([\d.,]++)[ \t]++([CD])'))
+    # BB: data | data contábil | tipo | descrição | R$ valor
+    BB_LINE = padrao_linha(r'(\d{2}/\d{2})[ \t]++(\d{2}/\d{2})[ \t]++(Entrada|Saída|Débito de Cartão)[ \t]++' + descricao_ate(r'R\$[ \t]*+(-?[\d.,]++)', r'[^R\s]'))
+    # Nubank e Inter: data | descrição | R$ valor
+    NUBANK_LINE = padrao_linha(r'(\d{2}/\d{2}/\d{4})[ \t]++' + descricao_ate(r'R\$[ \t]*+([\d.,]++)', r'[^R$\s]'))
+    # InfinitePay: [data] | Pix | Para/De nome | valor com sinal
+    INFINITEPAY_PIX_LINE = padrao_linha(r'(\d{2}/\d{2}/\d{4})[ \t]++(?:Saldo do dia|Pix)[ \t]++(?:Para|De)[ \t]++' + descricao_ate(r'([+-]?+[\d.,]++)', r'[^0-9+\-\s]'))
+    INFINITEPAY_SIMPLE_PIX_LINE = padrao_linha(r'Pix[ \t]++(?:Para|De)[ \t]++' + descricao_ate(r'([+-]?+[\d.,]++)', r'[^0-9+\-\s]'))
+    # Stone: data | tipo | lançamento | valor | saldo | contraparte
+    STONE_LINE = padrao_linha(r'(\d{2}/\d{2}/\d{4})[ \t]++(Crédito|Débito)[ \t]++' + descricao_ate(r'([\d.,]++)[ \t]++([\d.,]++)[ \t]*+([^0-9\n]*+)'))
+    # PicPay: fatura (data curta | descrição | valor) e extrato (data | descrição | valor com sinal)
+    PICPAY_CARD_LINE = padrao_linha(r'(\d{2}/\d{2})[ \t]++' + descricao_ate(r'([\d.,]++)'))
+    PICPAY_TRANSFER_LINE = padrao_linha(r'(\d{2}/\d{2}/\d{4})[ \t]++' + descricao_ate(r'([+-]?+[\d.,]++)'))
+    
+    # Parser de extrato de cada banco; os bancos fora daqui usam o parser genérico
+    STATEMENT_PARSERS = {
+        'caixa': '_parse_caixa_transactions',
+        'itau': '_parse_itau_transactions',
+        'bradesco': '_parse_bradesco_transactions',
+        'santander': '_parse_santander_transactions',
+        'bb': '_parse_bb_transactions',
+        'nubank': '_parse_nubank_transactions',
+        'inter': '_parse_inter_transactions',
+        'infinitepay': '_parse_infinitepay_transactions',
+        'stone': '_parse_stone_transactions',
+        'picpay': '_parse_picpay_transactions',
+    }
+    
     def __init__(self):
         self.bank_patterns = self._initialize_bank_patterns()
         self.transaction_patterns = self._initialize_transaction_patterns()
         self.credit_card_patterns = self._initialize_credit_card_patterns()
+        self.orcamento_regex = OrcamentoRegex()
     
     def _initialize_bank_patterns(self) -> Dict[str, Dict]:
-        """Padrões de identificação dos bancos brasileiros"""
+        """
+        Padrões de conta e indicadores dos extratos de cada banco, pelo código do banco. Os
+        identificadores usados para reconhecer o banco ficam no registro de parsers (BANCOS_PADRAO).
+        """
         return {
             'itau': {
-                'identifiers': ['ITAÚ', 'ITAU', 'BANCO ITAÚ', 'UNIBANCO', '341'],
                 'account_pattern': r'AG\.?\s*(\d{4})\s*C/C\.?\s*(\d{5,}-\d)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['TRANSFERENCIA', 'PIX', 'TED', 'DOC', 'DEBITO', 'CREDITO']
             },
             'bradesco': {
-                'identifiers': ['BRADESCO', 'BANCO BRADESCO', '237'],
                 'account_pattern': r'AG\.?\s*(\d{4})-(\d)\s*CC\.?\s*(\d{6,}-\d)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['TRANSF', 'PIX', 'TED', 'DOC', 'COMPRA', 'SAQUE']
             },
             'santander': {
-                'identifiers': ['SANTANDER', 'BANCO SANTANDER', '033'],
                 'account_pattern': r'AG\.?\s*(\d{4})\s*CC\.?\s*(\d{8})',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['TRANSFERENCIA', 'PIX', 'TED', 'COMPRA DEBITO', 'SAQUE']
             },
             'caixa': {
-                'identifiers': ['CAIXA', 'CAIXA ECONÔMICA', 'CEF', '104'],
                 'account_pattern': r'(\d{5})\s*\|\s*(\d{4})\s*\|\s*(\d{12}-\d)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'(\d{1,3}(?:\.\d{3})*),(\d{2})',
                 'transaction_indicators': ['CRED PIX', 'ENVIO PIX', 'TED', 'DOC', 'SAQUE', 'DEPOSITO']
             },
             'bb': {
-                'identifiers': ['BANCO DO BRASIL', 'BB', '001'],
                 'account_pattern': r'AG\.?\s*(\d{4,5})-(\d)\s*CC\.?\s*(\d{6,}-\d)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['TRANSFERENCIA', 'PIX', 'TED', 'DOC', 'COMPRA', 'SAQUE']
             },
             'nubank': {
-                'identifiers': ['NUBANK', 'NU PAGAMENTOS', 'NUCONTA'],
                 'account_pattern': r'Conta:\s*(\d{4}\.\d{4}\.\d{4}-\d{2})',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['Pix', 'Transferência', 'Compra', 'Pagamento', 'Recebimento']
             },
             'inter': {
-                'identifiers': ['INTER', 'BANCO INTER', '077'],
                 'account_pattern': r'Conta:\s*(\d+)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['PIX', 'Transferência', 'Compra', 'Recebimento', 'TED']
             },
             'c6': {
-                'identifiers': ['C6 BANK', 'C6', 'BANCO C6'],
                 'account_pattern': r'Conta:\s*(\d+)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['PIX', 'Compra', 'Transferência', 'Recebimento']
             },
             'original': {
-                'identifiers': ['ORIGINAL', 'BANCO ORIGINAL'],
                 'account_pattern': r'Conta:\s*(\d+)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['PIX', 'Transferência', 'Compra', 'Recebimento']
             },
             'next': {
-                'identifiers': ['NEXT', 'BANCO NEXT'],
                 'account_pattern': r'Conta:\s*(\d+)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['PIX', 'Transferência', 'Compra', 'Pagamento']
             },
             'picpay': {
-                'identifiers': ['PICPAY', 'PIC PAY', 'MASTERCARD GOLD', 'Oi\u00ea'],
                 'account_pattern': r'Leonardo Almeida Santos|@[\w\.]+',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['Fatura anterior', 'Pagamento recebido', 'Despesas do m\u00eas', 'Total da fatura']
             },
-            'stone': {
-                'identifiers': ['STONE', 'STONE INSTITUIÇÃO', 'STONE PAGAMENTO'],
-                'account_pattern': r'Conta\s*(\d{7}-\d)',
-                'date_format': r'(\d{2})/(\d{2})/(\d{4})',
-                'value_pattern': r'([\d\.,]+)',
-                'transaction_indicators': ['Recebimento vendas', 'Antecipação', 'Transferência', 'Pagamento']
-            },
-            'infinitepay': {
-                'identifiers': ['INFINITEPAY', 'INFINITE PAY', 'LEONARDO DE ALMEIDA SANTOS'],
-                'account_pattern': r'CPF/CNPJ:\s*([\d\.-]+)',
-                'date_format': r'(\d{2})/(\d{2})/(\d{4})',
-                'value_pattern': r'[+-]?([\d\.,]+)',
-                'transaction_indicators': ['Pix Para', 'Pix De', 'Saldo do dia', 'UBER DO BRASIL']
-            },
             'pagbank': {
-                'identifiers': ['PAGBANK', 'PAG BANK', 'PAGSEGURO'],
                 'account_pattern': r'Conta:\s*(\d+)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['PIX', 'Transferência', 'Recebimento', 'Pagamento']
             },
             'mercadopago': {
-                'identifiers': ['MERCADO PAGO', 'MERCADOPAGO', 'MP'],
                 'account_pattern': r'CVU:\s*(\d+)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['Transferência', 'Recebimento', 'Compra', 'Venda']
             },
             'will_bank': {
-                'identifiers': ['WILL BANK', 'WILL', 'BANCO WILL'],
                 'account_pattern': r'Conta:\s*(\d+)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['PIX', 'Transferência', 'Pagamento', 'Recebimento']
             },
             'btg': {
-                'identifiers': ['BTG', 'BTG PACTUAL'],
                 'account_pattern': r'Conta:\s*(\d+)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['PIX', 'Transferência', 'Investimento', 'Resgate']
             },
             'xp': {
-                'identifiers': ['XP', 'XP INVESTIMENTOS'],
                 'account_pattern': r'Conta:\s*(\d+)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
                 'transaction_indicators': ['PIX', 'Transferência', 'Investimento', 'Resgate']
             },
             'infinitepay': {
-                'identifiers': ['INFINITEPAY', 'InfinitePay', 'ajuda@infinitepay.io'],
                 'account_pattern': r'CPF:\s*(\d{3}\.\d{3}\.\d{3}-\d{2})',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'([+-]?[\d\.,]+)',
                 'transaction_indicators': ['Pix', 'PIX', 'Transferência', 'Pagamento', 'Recebimento']
             },
             'stone': {
-                'identifiers': ['STONE', 'Stone Instituição de Pagamento'],
                 'account_pattern': r'Conta\s*(\d+-\d)',
                 'date_format': r'(\d{2})/(\d{2})/(\d{4})',
                 'value_pattern': r'R?\$?\s*([\d\.,]+)',
@@ -188,34 +228,28 @@ class BrazilianBanksParser:
         return {
             'itau': {
                 'identifiers': ['FATURA CARTÃO', 'ITAUCARD', 'CREDICARD'],
-                'transaction_pattern': r'(\d{2}\/\d{2})\s+([^0-9]+)\s+([\d\.,]+)',
+                'transaction_pattern': padrao_linha(r'(\d{2}/\d{2})[ \t]++' + descricao_ate(r'([\d.,]++)')),
                 'total_pattern': r'TOTAL DA FATURA.*?R\$\s*([\d\.,]+)',
                 'vencimento_pattern': r'VENCIMENTO.*?(\d{2}\/\d{2}\/\d{4})'
             },
             'bradesco': {
                 'identifiers': ['BRADESCO CARTÕES', 'FATURA'],
-                'transaction_pattern': r'(\d{2}\/\d{2})\s+([^0-9]+)\s+([\d\.,]+)',
+                'transaction_pattern': padrao_linha(r'(\d{2}/\d{2})[ \t]++' + descricao_ate(r'([\d.,]++)')),
                 'total_pattern': r'VALOR TOTAL.*?R\$\s*([\d\.,]+)',
                 'vencimento_pattern': r'VENCIMENTO.*?(\d{2}\/\d{2}\/\d{4})'
             },
             'nubank': {
                 'identifiers': ['NUBANK FATURA', 'CARTÃO DE CRÉDITO'],
-                'transaction_pattern': r'(\d{2}\s[A-Z]{3})\s+([^R$]+)\s+R\$\s*([\d\.,]+)',
+                'transaction_pattern': padrao_linha(r'(\d{2}[ \t][A-Z]{3})[ \t]++' + descricao_ate(r'R\$[ \t]*+([\d.,]++)', r'[^R$\s]')),
                 'total_pattern': r'TOTAL.*?R\$\s*([\d\.,]+)',
                 'vencimento_pattern': r'VENCIMENTO.*?(\d{2}\/\d{2}\/\d{4})'
             }
         }
     
     def detect_bank(self, text_content: str) -> Optional[str]:
-        """Detecta qual banco baseado no conteúdo do texto"""
-        text_upper = text_content.upper()
-        
-        for bank_name, bank_info in self.bank_patterns.items():
-            for identifier in bank_info['identifiers']:
-                if identifier in text_upper:
-                    return bank_name
-        
-        return None
+        """Detecta o banco pelo texto (identificadores do registro de parsers), no código usado aqui ('itau', 'bb', ...)"""
+        banco = REGISTRO_PARSERS.banco_por_texto(text_content)
+        return REGISTRO_PARSERS.codigo_banco(banco) if banco else None
     
     def detect_document_type(self, text_content: str) -> str:
         """Detecta se é extrato bancário ou fatura de cartão"""
@@ -238,50 +272,30 @@ class BrazilianBanksParser:
         
         return 'fatura_cartao' if credit_score > statement_score else 'extrato_bancario'
     
-    def parse_bank_statement(self, text_content: str, bank: str) -> List[Dict]:
-        """Parser genérico para extratos bancários"""
+    def parse_bank_statement(self, text_content: str, bank: str, orcamento: Optional[OrcamentoRegex] = None) -> List[Dict]:
+        """Parser genérico para extratos bancários (`orcamento`: prazo do documento, compartilhado com outros parsers)"""
         transactions = []
         
         if bank not in self.bank_patterns:
             return []
         
         bank_info = self.bank_patterns[bank]
+        self.orcamento_regex = orcamento or OrcamentoRegex()  # Prazo novo para cada documento
         
         # Extrair informações da conta
         account_match = re.search(bank_info['account_pattern'], text_content)
         account_info = account_match.groups() if account_match else None
         
         # Padrões de linha de transação para cada banco
-        if bank == 'caixa':
-            # Padrão específico da Caixa (já implementado)
-            return self._parse_caixa_transactions(text_content)
-        elif bank == 'itau':
-            return self._parse_itau_transactions(text_content)
-        elif bank == 'bradesco':
-            return self._parse_bradesco_transactions(text_content)
-        elif bank == 'santander':
-            return self._parse_santander_transactions(text_content)
-        elif bank == 'bb':
-            return self._parse_bb_transactions(text_content)
-        elif bank == 'nubank':
-            return self._parse_nubank_transactions(text_content)
-        elif bank == 'inter':
-            return self._parse_inter_transactions(text_content)
-        elif bank == 'infinitepay':
-            return self._parse_infinitepay_transactions(text_content)
-        elif bank == 'stone':
-            return self._parse_stone_transactions(text_content)
-        elif bank == 'picpay':
-            return self._parse_picpay_transactions(text_content)
-        else:
+        parser = self.STATEMENT_PARSERS.get(bank)
+        if parser is None:
             return self._parse_generic_transactions(text_content, bank)
+        return getattr(self, parser)(text_content)
     
     def _parse_caixa_transactions(self, text_content: str) -> List[Dict]:
-        """Parser específico para Caixa (reutilizando implementação existente)"""
-        from caixa_extrato_parser import process_caixa_extrato_text
-        
+        """Parser específico para Caixa (reutilizando implementação existente, importada no primeiro uso)"""
         try:
-            result = process_caixa_extrato_text(text_content)
+            result = carregar_funcao('caixa_extrato_parser', 'process_caixa_extrato_text')(text_content, self.orcamento_regex)
             if result.get('processing_success', False):
                 return result.get('transactions', [])
         except Exception as e:
@@ -293,10 +307,7 @@ class BrazilianBanksParser:
         """Parser específico para Itaú"""
         transactions = []
         
-        # Padrão Itaú: data | descrição | valor | saldo
-        pattern = r'(\d{2}\/\d{2}\/\d{4})\s+([^0-9]+?)\s+([\d\.,]+)\s+([CD])\s+([\d\.,]+)\s+([CD])'
-        
-        for match in re.finditer(pattern, text_content):
+        for match in self.orcamento_regex.finditer(self.ITAU_LINE, text_content):
             date_str, description, value_str, value_type, balance_str, balance_type = match.groups()
             
             try:
@@ -307,10 +318,16 @@ class BrazilianBanksParser:
                 if value_type == 'D':
                     value = -abs(value)
                 
+                # Saldo informado após o lançamento (D = saldo devedor)
+                balance = self._parse_value(balance_str)
+                if balance_type == 'D':
+                    balance = -balance
+                
                 transactions.append({
                     'date': date,
                     'description': self._clean_description(description),
                     'value': value,
+                    'balance': balance,
                     'type': 'debit' if value < 0 else 'credit',
                     'category': self._categorize_transaction(description),
                     'bank': 'itau'
@@ -324,12 +341,9 @@ class BrazilianBanksParser:
         """Parser específico para Bradesco"""
         transactions = []
         
-        # Padrão Bradesco: data | descrição | documento | valor | saldo
-        pattern = r'(\d{2}\/\d{2})\s+([^0-9]+?)\s+(\d+)?\s*([\d\.,]+)[-+]?\s*([\d\.,]+)?'
-        
         current_year = datetime.now().year
         
-        for match in re.finditer(pattern, text_content):
+        for match in self.orcamento_regex.finditer(self.BRADESCO_LINE, text_content):
             date_str, description, doc, value_str, balance_str = match.groups()
             
             try:
@@ -361,10 +375,7 @@ class BrazilianBanksParser:
         """Parser específico para Santander"""
         transactions = []
         
-        # Padrão Santander similar ao Itaú
-        pattern = r'(\d{2}\/\d{2}\/\d{4})\s+([^0-9]+?)\s+([\d\.,]+)\s+([CD])'
-        
-        for match in re.finditer(pattern, text_content):
+        for match in self.orcamento_regex.finditer(self.SANTANDER_LINE, text_content):
             date_str, description, value_str, value_type = match.groups()
             
             try:
@@ -391,12 +402,9 @@ class BrazilianBanksParser:
         """Parser específico para Banco do Brasil"""
         transactions = []
         
-        # Padrão específico do BB (formato: Data Data Tipo Descrição Valor)
-        pattern = r'(\d{2}\/\d{2})\s+(\d{2}\/\d{2})\s+(Entrada|Saída|Débito de Cartão)\s+([^R]+)\s+R\$\s*([\d\.,]+|[\-\d\.,]+)'
-        
         current_year = datetime.now().year
         
-        for match in re.finditer(pattern, text_content):
+        for match in self.orcamento_regex.finditer(self.BB_LINE, text_content):
             date_str, date_contabil, tipo, description, value_str = match.groups()
             
             try:
@@ -421,10 +429,8 @@ class BrazilianBanksParser:
             except Exception as e:
                 continue
         
-        # Padrão alternativo para outras formatações do BB
-        pattern2 = r'(\d{2}\/\d{2}\/\d{4})\s+([^0-9]+?)\s+([\d\.,]+)\s+([CD])'
-        
-        for match in re.finditer(pattern2, text_content):
+        # Padrão alternativo para outras formatações do BB (igual ao do Santander)
+        for match in self.orcamento_regex.finditer(self.SANTANDER_LINE, text_content):
             date_str, description, value_str, value_type = match.groups()
             
             try:
@@ -451,10 +457,7 @@ class BrazilianBanksParser:
         """Parser específico para Nubank"""
         transactions = []
         
-        # Padrão Nubank (formato diferente)
-        pattern = r'(\d{2}\/\d{2}\/\d{4})\s+([^R$]+)\s+R\$\s*([\d\.,]+)'
-        
-        for match in re.finditer(pattern, text_content):
+        for match in self.orcamento_regex.finditer(self.NUBANK_LINE, text_content):
             date_str, description, value_str = match.groups()
             
             try:
@@ -482,10 +485,8 @@ class BrazilianBanksParser:
         """Parser específico para Banco Inter"""
         transactions = []
         
-        # Padrão Inter
-        pattern = r'(\d{2}\/\d{2}\/\d{4})\s+([^R$]+)\s+R\$\s*([\d\.,]+)'
-        
-        for match in re.finditer(pattern, text_content):
+        # Padrão Inter (igual ao do Nubank)
+        for match in self.orcamento_regex.finditer(self.NUBANK_LINE, text_content):
             date_str, description, value_str = match.groups()
             
             try:
@@ -510,43 +511,35 @@ class BrazilianBanksParser:
         return transactions
     
     def _parse_generic_transactions(self, text_content: str, bank: str) -> List[Dict]:
-        """Parser genérico para bancos não específicos"""
+        """Parser genérico para bancos não específicos (uma varredura, no máximo uma transação por linha)"""
         transactions = []
+        current_year = datetime.now().year
+        descricoes = {}  # Descrição bruta -> (descrição limpa, categoria)
         
-        # Padrões genéricos mais flexíveis
-        patterns = [
-            r'(\d{2}\/\d{2}\/\d{4})\s+([^0-9]+?)\s+([\d\.,]+)',
-            r'(\d{2}\/\d{2})\s+([^0-9]+?)\s+([\d\.,]+)',
-            r'(\d{2}-\d{2}-\d{4})\s+([^0-9]+?)\s+([\d\.,]+)'
-        ]
-        
-        for pattern in patterns:
-            for match in re.finditer(pattern, text_content):
-                groups = match.groups()
-                if len(groups) >= 3:
-                    date_str, description, value_str = groups[:3]
-                    
-                    try:
-                        # Normalizar formato de data
-                        if '-' in date_str:
-                            date_str = date_str.replace('-', '/')
-                        
-                        if len(date_str.split('/')) == 2:
-                            date_str += f'/{datetime.now().year}'
-                        
-                        date = datetime.strptime(date_str, '%d/%m/%Y').isoformat()
-                        value = self._parse_value(value_str)
-                        
-                        transactions.append({
-                            'date': date,
-                            'description': self._clean_description(description),
-                            'value': value,
-                            'type': 'debit' if value < 0 else 'credit',
-                            'category': self._categorize_transaction(description),
-                            'bank': bank
-                        })
-                    except Exception as e:
-                        continue
+        for _, (date_str, description, value_str) in self._varrer_linhas(self.GENERIC_STATEMENT_LINE, text_content):
+            try:
+                # Normalizar formato de data
+                if '-' in date_str:
+                    date_str = date_str.replace('-', '/')
+                
+                if len(date_str.split('/')) == 2:
+                    date_str += f'/{current_year}'
+                
+                date = datetime.strptime(date_str, '%d/%m/%Y').isoformat()
+                value = self._parse_value(value_str)
+                if description not in descricoes:
+                    descricoes[description] = (self._clean_description(description), self._categorize_transaction(description))
+                
+                transactions.append({
+                    'date': date,
+                    'description': descricoes[description][0],
+                    'value': value,
+                    'type': 'debit' if value < 0 else 'credit',
+                    'category': descricoes[description][1],
+                    'bank': bank
+                })
+            except Exception as e:
+                continue
         
         return transactions
     
@@ -554,11 +547,7 @@ class BrazilianBanksParser:
         """Parser específico para InfinitePay"""
         transactions = []
         
-        # Padrões específicos do InfinitePay
-        # Formato: data | Pix | Para/De nome | valor
-        pix_pattern = r'(\d{2}\/\d{2}\/\d{4})\s+(?:Saldo do dia|Pix)\s+(?:Para|De)\s+([^0-9+-]+?)\s+([+-]?[\d\.,]+)'
-        
-        for match in re.finditer(pix_pattern, text_content):
+        for match in self.orcamento_regex.finditer(self.INFINITEPAY_PIX_LINE, text_content):
             date_str, description, value_str = match.groups()
             
             try:
@@ -581,9 +570,7 @@ class BrazilianBanksParser:
                 continue
         
         # Padrão alternativo para linhas de transação sem data explícita
-        simple_pix_pattern = r'Pix\s+(?:Para|De)\s+([^0-9+-]+?)\s+([+-]?[\d\.,]+)'
-        
-        for match in re.finditer(simple_pix_pattern, text_content):
+        for match in self.orcamento_regex.finditer(self.INFINITEPAY_SIMPLE_PIX_LINE, text_content):
             description, value_str = match.groups()
             
             try:
@@ -612,10 +599,7 @@ class BrazilianBanksParser:
         """Parser específico para Stone (conta empresarial)"""
         transactions = []
         
-        # Padrão Stone: DATA | TIPO | LANÇAMENTO | VALOR | SALDO | CONTRAPARTE
-        pattern = r'(\d{2}\/\d{2}\/\d{4})\s+(Crédito|Débito)\s+([^0-9]+?)\s+([\d\.,]+)\s+([\d\.,]+)\s*([^0-9]*)'
-        
-        for match in re.finditer(pattern, text_content):
+        for match in self.orcamento_regex.finditer(self.STONE_LINE, text_content):
             date_str, transaction_type, description, value_str, balance_str, counterpart = match.groups()
             
             try:
@@ -630,6 +614,7 @@ class BrazilianBanksParser:
                     'date': date,
                     'description': self._clean_description(description),
                     'value': value,
+                    'balance': self._parse_value(balance_str),
                     'type': 'debit' if value < 0 else 'credit',
                     'category': self._categorize_transaction(description),
                     'bank': 'stone',
@@ -644,12 +629,9 @@ class BrazilianBanksParser:
         """Parser específico para PicPay"""
         transactions = []
         
-        # Padrão PicPay fatura: data | descrição | valor
-        pattern = r'(\d{2}\/\d{2})\s+([^0-9]+?)\s+([\d\.,]+)'
-        
         current_year = datetime.now().year
         
-        for match in re.finditer(pattern, text_content):
+        for match in self.orcamento_regex.finditer(self.PICPAY_CARD_LINE, text_content):
             date_str, description, value_str = match.groups()
             
             try:
@@ -674,9 +656,7 @@ class BrazilianBanksParser:
                 continue
         
         # Padrão alternativo para extratos PicPay
-        transfer_pattern = r'(\d{2}\/\d{2}\/\d{4})\s+([^0-9]+?)\s+([+-]?[\d\.,]+)'
-        
-        for match in re.finditer(transfer_pattern, text_content):
+        for match in self.orcamento_regex.finditer(self.PICPAY_TRANSFER_LINE, text_content):
             date_str, description, value_str = match.groups()
             
             try:
@@ -699,9 +679,10 @@ class BrazilianBanksParser:
         
         return transactions
     
-    def parse_credit_card_statement(self, text_content: str, bank: str) -> List[Dict]:
-        """Parser para faturas de cartão de crédito"""
+    def parse_credit_card_statement(self, text_content: str, bank: str, orcamento: Optional[OrcamentoRegex] = None) -> List[Dict]:
+        """Parser para faturas de cartão de crédito (`orcamento`: prazo do documento, compartilhado com outros parsers)"""
         transactions = []
+        self.orcamento_regex = orcamento or OrcamentoRegex()  # Prazo novo para cada documento
         
         if bank not in self.credit_card_patterns:
             return self._parse_generic_credit_card(text_content, bank)
@@ -709,7 +690,7 @@ class BrazilianBanksParser:
         card_info = self.credit_card_patterns[bank]
         pattern = card_info['transaction_pattern']
         
-        for match in re.finditer(pattern, text_content):
+        for match in self.orcamento_regex.finditer(pattern, text_content):
             groups = match.groups()
             
             try:
@@ -738,44 +719,45 @@ class BrazilianBanksParser:
         return transactions
     
     def _parse_generic_credit_card(self, text_content: str, bank: str) -> List[Dict]:
-        """Parser genérico para faturas de cartão"""
+        """Parser genérico para faturas de cartão (uma varredura, no máximo uma transação por linha)"""
         transactions = []
+        current_year = datetime.now().year
+        descricoes = {}  # Descrição bruta -> (descrição limpa, categoria)
         
-        # Padrões genéricos para faturas
-        patterns = [
-            r'(\d{2}\/\d{2})\s+([^0-9]+?)\s+([\d\.,]+)',
-            r'(\d{2}\s[A-Z]{3})\s+([^R$]+)\s+R\$\s*([\d\.,]+)',
-            r'(\d{2}-\d{2})\s+([^0-9]+?)\s+([\d\.,]+)'
-        ]
-        
-        for pattern in patterns:
-            for match in re.finditer(pattern, text_content):
-                groups = match.groups()
-                if len(groups) >= 3:
-                    date_str, description, value_str = groups[:3]
-                    
-                    try:
-                        if ' ' in date_str and any(month in date_str for month in ['JAN', 'FEV', 'MAR', 'ABR', 'MAI', 'JUN', 'JUL', 'AGO', 'SET', 'OUT', 'NOV', 'DEZ']):
-                            date = self._parse_nubank_date(date_str)
-                        else:
-                            date = datetime.strptime(f"{date_str}/{datetime.now().year}", '%d/%m/%Y').isoformat()
-                        
-                        value = self._parse_value(value_str)
-                        
-                        transactions.append({
-                            'date': date,
-                            'description': self._clean_description(description),
-                            'value': -abs(value),
-                            'type': 'debit',
-                            'category': self._categorize_transaction(description),
-                            'bank': bank,
-                            'document_type': 'credit_card'
-                        })
-                    except Exception as e:
-                        continue
+        for alternativa, (date_str, description, value_str) in self._varrer_linhas(self.GENERIC_CREDIT_CARD_LINE, text_content):
+            try:
+                if alternativa == 1:  # Formato "15 JAN"
+                    date = self._parse_nubank_date(date_str)
+                else:
+                    date = datetime.strptime(f"{date_str.replace('-', '/')}/{current_year}", '%d/%m/%Y').isoformat()
+                
+                value = self._parse_value(value_str)
+                if description not in descricoes:
+                    descricoes[description] = (self._clean_description(description), self._categorize_transaction(description))
+                
+                transactions.append({
+                    'date': date,
+                    'description': descricoes[description][0],
+                    'value': -abs(value),
+                    'type': 'debit',
+                    'category': descricoes[description][1],
+                    'bank': bank,
+                    'document_type': 'credit_card'
+                })
+            except Exception as e:
+                continue
         
         return transactions
     
+    def _varrer_linhas(self, padrao_linhas: tuple[re.Pattern, list[int]], text_content: str):
+        """Itera (índice da alternativa, (data, descrição, valor)) para cada linha reconhecida."""
+        padrao, grupos_iniciais = padrao_linhas
+        for match in self.orcamento_regex.finditer(padrao, text_content):
+            # O grupo externo de cada alternativa fecha por último: lastgroup diz qual delas casou
+            alternativa = int(match.lastgroup[len('alt'):])
+            inicio = grupos_iniciais[alternativa]
+            yield alternativa, match.group(inicio, inicio + 1, inicio + 2)
+    
     def _parse_value(self, value_str: str) -> float:
         """Converte string de valor para float"""
         # Remove caracteres não numéricos exceto vírgulas e pontos
@@ -840,17 +822,19 @@ class BrazilianBanksParser:
         else:
             return 'Outros'
     
-    def process_document(self, text_content: str) -> Dict[str, Any]:
-        """Processa um documento financeiro completo"""
+    def process_document(self, text_content: str, orcamento: Optional[OrcamentoRegex] = None) -> Dict[str, Any]:
+        """Processa um documento financeiro completo (`orcamento`: prazo do documento, compartilhado com outros parsers)"""
+        self.orcamento_regex = orcamento or OrcamentoRegex()
+        
         # Detectar banco e tipo de documento
         bank = self.detect_bank(text_content)
         doc_type = self.detect_document_type(text_content)
         
         # Extrair transações baseado no tipo
         if doc_type == 'fatura_cartao':
-            transactions = self.parse_credit_card_statement(text_content, bank if bank else 'generic')
+            transactions = self.parse_credit_card_statement(text_content, bank if bank else 'generic', self.orcamento_regex)
         else:
-            transactions = self.parse_bank_statement(text_content, bank if bank else 'generic')
+            transactions = self.parse_bank_statement(text_content, bank if bank else 'generic', self.orcamento_regex)
         
         # Calcular estatísticas
         total_income = sum(t['value'] for t in transactions if t['value'] > 0)
@@ -858,7 +842,7 @@ class BrazilianBanksParser:
         net_balance = total_income - total_expenses
         
         # Detectar padrões suspeitos
-        suspicious_patterns = self._detect_suspicious_patterns(transactions)
+        suspicious_patterns = self._detect_suspicious_patterns(transactions, doc_type)
         
         return {
             'processing_success': len(transactions) > 0,
@@ -870,25 +854,27 @@ class BrazilianBanksParser:
             'total_expenses': total_expenses,
             'net_balance': net_balance,
             'suspicious_patterns': suspicious_patterns,
+            'regex_budget_exceeded': self.orcamento_regex.esgotado,
             'text_content': text_content[:1000] + '...' if len(text_content) > 1000 else text_content
         }
     
-    def _detect_suspicious_patterns(self, transactions: List[Dict]) -> Dict[str, List]:
+    def _detect_suspicious_patterns(self, transactions: List[Dict], doc_type: Optional[str] = None) -> Dict[str, List]:
         """Detecta padrões suspeitos nas transações"""
         suspicious = {
             'mula_financeira': [],
             'estruturacao': [],
             'lavagem_dinheiro': [],
-            'gambling': []
+            'gambling': [],
+            'janelas_aml': []
         }
         
-        gambling_keywords = ['BET', 'CASA', 'JOGO', 'APOSTA', 'CASINO', 'BINGO', 'POKER']
+        # Detectar apostas (uma busca por descrição distinta)
+        gambling_mask = mascara_palavras_chave([t['description'] for t in transactions], self.GAMBLING_MATCHER)
         
         for i, transaction in enumerate(transactions):
             desc_upper = transaction['description'].upper()
             
-            # Detectar apostas
-            if any(keyword in desc_upper for keyword in gambling_keywords):
+            if gambling_mask[i]:
                 suspicious['gambling'].append(transaction)
             
             # Detectar possível estruturação (valores redondos seguidos)
@@ -899,13 +885,37 @@ class BrazilianBanksParser:
             if 'PIX' in desc_upper and abs(transaction['value']) < 500:
                 suspicious['mula_financeira'].append(transaction)
         
+        # Regras de janela deslizante (PIX em 24h, pequenas saídas em 3 dias, passagem em 7 dias)
+        if transactions:
+            suspicious['janelas_aml'] = avaliar_regras(pd.DataFrame(transactions).assign(doc_type=doc_type))
+        
         return suspicious
 
 
-def parse_brazilian_bank_document(text_content: str, doc_type: Optional[str] = None) -> Dict[str, Any]:
+def _parser_extrato_pdf(bank: str):
+    """Parser de extrato em texto de um banco, na assinatura do registro de parsers (texto, doc_type, orcamento)."""
+    def parse(text_content: str, doc_type: str, orcamento: Optional[OrcamentoRegex] = None) -> List[Dict]:
+        return BrazilianBanksParser().parse_bank_statement(text_content, bank, orcamento)
+    parse.__name__ = parse.__qualname__ = f'parse_{bank}_extrato_pdf'
+    return parse
+
+
+# Extratos em PDF registrados em parser_registry.PARSERS_PADRAO
+parse_itau_extrato_pdf = _parser_extrato_pdf('itau')
+parse_bradesco_extrato_pdf = _parser_extrato_pdf('bradesco')
+parse_santander_extrato_pdf = _parser_extrato_pdf('santander')
+parse_bb_extrato_pdf = _parser_extrato_pdf('bb')
+parse_inter_extrato_pdf = _parser_extrato_pdf('inter')
+parse_infinitepay_extrato_pdf = _parser_extrato_pdf('infinitepay')
+parse_stone_extrato_pdf = _parser_extrato_pdf('stone')
+parse_picpay_extrato_pdf = _parser_extrato_pdf('picpay')
+
+
+def parse_brazilian_bank_document(text_content: str, doc_type: Optional[str] = None,
+                                  orcamento: Optional[OrcamentoRegex] = None) -> Dict[str, Any]:
     """Função principal para processar documentos bancários brasileiros"""
     parser = BrazilianBanksParser()
-    return parser.process_document(text_content)
+    return parser.process_document(text_content, orcamento)
 
 
 # Exportar função principal
@@ -7,7 +7,21 @@ from datetime import datetime
 from decimal import Decimal, InvalidOperation
 import logging
 
-def parse_caixa_extrato_pdf(text_content: str, doc_type: str) -> list:
+from aml_rules import avaliar_regras
+from transaction_regex import OrcamentoRegex, descricao_ate
+
+# Códigos de histórico da Caixa e as descrições legíveis que o parser usa no lugar deles
+MAPEAMENTO_HISTORICOS_CAIXA = {
+    'CRED PIX': 'Recebimento PIX',
+    'ENVIO PIX': 'Transferência PIX',
+    'PAG BOLETO': 'Pagamento de Boleto',
+    'DP DIN LOT': 'Depósito em Dinheiro',
+    'SAQUE LOT': 'Saque',
+    'COMPRA': 'Compra com Cartão',
+    'CRED FGTS': 'Crédito FGTS'
+}
+
+def parse_caixa_extrato_pdf(text_content: str, doc_type: str, orcamento: OrcamentoRegex = None) -> list:
     """
     Parser específico para extratos da Caixa Econômica Federal.
     Baseado no formato real dos extratos fornecidos pelo usuário.
@@ -26,7 +40,7 @@ def parse_caixa_extrato_pdf(text_content: str, doc_type: str) -> list:
         header_info = _extract_header_info(text_content)
         
         # Extrair transações usando padrões específicos da Caixa
-        transactions = _extract_caixa_transactions(text_content, header_info)
+        transactions = _extract_caixa_transactions(text_content, header_info, orcamento or OrcamentoRegex())
         
         # Categorizar transações
         for transaction in transactions:
@@ -92,16 +106,17 @@ def _extract_header_info(text: str) -> dict:
     
     return header_info
 
-def _extract_caixa_transactions(text: str, header_info: dict) -> list:
+def _extract_caixa_transactions(text: str, header_info: dict, orcamento: OrcamentoRegex) -> list:
     """Extrai as transações do extrato da Caixa usando padrões específicos."""
     transactions = []
     
     # Padrão principal para transações da Caixa
-    # Formato: DD/MM/YYYY    NNNNNN    DESCRIÇÃO    VALOR D/C    SALDO C
-    transaction_pattern = r'(\d{2}/\d{2}/\d{4})\s+(\d+)\s+(.+?)\s+([\d.,]+)\s+([DC])\s+([\d.,]+)\s+C'
+    # Formato: DD/MM/YYYY    NNNNNN    DESCRIÇÃO    VALOR D/C    SALDO C/D
+    # (possessivos e com a descrição em palavras: custo linear mesmo em linhas enormes de OCR)
+    transaction_pattern = r'(\d{2}/\d{2}/\d{4})[ \t]++(\d++)[ \t]++' + descricao_ate(r'([\d.,]++)[ \t]++([DC])[ \t]++([\d.,]++)[ \t]++([CD])', r'\S')
     
     # Padrão alternativo para linhas que podem estar quebradas
-    alt_pattern = r'(\d{2}/\d{2}/\d{4})\s+(\d+)\s+(.+?)\s+([\d.,]+)\s+([DC])'
+    alt_pattern = r'(\d{2}/\d{2}/\d{4})[ \t]++(\d++)[ \t]++' + descricao_ate(r'([\d.,]++)[ \t]++([DC])', r'\S')
     
     lines = text.split('\n')
     current_year = datetime.now().year
@@ -113,6 +128,8 @@ def _extract_caixa_transactions(text: str, header_info: dict) -> list:
             current_year = int(year_match.group(1))
     
     for i, line in enumerate(lines):
+        if orcamento.vencido():
+            break
         line = line.strip()
         if not line:
             continue
@@ -134,9 +151,9 @@ def _extract_caixa_transactions(text: str, header_info: dict) -> list:
             if match and i + 1 < len(lines):
                 # Verificar se a próxima linha tem o saldo
                 next_line = lines[i + 1].strip()
-                saldo_match = re.search(r'([\d.,]+)\s+C', next_line)
+                saldo_match = re.search(r'(?<![\d.,])([\d.,]++)[ \t]++([CD])', next_line)
                 if saldo_match:
-                    match = list(match.groups()) + [saldo_match.group(1)]
+                    match = list(match.groups()) + list(saldo_match.groups())
                 else:
                     match = None
         
@@ -147,6 +164,7 @@ def _extract_caixa_transactions(text: str, header_info: dict) -> list:
                 description = match[2] if isinstance(match, (list, tuple)) else match.group(3)
                 value_str = match[3] if isinstance(match, (list, tuple)) else match.group(4)
                 transaction_type = match[4] if isinstance(match, (list, tuple)) else match.group(5)
+                balance_str, balance_type = match[5:7] if isinstance(match, (list, tuple)) else match.group(6, 7)
                 
                 # Parse da data
                 try:
@@ -171,6 +189,11 @@ def _extract_caixa_transactions(text: str, header_info: dict) -> list:
                     else:
                         value = abs(value)
                         
+                    # Saldo informado após o lançamento (D = saldo devedor)
+                    balance = float(balance_str.replace('.', '').replace(',', '.'))
+                    if balance_type == 'D':
+                        balance = -balance
+                        
                 except (ValueError, InvalidOperation):
                     continue
                 
@@ -181,6 +204,7 @@ def _extract_caixa_transactions(text: str, header_info: dict) -> list:
                     'date': transaction_date.isoformat(),
                     'description': clean_description,
                     'value': value,
+                    'balance': balance,
                     'document_number': doc_num,
                     'transaction_type': 'debit' if transaction_type == 'D' else 'credit',
                     'bank': 'Caixa Econômica Federal',
@@ -208,17 +232,7 @@ def _clean_description(description: str) -> str:
     clean_desc = ' '.join(description.split())
     
     # Mapear códigos comuns da Caixa para descrições mais claras
-    mappings = {
-        'CRED PIX': 'Recebimento PIX',
-        'ENVIO PIX': 'Transferência PIX',
-        'PAG BOLETO': 'Pagamento de Boleto',
-        'DP DIN LOT': 'Depósito em Dinheiro',
-        'SAQUE LOT': 'Saque',
-        'COMPRA': 'Compra com Cartão',
-        'CRED FGTS': 'Crédito FGTS'
-    }
-    
-    for code, description_text in mappings.items():
+    for code, description_text in MAPEAMENTO_HISTORICOS_CAIXA.items():
         if code in clean_desc:
             clean_desc = clean_desc.replace(code, description_text)
     
@@ -292,7 +306,8 @@ def _detect_suspicious_patterns(transactions: list) -> dict:
         'mula_financeira': [],
         'estruturacao': [],
         'lavagem_dinheiro': [],
-        'apostas': []
+        'apostas': [],
+        'janelas_aml': []
     }
     
     if not transactions:
@@ -355,15 +370,18 @@ def _detect_suspicious_patterns(transactions: list) -> dict:
                 'descricao': f'Alta movimentação (R$ {total_movimentacao:,.2f}) com {proporcao_passagem*100:.1f}% de passagem'
             })
     
+    # Regras de janela deslizante avaliadas numa única passada
+    suspicious_patterns['janelas_aml'] = avaliar_regras(pd.DataFrame(transactions).assign(doc_type='extrato_bancario'))
+    
     return suspicious_patterns
 
 # Função principal para uso externo
-def process_caixa_extrato_text(text_content: str) -> dict:
+def process_caixa_extrato_text(text_content: str, orcamento: OrcamentoRegex = None) -> dict:
     """
     Função principal para processar texto de extrato da Caixa.
     Retorna dicionário com transações e análises.
     """
-    transactions = parse_caixa_extrato_pdf(text_content, 'extrato_bancario')
+    transactions = parse_caixa_extrato_pdf(text_content, 'extrato_bancario', orcamento)
     
     result = {
         'transactions': transactions,
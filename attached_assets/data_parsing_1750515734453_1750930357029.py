@@ -180,6 +180,71 @@ def processar_contracheque(texto: str) -> dict[str, str]:
 
     return dados
 
+# Cabeçalho da fatura: os campos ficam no início (resumo) ou no fim (boleto) do documento,
+# então só essas janelas são examinadas, numa única varredura com todos os padrões.
+JANELA_CABECALHO_FATURA = 6000 # caracteres no início e no fim do texto de cada documento
+_PADRAO_CABECALHO_FATURA = re.compile(
+    r'(?=' # Lookahead: nenhum campo "consome" o texto de outro
+    r'Valor da fatura:\s*R\$?\s*(?P<total_fatura>[\d\.,]+)'
+    r'|Vencimento:\s*(?P<vencimento>\d{2}/\d{2}/\d{4}|\d{1,2}\s+de\s+\w+)'
+    r'|Limite total:\s*R\$?\s*(?P<limite_total>[\d\.,]+)'
+    r'|Disponível\s*R\$?\s*(?P<limite_disponivel>[\d\.,]+)'
+    # O valor do parcelamento é o primeiro "R$ x" até 200 caracteres após a oferta
+    r'|(?:Parcelamento em \dx|Entrada \+ \dx de R\$?\s*[\d\.,]+)[\s\S]{0,200}?R\$?\s*(?P<parcelamento>[\d\.,]+)'
+    r'|(?P<pagamento_minimo>Pagamento mínimo ou parcial|Atrasar ou pagar menos que o mínimo da fatura)'
+    r')',
+    re.IGNORECASE
+)
+
+def extrair_cabecalho_fatura(texto: str) -> dict:
+    """
+    Extrai os dados principais de uma fatura de cartão (total, vencimento, limites,
+    parcelamento e menção a pagamento mínimo/atraso) numa única varredura das janelas
+    de cabeçalho e rodapé. Deve ser chamada uma vez por documento; o resultado é guardado
+    junto ao documento e consolidado com consolidar_cabecalhos_fatura.
+    """
+    cabecalho = {
+        'total_fatura': None, 'vencimento': None, 'limite_total': None,
+        'limite_disponivel': None, 'parcelamento': None, 'pagamento_minimo': False
+    }
+    if not texto:
+        return cabecalho
+
+    if len(texto) > 2 * JANELA_CABECALHO_FATURA:
+        texto = texto[:JANELA_CABECALHO_FATURA] + '\n' + texto[-JANELA_CABECALHO_FATURA:]
+
+    encontrados = {}
+    for match in _PADRAO_CABECALHO_FATURA.finditer(texto):
+        campo = match.lastgroup
+        if campo not in encontrados: # Vale a primeira ocorrência de cada campo
+            encontrados[campo] = match.group(campo)
+            if len(encontrados) == len(cabecalho):
+                break
+
+    for campo in ('total_fatura', 'limite_total', 'limite_disponivel', 'parcelamento'):
+        if campo in encontrados:
+            cabecalho[campo] = parse_financial_value(encontrados[campo])
+    if 'vencimento' in encontrados:
+        cabecalho['vencimento'] = parse_date_string(encontrados['vencimento'])
+    cabecalho['pagamento_minimo'] = 'pagamento_minimo' in encontrados
+    return cabecalho
+
+def consolidar_cabecalhos_fatura(cabecalhos: list[dict]) -> dict:
+    """
+    Combina os cabeçalhos de várias faturas: cada campo vem do primeiro documento que o
+    informa (na ordem de processamento) e a menção a pagamento mínimo vale se aparecer em qualquer um.
+    Chaves extras (ex.: o nome do arquivo de origem) são ignoradas.
+    """
+    consolidado = extrair_cabecalho_fatura('')
+    for cabecalho in cabecalhos:
+        for campo in consolidado:
+            valor = cabecalho.get(campo)
+            if campo == 'pagamento_minimo':
+                consolidado[campo] = consolidado[campo] or bool(valor)
+            elif consolidado.get(campo) is None and valor is not None:
+                consolidado[campo] = valor
+    return consolidado
+
 def _identificar_tipo_transacao_simples(descricao: str) -> str:
     """Identifica o tipo de transação básico (PIX, Transferência, Pagamento, etc.) para uso interno dos parsers."""
     descricao_lower = descricao.lower()
@@ -22,11 +22,15 @@ def _mapear_colunas_automaticamente(df: pd.DataFrame) -> dict[str, str]:
     
     return mapeamento
 
-def process_dataframe_generic(df: pd.DataFrame, doc_type: str) -> list[dict]:
-    """Processa DataFrames genéricos (CSV/XLSX) tentando mapear colunas automaticamente."""
+def process_dataframe_generic(df: pd.DataFrame, doc_type: str, mapeamento: dict[str, str] = None) -> list[dict]:
+    """
+    Processa DataFrames genéricos (CSV/XLSX) tentando mapear colunas automaticamente.
+    `mapeamento` já calculado (ex.: pelo registro de parsers, por formato de cabeçalho) evita refazer a inferência.
+    """
     transacoes = []
     
-    mapeamento = _mapear_colunas_automaticamente(df)
+    if mapeamento is None:
+        mapeamento = _mapear_colunas_automaticamente(df)
     
     for _, row in df.iterrows():
         data_raw = str(row.get(mapeamento.get('data'), '')).strip()
@@ -192,10 +196,17 @@ def process_caixa_extrato_csv(df: pd.DataFrame, doc_type: str) -> list[dict]:
             if valor_num is None: continue
             original_type_op = "Entrada" if valor_num >= 0 else "Saída"
 
+        # Saldo informado após o lançamento (sufixo D = saldo devedor); None se a coluna não existir
+        saldo_str = str(row.get('Saldo', '')).strip()
+        saldo_num = parse_financial_value(saldo_str)
+        if saldo_num is not None and saldo_str.upper().endswith('D'):
+            saldo_num = -abs(saldo_num)
+
         transacoes.append({
             'date': parse_date_string(data),
             'description': historico,
             'value': valor_num,
+            'balance': saldo_num,
             'currency': 'BRL',
             'doc_type': doc_type,
             'original_type_op': _identificar_tipo_transacao_simples(historico) # Reavalia com descrição
@@ -0,0 +1,125 @@
+# document_text_store.py
+
+"""
+Armazenamento do texto extraído de cada documento, com orçamento de memória.
+
+Os textos ficam em memória (UTF-8) até o orçamento configurado; acima dele, os documentos
+mais antigos são despejados para arquivos temporários e lidos de volta via mmap apenas
+quando um analisador pede aquele documento. Só os metadados (arquivo, tipo, tamanho)
+permanecem residentes.
+"""
+
+import mmap
+import os
+import shutil
+import tempfile
+import weakref
+
+ORCAMENTO_PADRAO_BYTES = 64 * 1024 * 1024
+
+
+class DocumentTextStore:
+    """Textos por documento, em memória até `orcamento_bytes` e despejados para disco além disso."""
+
+    def __init__(self, orcamento_bytes: int = ORCAMENTO_PADRAO_BYTES, diretorio: str | None = None):
+        self.orcamento_bytes = orcamento_bytes
+        self._diretorio_base = diretorio
+        self._diretorio = None
+        self._metadados = {}  # documento_id -> dict (ordem de inserção = ordem de processamento)
+        self._residentes = {}  # documento_id -> bytes
+        self._despejados = {}  # documento_id -> caminho do arquivo
+        self._bytes_residentes = 0
+        self._sequencia_despejo = 0
+
+    def __len__(self) -> int:
+        return len(self._metadados)
+
+    def __contains__(self, documento_id: str) -> bool:
+        return documento_id in self._metadados
+
+    @property
+    def bytes_residentes(self) -> int:
+        return self._bytes_residentes
+
+    def documentos(self, doc_type: str | None = None) -> list[str]:
+        """Identificadores dos documentos, na ordem em que foram adicionados (opcionalmente de um tipo)."""
+        return [doc for doc, meta in self._metadados.items() if doc_type is None or meta.get('doc_type') == doc_type]
+
+    def metadados(self, documento_id: str) -> dict:
+        return self._metadados[documento_id]
+
+    def adicionar(self, documento_id: str, texto: str, **metadados) -> None:
+        """Guarda o texto de um documento (substituindo o anterior com o mesmo identificador)."""
+        if documento_id in self._metadados:
+            self.remover(documento_id)
+
+        conteudo = texto.encode('utf-8')
+        self._metadados[documento_id] = {**metadados, 'tamanho': len(conteudo)}
+        self._residentes[documento_id] = conteudo
+        self._bytes_residentes += len(conteudo)
+        self._respeitar_orcamento()
+
+    def remover(self, documento_id: str) -> None:
+        self._metadados.pop(documento_id)
+        conteudo = self._residentes.pop(documento_id, None)
+        if conteudo is not None:
+            self._bytes_residentes -= len(conteudo)
+        caminho = self._despejados.pop(documento_id, None)
+        if caminho is not None:
+            os.remove(caminho)
+
+    def conteudo(self, documento_id: str) -> bytes | mmap.mmap:
+        """
+        Conteúdo UTF-8 do documento: bytes se residente, ou um mmap somente leitura se despejado
+        (aceito por re com padrões bytes sem carregar o arquivo inteiro). Feche o mmap após o uso.
+        """
+        if documento_id in self._residentes:
+            return self._residentes[documento_id]
+        with open(self._despejados[documento_id], 'rb') as arquivo:
+            return mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def texto(self, documento_id: str) -> str:
+        """Texto completo de um documento."""
+        conteudo = self.conteudo(documento_id)
+        if isinstance(conteudo, mmap.mmap):
+            with conteudo:
+                return conteudo[:].decode('utf-8')
+        return conteudo.decode('utf-8')
+
+    def textos(self, doc_type: str | None = None):
+        """Itera (documento_id, texto), um documento por vez."""
+        for documento_id in self.documentos(doc_type):
+            yield documento_id, self.texto(documento_id)
+
+    def fechar(self) -> None:
+        """Descarta os textos e apaga os arquivos despejados."""
+        self._metadados.clear()
+        self._residentes.clear()
+        self._despejados.clear()
+        self._bytes_residentes = 0
+        if self._diretorio is not None:
+            self._finalizador()
+            self._diretorio = None
+
+    def _respeitar_orcamento(self) -> None:
+        # Despeja os documentos residentes mais antigos até caber no orçamento
+        for documento_id in list(self._residentes):
+            if self._bytes_residentes <= self.orcamento_bytes:
+                break
+            conteudo = self._residentes[documento_id]
+            if not conteudo:
+                continue  # Arquivos vazios não podem ser mapeados e não ocupam memória
+            self._sequencia_despejo += 1
+            caminho = os.path.join(self._diretorio_despejo(), f"{self._sequencia_despejo:06d}.txt")
+            with open(caminho, 'wb') as arquivo:
+                arquivo.write(conteudo)
+            del self._residentes[documento_id]
+            self._despejados[documento_id] = caminho
+            self._bytes_residentes -= len(conteudo)
+
+    def _diretorio_despejo(self) -> str:
+        if self._diretorio is None:
+            self._diretorio = tempfile.mkdtemp(prefix='textos_documentos_', dir=self._diretorio_base)
+            # Garante a remoção dos arquivos mesmo se fechar() não for chamado
+            self._finalizador = weakref.finalize(self, shutil.rmtree, self._diretorio, True)
+        return self._diretorio
@@ -39,6 +39,20 @@ try:
 except ImportError:
     pass # Será instalado pelo main.py
 
+from parser_registry import MODOS_EXTRACAO_PDF, REGISTRO_PARSERS
+from ocr_engine import MOTOR_OCR, renderizar_pagina
+from ocr_adaptive import ocr_paginas_adaptativo
+
+# Páginas de PDF com menos caracteres visíveis que isso na camada de texto são tratadas como
+# imagem (digitalizadas) e vão para o OCR; as demais usam o texto nativo
+MIN_CARACTERES_CAMADA_TEXTO = 25
+
+# OCR de PDF adaptativo (150 DPI e releitura a 300 DPI só do que ficou com baixa confiança).
+# Desligado por padrão: todas as páginas são renderizadas a 300 DPI até que benchmark_ocr_adaptativo.py
+# mostre, em extratos reais, latência menor sem perda de transações. Ative por chamada (adaptive=True)
+# ou trocando o padrão aqui
+OCR_ADAPTATIVO = False
+
 
 def detect_file_type_by_filename(filename: str) -> str:
     """Detecta o tipo de documento (extrato, fatura, contracheque) pelo nome do arquivo."""
@@ -52,44 +66,62 @@ def detect_file_type_by_filename(filename: str) -> str:
     return 'desconhecido'
 
 def detect_bank_from_filename(filename: str) -> str:
-    """Tenta detectar o banco pelo nome do arquivo."""
-    filename_lower = filename.lower()
-    if 'c6' in filename_lower:
-        return 'C6 Bank'
-    elif 'nubank' in filename_lower or 'nu_pagamentos' in filename_lower:
-        return 'Nubank'
-    elif 'caixa' in filename_lower:
-        return 'Caixa Econômica Federal'
-    elif 'inter' in filename_lower:
-        return 'Banco Inter'
-    elif 'picpay' in filename_lower:
-        return 'PicPay'
-    elif 'bradesco' in filename_lower:
-        return 'Bradesco'
-    elif 'itau' in filename_lower:
-        return 'Itaú'
-    elif 'santander' in filename_lower:
-        return 'Santander'
-    return 'Desconhecido'
-
-def handle_uploaded_file(file_path: str, file_type: str) -> dict:
+    """Tenta detectar o banco pelo nome do arquivo (identificadores do registro de parsers)."""
+    return REGISTRO_PARSERS.banco_por_arquivo(filename)
+
+def pagina_precisa_ocr(page_text: str | None) -> bool:
+    """Se a página não tem camada de texto útil (página digitalizada) e precisa de OCR."""
+    return len(''.join((page_text or '').split())) < MIN_CARACTERES_CAMADA_TEXTO
+
+def pagina_tem_grade(page) -> bool:
+    """
+    Se a geometria da página (linhas e retângulos) pode formar uma tabela. A estratégia padrão
+    do pdfplumber ("lines") só acha tabelas com ao menos duas arestas horizontais e duas verticais.
+    """
+    return len(page.horizontal_edges) >= 2 and len(page.vertical_edges) >= 2
+
+def handle_uploaded_file(file_path: str, file_type: str, file_name: str = '', extraction_mode: str = 'auto', doc_type: str = None) -> dict:
     """
     Lida com o upload e leitura de diferentes tipos de arquivos.
     Retorna texto e/ou DataFrames de tabelas.
+    Em PDFs, cada página usa a própria camada de texto; só as páginas sem ela passam por OCR
+    (listadas em "ocr_pages", começando em 0), e os textos das páginas são juntados em ordem.
+    :param extraction_mode: O que extrair do PDF ('texto', 'tabelas' ou 'auto', ver MODOS_EXTRACAO_PDF).
+        Em 'auto', o parser de PDF que reconhece o documento (nome do arquivo e texto) decide; sem
+        parser reconhecido, as tabelas só são extraídas das páginas com geometria de grade.
+        Outros valores levantam ValueError.
+    :param doc_type: Tipo do documento, se já conhecido; senão é inferido do nome do arquivo. Em 'auto',
+        só os parsers que aceitam esse tipo são considerados.
     """
+    if extraction_mode not in MODOS_EXTRACAO_PDF:
+        raise ValueError(f"Modo de extração de PDF desconhecido: {extraction_mode!r} (use um de {MODOS_EXTRACAO_PDF})")
     extracted_text = ""
     extracted_tables = []
+    ocr_pages = None
 
     if file_type == 'pdf':
         try:
             import pdfplumber
             with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        extracted_text += page_text + "\n"
-                    tables = page.extract_tables()
-                    for table in tables:
+                textos_paginas = [""] * len(pdf.pages)
+                if extraction_mode != 'tabelas':
+                    ocr_pages = []
+                    for page_num, page in enumerate(pdf.pages):
+                        page_text = page.extract_text()
+                        if pagina_precisa_ocr(page_text):
+                            ocr_pages.append(page_num)
+                        textos_paginas[page_num] = page_text + "\n" if page_text else ""
+
+                modo = extraction_mode
+                if modo == 'auto':
+                    nome = file_name or os.path.basename(file_path)
+                    modo = REGISTRO_PARSERS.modo_extracao_pdf(nome, "".join(textos_paginas), doc_type or detect_file_type_by_filename(nome))
+                    print(f"Modo de extração do PDF: {modo}")
+                # Extração de tabelas é a operação mais cara do pdfplumber: só quando o parser precisa
+                for page_num, page in enumerate(pdf.pages if modo != 'texto' else []):
+                    if modo == 'auto' and not pagina_tem_grade(page):
+                        continue
+                    for table in page.extract_tables():
                         if table:
                             try:
                                 if table and len(table) > 1 and all(table[0]):
@@ -99,7 +131,13 @@ def handle_uploaded_file(file_path: str, file_type: str) -> dict:
                                 extracted_tables.append(df)
                             except Exception as df_e:
                                 print(f"Aviso: Não foi possível converter parte da tabela em DataFrame com pdfplumber: {df_e}. Extraindo como texto.")
-                                extracted_text += "\n".join([str(item) for sublist in table for item in sublist if item is not None]) + "\n"
+                                textos_paginas[page_num] += "\n".join([str(item) for sublist in table for item in sublist if item is not None]) + "\n"
+            if ocr_pages:
+                print(f"Páginas sem camada de texto (OCR): {len(ocr_pages)} de {len(textos_paginas)}")
+                for page_num, texto_ocr in perform_ocr_pdf_pages(file_path, ocr_pages).items():
+                    if texto_ocr.strip():
+                        textos_paginas[page_num] = texto_ocr + "\n"
+            extracted_text = "".join(textos_paginas)
         except ImportError:
             print("pdfplumber não está instalado ou acessível. Não foi possível extrair texto/tabelas de PDF diretamente.")
         except Exception as e:
@@ -148,7 +186,38 @@ def handle_uploaded_file(file_path: str, file_type: str) -> dict:
     elif file_type in ['jpg', 'png', 'jpeg']:
         pass # OCR is handled by perform_ocr in main processing flow
 
-    return {"text": extracted_text, "tables": extracted_tables}
+    return {"text": extracted_text, "tables": extracted_tables, "ocr_pages": ocr_pages}
+
+def perform_ocr_pdf_pages(file_path: str, page_numbers: list[int] = None, adaptive: bool = None) -> dict[int, str]:
+    """
+    Realiza OCR só nas páginas indicadas de um PDF (todas, se `page_numbers` for None).
+    :param adaptive: OCR adaptativo (ver ocr_adaptive); None usa OCR_ADAPTATIVO.
+    :return: Texto de cada página (número da página, começando em 0), na ordem do documento.
+    """
+    texts = {}
+    try:
+        import pytesseract
+        from PIL import Image
+        import fitz # PyMuPDF
+
+        pdf_document = fitz.open(file_path)
+        try:
+            page_nums = list(range(pdf_document.page_count)) if page_numbers is None else sorted(page_numbers)
+            pages = (pdf_document.load_page(page_num) for page_num in page_nums)
+            if OCR_ADAPTATIVO if adaptive is None else adaptive:
+                texts = dict(zip(page_nums, ocr_paginas_adaptativo(pages)))
+            else:
+                # Páginas renderizadas sob demanda, em cinza a 300 DPI, e passadas ao engine sem cópia nem PNG
+                texts = dict(zip(page_nums, MOTOR_OCR.reconhecer(renderizar_pagina(page) for page in pages)))
+        finally:
+            pdf_document.close()
+    except ImportError:
+        print("Erro: pytesseract, Pillow ou PyMuPDF não encontrados ou acessíveis. OCR indisponível.")
+    except pytesseract.TesseractNotFoundError:
+        print("Erro: Tesseract OCR não encontrado. Certifique-se de que está instalado no ambiente e configurado no PATH.")
+    except Exception as e:
+        print(f"Erro durante o OCR: {e}")
+    return texts
 
 def perform_ocr(file_path_or_bytes: str | bytes) -> str:
     """
@@ -165,18 +234,12 @@ def perform_ocr(file_path_or_bytes: str | bytes) -> str:
         if isinstance(file_path_or_bytes, str):
             if file_path_or_bytes.lower().endswith(('.jpg', '.jpeg', '.png')):
                 img = Image.open(file_path_or_bytes)
-                text = pytesseract.image_to_string(img, lang='por+eng')
+                text = next(MOTOR_OCR.reconhecer([img]))
             elif file_path_or_bytes.lower().endswith('.pdf'):
-                pdf_document = fitz.open(file_path_or_bytes)
-                for page_num in range(pdf_document.page_count):
-                    page = pdf_document.load_page(page_num)
-                    pix = page.get_pixmap(matrix=fitz.Matrix(300/72, 300/72)) # Aumentar DPI para melhor OCR
-                    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                    text += pytesseract.image_to_string(img, lang='por+eng') + "\n"
-                pdf_document.close()
+                text = "".join(page_text + "\n" for page_text in perform_ocr_pdf_pages(file_path_or_bytes).values())
         elif isinstance(file_path_or_bytes, bytes):
             img = Image.open(io.BytesIO(file_path_or_bytes))
-            text = pytesseract.image_to_string(img, lang='por+eng')
+            text = next(MOTOR_OCR.reconhecer([img]))
     except ImportError:
         print("Erro: pytesseract, Pillow ou PyMuPDF não encontrados ou acessíveis. OCR indisponível.")
     except pytesseract.TesseractNotFoundError:
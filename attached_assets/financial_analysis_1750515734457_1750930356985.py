@@ -5,10 +5,13 @@ import numpy as np
 from datetime import datetime
 import re
 
-# Importa as configurações globais para detecção de apostas
-# from config import SITES_APOSTAS, PROCESSADORAS_PAGAMENTO_NAO_APOSTA
+# Listas de apostas/processadoras vêm de keyword_dictionaries.json (via obter_dicionarios)
 # Importa as funções de parsing
-# from data_parsing import parse_financial_value
+# from data_parsing import parse_financial_value, extrair_cabecalho_fatura
+from aml_rules import avaliar_regras
+from balance_index import RunningBalanceIndex
+from keyword_dictionaries import obter_dicionarios
+from keyword_matcher import mascara_palavras_chave
 
 
 def calculate_totals(df: pd.DataFrame) -> dict[str, float]:
@@ -26,7 +29,10 @@ def calculate_score(df: pd.DataFrame) -> int:
     """Calcula um score financeiro baseado nas entradas e saídas."""
     total_entrada = df[df["value"] >= 0]["value"].sum()
     total_saida = abs(df[df["value"] < 0]["value"].sum()) # Valor absoluto para cálculo
+    return score_por_totais(total_entrada, total_saida)
 
+def score_por_totais(total_entrada: float, total_saida: float) -> int:
+    """Score financeiro a partir do total de entradas e do total (absoluto) de saídas."""
     if total_entrada == 0 and total_saida == 0:
         return 0
     elif total_saida == 0:
@@ -36,27 +42,87 @@ def calculate_score(df: pd.DataFrame) -> int:
         score = int(500 + 500 * (razao / (razao + 1))) # Normaliza a razão entre 0 e 1, mapeia para 500-1000
         return min(1000, max(0, score)) # Garante que o score fique entre 0 e 1000
 
-def group_by_month(df: pd.DataFrame) -> dict[str, dict[str, float]]:
-    """Agrupa transações por mês, calculando entradas e saídas."""
+def agrupar_por_mes(df: pd.DataFrame, por_categoria: bool = False, por_banco: bool = False) -> pd.DataFrame:
+    """
+    Entradas, saídas e saldo por mês numa tabela float64 indexada por período mensal
+    (PeriodIndex, armazenado como inteiros), ordenada por mês.
+    Com `por_categoria` e/ou `por_banco`, o índice ganha os níveis 'specific_category' e 'bank'.
+    Transações sem data ou valor válidos são ignoradas.
+    """
+    niveis = ['mes'] + (['specific_category'] if por_categoria else []) + (['bank'] if por_banco else [])
     if df.empty:
-        return {}
-    df_copy = df.copy()
-    df_copy["mes"] = pd.to_datetime(df_copy["date"], errors="coerce").dt.to_period("M").astype(str)
-    df_copy.dropna(subset=['mes'], inplace=True) # Remove transações sem data válida
-    
-    agrupado = df_copy.groupby(["mes", "category"])["value"].sum().reset_index()
-    resultado = {}
-    for _, row in agrupado.iterrows():
-        mes = row["mes"]
-        tipo = row["category"]
-        valor = row["value"]
-        if mes not in resultado:
-            resultado[mes] = {"Entrada": 0.0, "Saída": 0.0, "Saldo": 0.0}
-        resultado[mes][tipo] += valor
-        resultado[mes]["Saldo"] = resultado[mes]["Entrada"] + resultado[mes]["Saída"] # Saídas são negativas
-    
-    # Ordenar por mês
-    return dict(sorted(resultado.items()))
+        vazio = pd.DataFrame({coluna: pd.Series(dtype='float64') for coluna in ('Entrada', 'Saída', 'Saldo')})
+        vazio.index = pd.PeriodIndex([], freq='M', name='mes') if len(niveis) == 1 else \
+            pd.MultiIndex.from_arrays([pd.PeriodIndex([], freq='M')] + [[]] * (len(niveis) - 1), names=niveis)
+        return vazio
+
+    periodos = pd.PeriodIndex(pd.to_datetime(df['date'], errors='coerce'), freq='M')
+    valores = pd.to_numeric(df['value'], errors='coerce').to_numpy(dtype=float)
+    validos = ~periodos.isna() & ~np.isnan(valores)
+    valores = valores[validos]
+
+    chaves = [periodos[validos].rename('mes')] + [df[nivel].to_numpy()[validos] for nivel in niveis[1:]]
+    mensal = pd.DataFrame({
+        'Entrada': np.where(valores >= 0, valores, 0.0),
+        'Saída': np.where(valores < 0, valores, 0.0),
+    }).groupby(chaves, sort=True).sum()
+    mensal.index.names = niveis
+    mensal['Saldo'] = mensal['Entrada'] + mensal['Saída'] # Saídas são negativas
+    return mensal
+
+def mensal_para_dict(mensal: pd.DataFrame) -> dict[str, dict[str, float]]:
+    """Adaptador para o formato antigo de group_by_month: {'AAAA-MM': {'Entrada', 'Saída', 'Saldo'}}."""
+    return {str(mes): linha for mes, linha in mensal.to_dict('index').items()}
+
+def group_by_month(df: pd.DataFrame) -> dict[str, dict[str, float]]:
+    """Agrupa transações por mês, calculando entradas e saídas (formato dict legado; ver agrupar_por_mes)."""
+    return mensal_para_dict(agrupar_por_mes(df))
+
+def _posicoes_maiores(magnitudes: np.ndarray, k: int) -> np.ndarray:
+    """Posições das k maiores magnitudes, em ordem decrescente. Só os k selecionados são ordenados."""
+    if k <= 0 or not len(magnitudes):
+        return np.empty(0, dtype=np.intp)
+    if k < len(magnitudes):
+        candidatas = np.argpartition(-magnitudes, k - 1)[:k]
+    else:
+        candidatas = np.arange(len(magnitudes))
+    return candidatas[np.argsort(-magnitudes[candidatas], kind='stable')]
+
+def maiores_transacoes(transactions_df: pd.DataFrame, limites: int | list[int] = 10, fluxos: tuple[str, ...] = ('Saída', 'Entrada'), por: str | None = None) -> dict[str, dict[int, pd.DataFrame]]:
+    """
+    Maiores transações por fluxo ('Entrada' pelo valor, 'Saída' pelo valor absoluto), para um ou
+    vários limites numa única chamada: resultado[fluxo][k] contém as k maiores linhas.
+    Com `por` (uma coluna, ex. 'specific_category', ou 'mes'), o top-k é calculado dentro de cada grupo.
+    A seleção usa np.argpartition (O(n)); apenas as linhas escolhidas são ordenadas e copiadas.
+    """
+    limites = sorted({limites} if isinstance(limites, int) else set(limites))
+    resultado = {fluxo: {k: transactions_df.iloc[:0] for k in limites} for fluxo in fluxos}
+    if transactions_df.empty or not limites:
+        return resultado
+
+    valores = pd.to_numeric(transactions_df['value'], errors='coerce').to_numpy(dtype=float)
+    if por is None:
+        grupos = {None: np.arange(len(valores))}
+    else:
+        chave = pd.PeriodIndex(pd.to_datetime(transactions_df['date'], errors='coerce'), freq='M') if por == 'mes' else transactions_df[por]
+        codigos, _ = pd.factorize(chave, sort=True)
+        grupos = pd.Series(np.arange(len(valores))).groupby(codigos, sort=True).indices
+        grupos.pop(-1, None) # Chave nula
+
+    k_maximo = limites[-1]
+    for fluxo in fluxos:
+        no_fluxo = valores >= 0 if fluxo == 'Entrada' else valores < 0
+        magnitudes = np.abs(valores)
+        por_limite = {k: [] for k in limites}
+        for posicoes in grupos.values():
+            posicoes = posicoes[no_fluxo[posicoes]]
+            # Ordenadas uma vez para o maior limite; os demais são prefixos
+            escolhidas = posicoes[_posicoes_maiores(magnitudes[posicoes], k_maximo)]
+            for k in limites:
+                por_limite[k].append(escolhidas[:k])
+        for k in limites:
+            resultado[fluxo][k] = transactions_df.iloc[np.concatenate(por_limite[k])]
+    return resultado
 
 def extrair_maiores_transacoes(transactions_df: pd.DataFrame, type_of_flow: str = 'Saída', limit: int = 10) -> list[dict]:
     """
@@ -66,125 +132,166 @@ def extrair_maiores_transacoes(transactions_df: pd.DataFrame, type_of_flow: str
     if transactions_df.empty:
         return []
 
-    if type_of_flow == 'Entrada':
-        filtered_df = transactions_df[transactions_df['value'] >= 0].copy()
-        filtered_df.sort_values(by='value', ascending=False, inplace=True)
-    else: # Saída
-        filtered_df = transactions_df[transactions_df['value'] < 0].copy()
-        filtered_df['abs_value'] = abs(filtered_df['value'])
-        filtered_df.sort_values(by='abs_value', ascending=False, inplace=True)
-
-    results = []
-    for _, row in filtered_df.head(limit).iterrows():
-        results.append({
-            'DATA': row['date'].strftime('%d/%m/%Y'),
-            'TIPO': row['original_type_op'], # Tipo original como PIX, Débito, etc.
-            'CATEGORIA_ESPECIFICA': row['specific_category'],
-            'DESCRICAO': row['description'],
-            'VALOR': f"R$ {abs(row['value']):,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
-        })
-    return results
+    fluxo = 'Entrada' if type_of_flow == 'Entrada' else 'Saída'
+    maiores = maiores_transacoes(transactions_df, limit, fluxos=(fluxo,))[fluxo][limit]
+
+    valores = (
+        'R$ ' + maiores['value'].abs().map('{:,.2f}'.format).astype(object).str.translate(str.maketrans(',.', '.,'))
+    ).tolist()
+    return [
+        {
+            'DATA': data.strftime('%d/%m/%Y'),
+            'TIPO': tipo, # Tipo original como PIX, Débito, etc.
+            'CATEGORIA_ESPECIFICA': categoria,
+            'DESCRICAO': descricao,
+            'VALOR': valor,
+        }
+        for data, tipo, categoria, descricao, valor in zip(
+            maiores['date'], maiores['original_type_op'], maiores['specific_category'], maiores['description'], valores
+        )
+    ]
 
 def detectar_apostas_aprimorado(transactions_df: pd.DataFrame) -> list[dict]:
-    """Detecta transações relacionadas a apostas com base em palavras-chave e valores."""
+    """
+    Detecta transações relacionadas a apostas com base em palavras-chave e valores.
+    As listas de sites e processadoras são testadas uma vez por descrição distinta;
+    apenas as transações sinalizadas são formatadas.
+    """
     apostas_detectadas = []
-
-    # Certificar que SITES_APOSTAS e PROCESSADORAS_PAGAMENTO_NAO_APOSTA estão acessíveis
-    # Eles devem ser importados do módulo config.py
-    try:
-        from config import SITES_APOSTAS, PROCESSADORAS_PAGAMENTO_NAO_APOSTA
-    except ImportError:
-        print("Erro: config.py não carregado ou variáveis não acessíveis para detecção de apostas.")
+    if transactions_df.empty:
         return apostas_detectadas
 
-    for _, t in transactions_df.iterrows():
-        if pd.isna(t['description']):
-            continue
-        descricao_lower = t['description'].lower()
-        
-        # Ignorar processadoras legítimas
-        if any(proc in descricao_lower for proc in PROCESSADORAS_PAGAMENTO_NAO_APOSTA):
-            continue
-
-        # Verificar sites de apostas
-        if any(site in descricao_lower for site in SITES_APOSTAS):
-            transaction_info = {
-                'DATA': t['date'].strftime('%d/%m/%Y') if pd.notna(t['date']) else 'N/I',
-                'DESCRICAO': t['description'],
-                'VALOR': f"R$ {abs(t['value']):,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
-                'ALERTA': ''
-            }
-            if t['value'] < 0:
-                transaction_info['TIPO'] = 'Saída - Aposta Online'
-                transaction_info['ALERTA'] = 'Detectada transação de SAÍDA para site de aposta.'
-            else:
-                transaction_info['TIPO'] = 'Entrada - Retorno de Aposta/Ganho'
-                transaction_info['ALERTA'] = 'Detectada transação de ENTRADA de site de aposta.'
-            
-            apostas_detectadas.append(transaction_info)
+    # Sites de apostas, ignorando processadoras legítimas (snapshot vigente dos dicionários)
+    dicionarios = obter_dicionarios()
+    posicoes = np.flatnonzero(mascara_palavras_chave(transactions_df['description'], dicionarios.sites_apostas, dicionarios.processadoras))
+
+    datas = transactions_df['date'].to_numpy()
+    descricoes = transactions_df['description'].to_numpy()
+    valores = transactions_df['value'].to_numpy()
+    for pos in posicoes:
+        data, valor = datas[pos], valores[pos]
+        transaction_info = {
+            'DATA': pd.Timestamp(data).strftime('%d/%m/%Y') if pd.notna(data) else 'N/I',
+            'DESCRICAO': descricoes[pos],
+            'VALOR': f"R$ {abs(valor):,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
+            'ALERTA': ''
+        }
+        if valor < 0:
+            transaction_info['TIPO'] = 'Saída - Aposta Online'
+            transaction_info['ALERTA'] = 'Detectada transação de SAÍDA para site de aposta.'
+        else:
+            transaction_info['TIPO'] = 'Entrada - Retorno de Aposta/Ganho'
+            transaction_info['ALERTA'] = 'Detectada transação de ENTRADA de site de aposta.'
+
+        apostas_detectadas.append(transaction_info)
 
     return apostas_detectadas
 
-def detectar_movimentacoes_suspeitas(transactions_df: pd.DataFrame) -> list[dict]:
-    """Detecta padrões suspeitos de movimentação."""
+def agregar_extrato_diario(transactions_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Agrega o extrato por dia: entradas, saídas (positivas) e total/quantidade de pequenas saídas.
+    As colunas são somas, então agregados de lotes diferentes podem ser combinados com `add`.
+    """
+    diario_vazio = pd.DataFrame({
+        'entrada': pd.Series(dtype='float64'), 'saida': pd.Series(dtype='float64'),
+        'pequenas_total': pd.Series(dtype='float64'), 'pequenas_qtd': pd.Series(dtype='int64'),
+    }, index=pd.DatetimeIndex([]))
+    if transactions_df.empty:
+        return diario_vazio
+
+    datas = pd.to_datetime(transactions_df['date'], errors='coerce')
+    extrato = (datas.notna() & transactions_df['value'].notna() & (transactions_df['doc_type'] == 'extrato_bancario')).to_numpy()
+    if not extrato.any():
+        return diario_vazio
+
+    v = transactions_df['value'].to_numpy(dtype=float)[extrato]
+    saida = v < 0
+    pequena_saida = saida & (np.abs(v) < 1000) # Limite para "pequenas"
+    return pd.DataFrame({
+        'entrada': np.where(saida, 0.0, v),
+        'saida': np.where(saida, -v, 0.0),
+        'pequenas_total': np.where(pequena_saida, -v, 0.0),
+        'pequenas_qtd': pequena_saida.astype(np.int64),
+    }).groupby(datas.dt.normalize().to_numpy()[extrato], sort=True).sum()
+
+def alertas_agregado_diario(diario: pd.DataFrame) -> list[dict]:
+    """Alertas de movimentação circular e de estruturação a partir do agregado diário do extrato."""
+    suspeitas = []
+
+    # Padrão Circular: recebe e repassa a maior parte no mesmo dia (alto volume e quase tudo sai)
+    circular = diario[(diario['entrada'] > 500) & (diario['saida'] >= diario['entrada'] * 0.85) & (diario['saida'] > 0)]
+    for dia, total_entrada_dia, total_saida_dia in zip(circular.index, circular['entrada'], circular['saida']):
+        suspeitas.append({
+            'DATA': dia.strftime('%d/%m/%Y'),
+            'TIPO': 'Movimentação Circular (Pass-through)',
+            'DESCRICAO': f'Recebeu R$ {total_entrada_dia:,.2f} e repassou R$ {total_saida_dia:,.2f} no mesmo dia.',
+            'VALOR': f"R$ {total_entrada_dia:,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
+            'ALERTA': 'Padrão circular pode indicar "pass-through" de recursos. Verificar origem/destino.'
+        })
+
+    # Múltiplas transações pequenas no mesmo dia (possível estruturação): 5+ pequenas saídas somando mais de R$1500
+    estruturacao = diario[(diario['pequenas_qtd'] >= 5) & (diario['pequenas_total'] > 1500)]
+    for dia, qtd, total in zip(estruturacao.index, estruturacao['pequenas_qtd'], estruturacao['pequenas_total']):
+        suspeitas.append({
+            'DATA': dia.strftime('%d/%m/%Y'),
+            'TIPO': 'Possível Estruturação (Pequenas Saídas)',
+            'DESCRICAO': f'{qtd} transações de baixo valor totalizando R$ {total:,.2f}.',
+            'VALOR': f"R$ {total:,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
+            'ALERTA': 'Múltiplas pequenas saídas no mesmo dia. Pode ser tentativa de disfarçar transações maiores.'
+        })
+
+    return suspeitas
+
+def detectar_movimentacoes_suspeitas(transactions_df: pd.DataFrame, regras: list[dict] | None = None) -> list[dict]:
+    """
+    Detecta padrões suspeitos de movimentação.
+    Os detectores circular, de estruturação e de madrugada são avaliados com uma única
+    agregação diária e máscaras booleanas; apenas as linhas sinalizadas são formatadas.
+    Se `regras` for informado, as regras de janela deslizante de aml_rules também são avaliadas.
+    """
     suspeitas = []
     if transactions_df.empty: return suspeitas
 
-    transactions_df['date'] = pd.to_datetime(transactions_df['date'], errors='coerce')
-    transactions_df.dropna(subset=['date', 'value'], inplace=True)
-    if transactions_df.empty: return suspeitas # Pode ficar vazio após dropna
-    
-    # 1. Padrão Circular: Recebe e repassa a maior parte no mesmo dia (apenas extrato)
-    extrato_df = transactions_df[transactions_df['doc_type'] == 'extrato_bancario'].copy()
-    if not extrato_df.empty:
-        daily_transactions = extrato_df.groupby(extrato_df['date'].dt.date)
-        for date, group in daily_transactions:
-            total_entrada_dia = group[group['value'] >= 0]['value'].sum()
-            total_saida_dia = abs(group[group['value'] < 0]['value'].sum())
-
-            if total_entrada_dia > 500 and total_saida_dia >= total_entrada_dia * 0.85 and total_saida_dia > 0: # Alto volume e quase tudo sai
-                suspeitas.append({
-                    'DATA': date.strftime('%d/%m/%Y'),
-                    'TIPO': 'Movimentação Circular (Pass-through)',
-                    'DESCRICAO': f'Recebeu R$ {total_entrada_dia:,.2f} e repassou R$ {total_saida_dia:,.2f} no mesmo dia.',
-                    'VALOR': f"R$ {total_entrada_dia:,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
-                    'ALERTA': 'Padrão circular pode indicar "pass-through" de recursos. Verificar origem/destino.'
-                })
-
-        # 2. Múltiplas transações pequenas e sequenciais (possível estruturação)
-        for date, group in daily_transactions:
-            saidas_dia = group[group['value'] < 0].copy().sort_values(by='date')
-            pequenas_saidas = saidas_dia[abs(saidas_dia['value']) < 1000] # Limite para "pequenas"
-
-            if len(pequenas_saidas) >= 5 and abs(pequenas_saidas['value'].sum()) > 1500: # 5+ pequenas saídas somando mais de R$1500
-                suspeitas.append({
-                    'DATA': date.strftime('%d/%m/%Y'),
-                    'TIPO': 'Possível Estruturação (Pequenas Saídas)',
-                    'DESCRICAO': f'{len(pequenas_saidas)} transações de baixo valor totalizando R$ {abs(pequenas_saidas["value"].sum()):,.2f}.',
-                    'VALOR': f"R$ {abs(pequenas_saidas['value'].sum()):,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
-                    'ALERTA': 'Múltiplas pequenas saídas no mesmo dia. Pode ser tentativa de disfarçar transações maiores.'
-                })
-    
-    # 3. Transações em horários atípicos (madrugada)
-    for _, t in transactions_df.iterrows():
-        if pd.notna(t['date']) and pd.notna(t['value']):
-            hora = t['date'].hour
-            if 0 <= hora <= 5 and abs(t['value']) > 500: # Valor considerável
-                suspeitas.append({
-                    'DATA': t['date'].strftime('%d/%m/%Y %H:%M'),
-                    'TIPO': 'Horário Atípico (Madrugada)',
-                    'DESCRICAO': t['description'],
-                    'VALOR': f"R$ {abs(t['value']):,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
-                    'ALERTA': 'Transação de valor considerável em horário incomum. Verificar legitimidade.'
-                })
+    datas = pd.to_datetime(transactions_df['date'], errors='coerce')
+    validas = (datas.notna() & transactions_df['value'].notna()).to_numpy()
+    if not validas.any(): return suspeitas # Pode ficar vazio após descartar datas/valores inválidos
+
+    datas = datas[validas]
+    valores = transactions_df['value'].to_numpy(dtype=float)[validas]
+
+    # 1 e 2. Agregação diária única do extrato: entradas, saídas e pequenas saídas por dia
+    suspeitas.extend(alertas_agregado_diario(agregar_extrato_diario(transactions_df)))
+
+    # 3. Transações em horários atípicos (madrugada) com valor considerável
+    madrugada = np.flatnonzero((datas.dt.hour.to_numpy() <= 5) & (np.abs(valores) > 500))
+    if len(madrugada):
+        descricoes = transactions_df['description'].to_numpy()[validas]
+        for pos in madrugada:
+            suspeitas.append({
+                'DATA': datas.iloc[pos].strftime('%d/%m/%Y %H:%M'),
+                'TIPO': 'Horário Atípico (Madrugada)',
+                'DESCRICAO': descricoes[pos],
+                'VALOR': f"R$ {abs(valores[pos]):,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
+                'ALERTA': 'Transação de valor considerável em horário incomum. Verificar legitimidade.'
+            })
+
+    # 4. Regras AML de janela deslizante (todas numa única passada)
+    if regras:
+        suspeitas.extend(avaliar_regras(transactions_df, regras))
 
     return suspeitas
 
-def analyze_risk(transactions_df: pd.DataFrame, text_content: str = "") -> dict[str, str]:
+def analyze_risk(transactions_df: pd.DataFrame, text_content: str = "", cabecalho_fatura: dict | None = None,
+                 indice_saldo: RunningBalanceIndex | None = None) -> dict[str, str]:
     """
     Analisa comportamentos de risco ou inadimplência,
     incluindo saldo negativo persistente, alto volume de pequenas saídas
     e uso do limite de crédito.
+    O limite e as menções a pagamento mínimo vêm de `cabecalho_fatura` (extraído uma vez por
+    documento); sem ele, são extraídos de `text_content`.
+    O saldo negativo vem de `indice_saldo` (mantido pelo sistema junto ao histórico do cliente);
+    sem ele, o índice é montado a partir das transações de extrato (ancorado no saldo informado
+    pelo extrato, quando o parser o fornece).
     """
     risk_indicators = {}
     if transactions_df.empty: return risk_indicators
@@ -197,14 +304,13 @@ def analyze_risk(transactions_df: pd.DataFrame, text_content: str = "") -> dict[
     # --- Análise do Extrato Bancário ---
     extrato_df = transactions_df[transactions_df['doc_type'] == 'extrato_bancario'].copy()
     if not extrato_df.empty:
-        extrato_df = extrato_df.sort_values(by='date').reset_index(drop=True)
-        extrato_df['running_balance'] = extrato_df['value'].cumsum()
+        if indice_saldo is None:
+            indice_saldo = RunningBalanceIndex.de_transacoes(extrato_df)
 
         # Saldo negativo persistente
-        negative_balances = extrato_df[extrato_df['running_balance'] < 0]
-        if not negative_balances.empty:
-            num_negative_days = negative_balances['date'].dt.date.nunique()
-            min_negative_balance = negative_balances['running_balance'].min()
+        if indice_saldo.contagem_negativos:
+            num_negative_days = indice_saldo.dias_negativos
+            min_negative_balance = indice_saldo.saldo_minimo
             risk_indicators['Saldo Negativo (Cheque Especial/Descoberto)'] = f"{num_negative_days} dias com saldo negativo (Mínimo: R$ {min_negative_balance:.2f})"
             if num_negative_days > 7 or abs(min_negative_balance) > 1000:
                 risk_indicators['Alerta de Endividamento (Uso Recorrente de Descoberto)'] = "Alto: Uso frequente ou elevado do limite, indicando dependência de crédito."
@@ -231,11 +337,9 @@ def analyze_risk(transactions_df: pd.DataFrame, text_content: str = "") -> dict[
     if not fatura_df.empty:
         total_card_expenses = abs(fatura_df[fatura_df['value'] < 0]['value'].sum())
         
-        limite_total = None
-        # Extrair limite total da fatura a partir do texto (passado do main_orchestrator)
-        limite_total_match = re.search(r'Limite total:\s*R\$?\s*([\d\.,]+)', text_content, re.IGNORECASE)
-        if limite_total_match:
-            limite_total = parse_financial_value(limite_total_match.group(1))
+        if cabecalho_fatura is None:
+            cabecalho_fatura = extrair_cabecalho_fatura(text_content)
+        limite_total = cabecalho_fatura.get('limite_total')
 
         if limite_total is not None and limite_total > 0:
             utilization_rate = total_card_expenses / limite_total
@@ -268,8 +372,90 @@ def analyze_risk(transactions_df: pd.DataFrame, text_content: str = "") -> dict[
             risk_indicators['Padrão de Compra por Impulso (Cartão)'] = "Nenhum padrão significativo de compras por impulso no cartão identificado neste período."
 
         # Alerta de Pagamento Mínimo/Atraso (se presente na fatura)
-        if re.search(r'Pagamento mínimo ou parcial', text_content, re.IGNORECASE) or \
-           re.search(r'Atrasar ou pagar menos que o mínimo da fatura', text_content, re.IGNORECASE):
+        if cabecalho_fatura.get('pagamento_minimo'):
             risk_indicators['Alerta: Menção a Pagamento Mínimo/Atraso na Fatura'] = "A fatura contém menções a pagamento mínimo ou atraso, o que pode indicar dificuldades financeiras se for uma prática regular."
 
-    return risk_indicators
\ No newline at end of file
+    return risk_indicators
+
+class AnaliseIncremental:
+    """
+    Agregados acumulados das transações, atualizados a cada lote novo (ex.: um documento)
+    sem reprocessar o histórico:
+    - mensal: soma de valores por (mês, bucket, categoria específica);
+    - diario: entradas/saídas e pequenas saídas do extrato por dia (ver agregar_extrato_diario),
+      de onde saem o saldo diário e os alertas circular/estruturação, reavaliados só nos dias afetados;
+    - apostas_mensal: quantidade e total de transações de apostas por mês e sentido.
+    Os lotes devem conter apenas transações novas (já deduplicadas) e categorizadas por
+    categorizar_em_buckets. Os resultados equivalem ao recálculo completo, a menos da ordem
+    das somas de ponto flutuante.
+    """
+
+    def __init__(self):
+        self.mensal = pd.Series(dtype='float64', index=pd.MultiIndex.from_arrays([[], [], []], names=['mes', 'bucket', 'specific_category']))
+        self.diario = agregar_extrato_diario(pd.DataFrame())
+        self.apostas_mensal = pd.DataFrame(columns=['qtd_saida', 'total_saida', 'qtd_entrada', 'total_entrada'], dtype='float64')
+        self.total_transacoes = 0
+        self._alertas_circular = {}
+        self._alertas_estruturacao = {}
+
+    def adicionar(self, transacoes: pd.DataFrame) -> dict[str, list]:
+        """Incorpora um lote de transações novas. Retorna os meses e dias afetados."""
+        if transacoes.empty:
+            return {'meses': [], 'dias': []}
+        self.total_transacoes += len(transacoes)
+
+        meses = pd.to_datetime(transacoes['date'], errors='coerce').dt.strftime('%Y-%m').fillna('sem_data')
+        mensal_lote = transacoes.groupby([meses.rename('mes'), transacoes['bucket'].astype(object), transacoes['specific_category']])['value'].sum()
+        self.mensal = self.mensal.add(mensal_lote, fill_value=0.0)
+
+        diario_lote = agregar_extrato_diario(transacoes)
+        if not diario_lote.empty:
+            self.diario = self.diario.add(diario_lote, fill_value=0).astype({'pequenas_qtd': 'int64'})
+            self._reavaliar_dias(diario_lote.index)
+
+        dicionarios = obter_dicionarios()
+        apostas = mascara_palavras_chave(transacoes['description'], dicionarios.sites_apostas, dicionarios.processadoras)
+        if apostas.any():
+            valores = transacoes['value'].to_numpy(dtype=float)[apostas]
+            saida = valores < 0
+            apostas_lote = pd.DataFrame({
+                'qtd_saida': saida.astype(float), 'total_saida': np.where(saida, -valores, 0.0),
+                'qtd_entrada': (~saida).astype(float), 'total_entrada': np.where(saida, 0.0, valores),
+            }).groupby(meses.to_numpy()[apostas]).sum()
+            self.apostas_mensal = self.apostas_mensal.add(apostas_lote, fill_value=0.0)
+
+        return {'meses': sorted(meses.unique()), 'dias': list(diario_lote.index)}
+
+    def _reavaliar_dias(self, dias: pd.Index) -> None:
+        # Os alertas diários só dependem do agregado do próprio dia
+        for dia in dias:
+            self._alertas_circular.pop(dia, None)
+            self._alertas_estruturacao.pop(dia, None)
+            for alerta in alertas_agregado_diario(self.diario.loc[[dia]]):
+                destino = self._alertas_circular if alerta['TIPO'].startswith('Movimentação Circular') else self._alertas_estruturacao
+                destino[dia] = alerta
+
+    def visao(self, *buckets: str) -> pd.DataFrame:
+        """Total por categoria específica dos buckets pedidos (colunas 'specific_category' e 'value')."""
+        selecionado = self.mensal[self.mensal.index.get_level_values('bucket').isin(buckets)]
+        return selecionado.groupby(level='specific_category').sum().rename('value').reset_index()
+
+    def total(self, *buckets: str) -> float:
+        return float(self.mensal[self.mensal.index.get_level_values('bucket').isin(buckets)].sum())
+
+    def score(self) -> int:
+        """Score financeiro do extrato (mesmo cálculo de calculate_score)."""
+        return score_por_totais(self.total('entrada_extrato'), abs(self.total('saida_extrato')))
+
+    def alertas_diarios(self) -> list[dict]:
+        """Alertas circular e de estruturação, na mesma ordem de detectar_movimentacoes_suspeitas."""
+        return [self._alertas_circular[d] for d in sorted(self._alertas_circular)] + \
+               [self._alertas_estruturacao[d] for d in sorted(self._alertas_estruturacao)]
+
+    def saldo_diario(self) -> pd.Series:
+        """Saldo acumulado do extrato ao fim de cada dia."""
+        return (self.diario['entrada'] - self.diario['saida']).cumsum()
+
+    def totais_apostas(self) -> dict[str, float]:
+        """Quantidade e total (absoluto) das transações de apostas, por sentido."""
+        return {coluna: float(self.apostas_mensal[coluna].sum()) for coluna in self.apostas_mensal.columns}
\ No newline at end of file
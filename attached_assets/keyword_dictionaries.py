@@ -0,0 +1,140 @@
+# keyword_dictionaries.py
+
+"""
+Dicionários de palavras-chave (sites de apostas, processadoras legítimas e termos de
+categorias) carregados de keyword_dictionaries.json.
+
+Cada carga é compilada num snapshot imutável de KeywordMatcher com uma versão própria.
+O arquivo é verificado periodicamente: quando muda, um novo snapshot é montado fora do
+caminho de leitura e trocado atomicamente, sem reiniciar os processos residentes. Um
+arquivo inválido é ignorado e o snapshot anterior continua em uso.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from keyword_matcher import KeywordMatcher
+
+CAMINHO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'keyword_dictionaries.json')
+CATEGORIA_APOSTAS = 'Apostas e Jogos de Azar'
+
+
+class KeywordDictionaries:
+    """Snapshot imutável e versionado dos dicionários compilados."""
+
+    def __init__(self, dados: dict, versao: str):
+        self.versao = versao
+        self.listas = {nome: tuple(termos) for nome, termos in dados.get('listas', {}).items()}
+        for obrigatoria in ('sites_apostas', 'processadoras_pagamento_nao_aposta'):
+            if obrigatoria not in self.listas:
+                raise ValueError(f"Lista obrigatória '{obrigatoria}' ausente do dicionário de palavras-chave.")
+
+        self.sites_apostas = KeywordMatcher(self.listas['sites_apostas'])
+        self.processadoras = KeywordMatcher(self.listas['processadoras_pagamento_nao_aposta'])
+        # Categorias na ordem do arquivo (a primeira que casar vence); '@lista' referencia uma lista acima
+        self.categorias = [
+            (categoria, KeywordMatcher(self._expandir(termos)))
+            for categoria, termos in dados.get('categorias', {}).items()
+        ]
+
+    def _expandir(self, termos: list[str]) -> list[str]:
+        expandidos = []
+        for termo in termos:
+            if termo.startswith('@'):
+                if termo[1:] not in self.listas:
+                    raise ValueError(f"Referência a lista inexistente no dicionário de palavras-chave: {termo}")
+                expandidos.extend(self.listas[termo[1:]])
+            else:
+                expandidos.append(termo)
+        return expandidos
+
+
+def _validar_estrutura(dados) -> None:
+    """ValueError se o conteúdo não tem a forma esperada: objeto com 'listas' e 'categorias' de nome -> lista de textos."""
+    if not isinstance(dados, dict):
+        raise ValueError(f"O dicionário de palavras-chave deve ser um objeto JSON, não {type(dados).__name__}.")
+    for secao in ('listas', 'categorias'):
+        grupos = dados.get(secao, {})
+        if not isinstance(grupos, dict):
+            raise ValueError(f"'{secao}' do dicionário de palavras-chave deve ser um objeto.")
+        for nome, termos in grupos.items():
+            if not isinstance(termos, list) or not all(isinstance(termo, str) for termo in termos):
+                raise ValueError(f"'{secao}.{nome}' do dicionário de palavras-chave deve ser uma lista de textos.")
+
+
+def carregar_dicionarios(caminho: str = CAMINHO_PADRAO) -> KeywordDictionaries:
+    """Lê e compila o arquivo de dicionários. A versão combina o campo 'versao' e o hash do conteúdo."""
+    with open(caminho, 'rb') as arquivo:
+        conteudo = arquivo.read()
+    dados = json.loads(conteudo.decode('utf-8'))
+    _validar_estrutura(dados)
+    versao = f"{dados.get('versao', 0)}-{hashlib.sha256(conteudo).hexdigest()[:12]}"
+    return KeywordDictionaries(dados, versao)
+
+
+class KeywordDictionaryStore:
+    """Mantém o snapshot atual e o recarrega quando o arquivo muda."""
+
+    def __init__(self, caminho: str = CAMINHO_PADRAO, intervalo_verificacao: float = 5.0):
+        self.caminho = caminho
+        self.intervalo_verificacao = intervalo_verificacao
+        self._trava = threading.Lock()
+        self._assinatura = self._assinatura_arquivo()
+        self._atual = carregar_dicionarios(caminho)
+        self._proxima_verificacao = time.monotonic() + intervalo_verificacao
+
+    def _assinatura_arquivo(self) -> tuple[int, int] | None:
+        try:
+            estado = os.stat(self.caminho)
+        except OSError:
+            return None
+        return (estado.st_mtime_ns, estado.st_size)
+
+    def atual(self) -> KeywordDictionaries:
+        """Retorna o snapshot vigente, verificando o arquivo no máximo uma vez por intervalo."""
+        if time.monotonic() >= self._proxima_verificacao:
+            self.recarregar_se_alterado()
+        return self._atual
+
+    def recarregar_se_alterado(self) -> bool:
+        """Recompila e troca o snapshot se o arquivo mudou. Retorna True se houve troca."""
+        # Só uma thread recompila; as demais seguem lendo o snapshot vigente
+        if not self._trava.acquire(blocking=False):
+            return False
+        try:
+            self._proxima_verificacao = time.monotonic() + self.intervalo_verificacao
+            assinatura = self._assinatura_arquivo()
+            if assinatura is None or assinatura == self._assinatura:
+                return False
+            try:
+                novo = carregar_dicionarios(self.caminho)
+            except Exception as e:  # Qualquer conteúdo malformado: a recarga falha e o snapshot vigente continua
+                logging.error(f"Dicionário de palavras-chave inválido em {self.caminho}; mantendo a versão {self._atual.versao}: {e}")
+                self._assinatura = assinatura
+                return False
+            self._assinatura = assinatura
+            trocou = novo.versao != self._atual.versao
+            self._atual = novo  # Troca atômica da referência
+            if trocou:
+                logging.info(f"Dicionário de palavras-chave recarregado: versão {novo.versao}")
+            return trocou
+        finally:
+            self._trava.release()
+
+
+_STORE_PADRAO = None
+_TRAVA_STORE = threading.Lock()
+
+
+def obter_dicionarios() -> KeywordDictionaries:
+    """Snapshot vigente do dicionário padrão (keyword_dictionaries.json ao lado deste módulo)."""
+    global _STORE_PADRAO
+    if _STORE_PADRAO is None:
+        with _TRAVA_STORE:
+            if _STORE_PADRAO is None:
+                _STORE_PADRAO = KeywordDictionaryStore()
+    return _STORE_PADRAO.atual()
@@ -0,0 +1,92 @@
+# keyword_matcher.py
+
+"""
+Busca de listas de palavras-chave em descrições de transações.
+
+Uma lista de termos é compilada uma única vez num padrão em forma de trie (prefixos
+comuns fatorados); a busca equivale a `any(termo in descricao for termo in termos)`,
+mas roda no motor de regex com custo por caractere limitado pela profundidade da trie,
+e não pelo número de termos. Ela é aplicada apenas ao conjunto de descrições únicas,
+com o resultado propagado de volta como máscara booleana.
+"""
+
+import re
+from typing import Callable, Iterable
+
+import numpy as np
+import pandas as pd
+
+
+def _padrao_trie(termos: Iterable[str]) -> str:
+    """
+    Monta um padrão regex em forma de trie. Como só interessa saber se algum termo
+    ocorre, um termo que é prefixo de outro torna o mais longo redundante e o ramo
+    é podado no nó terminal.
+    """
+    raiz = {}
+    for termo in termos:
+        no = raiz
+        for caractere in termo:
+            if no.get('') is True:
+                break
+            no = no.setdefault(caractere, {})
+        else:
+            no.clear()
+            no[''] = True
+
+    def renderizar(no: dict) -> str:
+        if no.get('') is True:
+            return ''
+        folhas = sorted(c for c, filho in no.items() if filho.get('') is True)
+        ramos = [re.escape(c) + renderizar(filho) for c, filho in sorted(no.items()) if filho.get('') is not True]
+        if len(folhas) == 1:
+            ramos.append(re.escape(folhas[0]))
+        elif folhas:
+            ramos.append('[' + ''.join(re.escape(c) for c in folhas) + ']')
+        return ramos[0] if len(ramos) == 1 else '(?:' + '|'.join(ramos) + ')'
+
+    return renderizar(raiz)
+
+
+class KeywordMatcher:
+    """Conjunto de termos compilado para busca por substring."""
+
+    def __init__(self, termos: Iterable[str], normalizar: Callable[[str], str] = str.lower):
+        self.normalizar = normalizar
+        # Termos vazios casariam com qualquer texto
+        self.termos = sorted({normalizar(t) for t in termos if t})
+        self._padrao = re.compile(_padrao_trie(self.termos)) if self.termos else None
+
+    def contem(self, texto: str) -> bool:
+        """Indica se algum termo aparece no texto (após normalização)."""
+        return self._padrao is not None and self._padrao.search(self.normalizar(texto)) is not None
+
+    def contem_normalizado(self, textos: Iterable[str]) -> np.ndarray:
+        """Aplica a busca a textos já normalizados, retornando uma máscara booleana."""
+        textos = list(textos)
+        if self._padrao is None:
+            return np.zeros(len(textos), dtype=bool)
+        busca = self._padrao.search
+        return np.fromiter((busca(t) is not None for t in textos), dtype=bool, count=len(textos))
+
+
+def mascara_palavras_chave(descricoes: pd.Series | Iterable, incluir: KeywordMatcher, excluir: KeywordMatcher | None = None) -> np.ndarray:
+    """
+    Máscara das descrições que contêm algum termo de `incluir` e nenhum termo de `excluir`.
+    Cada descrição distinta é normalizada e testada uma única vez; descrições nulas nunca casam.
+    """
+    codigos, unicas = pd.factorize(pd.Series(descricoes, dtype=object), use_na_sentinel=True)
+    if not len(unicas):
+        return np.zeros(len(codigos), dtype=bool)
+
+    normalizadas = [incluir.normalizar(str(d)) for d in unicas]
+    casa = incluir.contem_normalizado(normalizadas)
+    if excluir is not None and casa.any():
+        candidatas = np.flatnonzero(casa)
+        if excluir.normalizar is not incluir.normalizar:
+            textos = [excluir.normalizar(str(unicas[i])) for i in candidatas]
+        else:
+            textos = [normalizadas[i] for i in candidatas]
+        casa[candidatas[excluir.contem_normalizado(textos)]] = False
+
+    return np.where(codigos >= 0, casa[np.maximum(codigos, 0)], False)
@@ -62,25 +62,49 @@ except ImportError:
 
 from config import SITES_APOSTAS, PROCESSADORAS_PAGAMENTO_NAO_APOSTA, MAPPING_COLUNAS_PADRAO_GENERICO
 from file_io_utils import detect_file_type_by_filename, detect_bank_from_filename, handle_uploaded_file, perform_ocr
-from data_parsing import parse_date_string, parse_financial_value, extrair_dados_cadastrais, processar_contracheque, detect_document_type, extract_transactions, _identificar_tipo_transacao_simples
-from bank_specific_parsers import parse_nubank_extrato_pdf, parse_c6_fatura_pdf
-from dataframe_parsers import process_dataframe_generic, process_nubank_extrato_csv, process_nubank_fatura_csv, process_inter_extrato_csv, process_inter_fatura_csv, process_caixa_extrato_csv, process_picpay_fatura_csv, _mapear_colunas_automaticamente
-from categorization_logic import categorizar_transacao_granular, categorize_transactions_detailed
-from financial_analysis import calculate_totals, calculate_score, group_by_month, extrair_maiores_transacoes, detectar_apostas_aprimorado, detectar_movimentacoes_suspeitas, analyze_risk
-from report_generation import generate_extrato_summary, generate_fatura_summary, generate_general_financial_summary
+from pdf_tables import extrair_tabelas_pdf, BACKEND_TABELAS_PADRAO
+from data_parsing import parse_date_string, parse_financial_value, extrair_dados_cadastrais, processar_contracheque, extrair_cabecalho_fatura, consolidar_cabecalhos_fatura, detect_document_type, extract_transactions, _identificar_tipo_transacao_simples
+# Os parsers específicos de banco (bank_specific_parsers, dataframe_parsers) são carregados pelo registro quando usados
+from dataframe_parsers import process_dataframe_generic, _mapear_colunas_automaticamente
+from categorization_logic import categorizar_transacao_granular, categorize_transactions_detailed, categorizar_em_buckets, selecionar_bucket, BUCKET_ENTRADA_EXTRATO, BUCKET_SAIDA_EXTRATO, BUCKET_DEBITO_CARTAO, BUCKET_CREDITO_CARTAO
+from financial_analysis import calculate_totals, calculate_score, group_by_month, extrair_maiores_transacoes, detectar_apostas_aprimorado, detectar_movimentacoes_suspeitas, analyze_risk, AnaliseIncremental
+from report_generation import generate_extrato_summary, generate_fatura_summary, generate_general_financial_summary, resumir_extrato, resumir_fatura, resumir_financeiro_geral, formatar_resumo_extrato, formatar_tabela_metricas
+from aml_rules import REGRAS_AML_PADRAO
+from document_text_store import DocumentTextStore
+from parser_registry import REGISTRO_PARSERS
+from transaction_store import TransactionStore
+from balance_index import RunningBalanceIndex, ARQUIVO_INDICE_SALDO, reconciliar_saldos
+from transaction_dedup import DeduplicadorTransacoes
+from transaction_regex import OrcamentoRegex
 
 
 # --- Classe Principal do Sistema ---
 class FinancialAnalysisSystem:
-    def __init__(self):
-        # DataFrames de transações consolidadas de todos os arquivos processados
-        self.all_transactions_raw_df = pd.DataFrame()
-        self.inputs_extrato_consolidated_df = pd.DataFrame()
-        self.outputs_extrato_consolidated_df = pd.DataFrame()
-        self.card_transactions_consolidated_df = pd.DataFrame()
-        self.card_credits_consolidated_df = pd.DataFrame()
-
-        # Resumos e indicadores
+    def __init__(self, transaction_store: TransactionStore | None = None):
+        """
+        :param transaction_store: Armazenamento persistente do cliente (opcional). Se informado, o histórico
+                                  já gravado é carregado (via memory-map) e cada documento novo só acrescenta suas transações.
+        """
+        self.transaction_store = transaction_store
+
+        # DataFrame de transações consolidadas de todos os arquivos processados.
+        # As visões de extrato/cartão são selecionadas pela coluna 'bucket' (ver propriedades abaixo)
+        self.all_transactions_raw_df = transaction_store.carregar() if transaction_store is not None else pd.DataFrame()
+
+        # Chaves normalizadas (banco, conta, dia, valor, descrição) com contagem de ocorrências,
+        # para reconhecer transações repetidas entre documentos que se sobrepõem
+        self.deduplicador = DeduplicadorTransacoes()
+        self.deduplicador.adicionar(self.all_transactions_raw_df)
+
+        # Agregados acumulados (mensal por categoria, diário do extrato, apostas), atualizados a cada documento
+        self.analise_incremental = AnaliseIncremental()
+        if not self.all_transactions_raw_df.empty:
+            self.analise_incremental.adicionar(categorizar_em_buckets(self.all_transactions_raw_df.copy()))
+
+        # Saldo acumulado do extrato (ordenado por data), persistido junto ao histórico do cliente
+        self.indice_saldo = self._carregar_indice_saldo()
+
+        # Resumos numéricos (formatados em pt-BR apenas em get_analysis_results) e indicadores
         self.extrato_summary_consolidated = pd.DataFrame()
         self.fatura_summary_consolidated = pd.DataFrame()
         self.general_financial_summary_consolidated = pd.DataFrame()
@@ -90,39 +114,85 @@ class FinancialAnalysisSystem:
         self.gambling_transactions_consolidated = []
         self.suspicious_transactions_consolidated = []
         self.financial_score = 0
-        self.all_extracted_text = "" # Armazena texto de todos os documentos
-
-    def process_document(self, file_path: str, file_type: str, file_name: str) -> bool:
+        # Linhas cujo saldo informado pelo extrato não confere (lacunas ou linhas repetidas na extração)
+        self.divergencias_saldo = pd.DataFrame()
+        # Documentos cujo orçamento de regex venceu: as transações extraídas deles podem estar incompletas
+        self.documentos_orcamento_regex_esgotado = []
+        # Texto de cada documento (em memória até o orçamento, despejado em disco além dele);
+        # os metadados usados pelas análises (tipo, cabeçalho da fatura) ficam residentes
+        self.document_texts = DocumentTextStore()
+
+    def _carregar_indice_saldo(self) -> RunningBalanceIndex:
+        if self.transaction_store is None:
+            return RunningBalanceIndex.de_transacoes(self.all_transactions_raw_df)
+        caminho = os.path.join(self.transaction_store.diretorio, ARQUIVO_INDICE_SALDO)
+        # O índice salvo vale se foi calculado das mesmas partes do histórico (nomes, tamanhos e datas)
+        assinatura = self.transaction_store.assinatura()
+        if RunningBalanceIndex.assinatura_salva(caminho) == assinatura:
+            return RunningBalanceIndex.carregar(caminho)
+        # Índice ausente ou desatualizado em relação ao histórico: reconstrói e grava
+        indice = RunningBalanceIndex.de_transacoes(self.all_transactions_raw_df)
+        indice.salvar(caminho, assinatura)
+        return indice
+
+    @property
+    def fatura_headers(self) -> list[dict]:
+        """Cabeçalho extraído de cada fatura processada (um por documento, na ordem de processamento)."""
+        return [self.document_texts.metadados(doc)['cabecalho_fatura'] for doc in self.document_texts.documentos('fatura_cartao')]
+
+    @property
+    def all_extracted_text(self) -> str:
+        """Texto de todos os documentos concatenado (montado sob demanda; prefira consultar document_texts por documento)."""
+        return "".join(texto + "\n" for _, texto in self.document_texts.textos())
+
+    @property
+    def inputs_extrato_consolidated_df(self) -> pd.DataFrame:
+        return selecionar_bucket(self.all_transactions_raw_df, BUCKET_ENTRADA_EXTRATO)
+
+    @property
+    def outputs_extrato_consolidated_df(self) -> pd.DataFrame:
+        return selecionar_bucket(self.all_transactions_raw_df, BUCKET_SAIDA_EXTRATO)
+
+    @property
+    def card_transactions_consolidated_df(self) -> pd.DataFrame:
+        return selecionar_bucket(self.all_transactions_raw_df, BUCKET_DEBITO_CARTAO)
+
+    @property
+    def card_credits_consolidated_df(self) -> pd.DataFrame:
+        return selecionar_bucket(self.all_transactions_raw_df, BUCKET_CREDITO_CARTAO)
+
+    def process_document(self, file_path: str, file_type: str, file_name: str, table_backend: str = BACKEND_TABELAS_PADRAO) -> bool:
         """
         Processa um único documento financeiro, extraindo, categorizando e contribuindo para os totais consolidados.
         :param file_path: Caminho para o arquivo.
         :param file_type: Tipo do arquivo (inferido ou passado explicitamente).
         :param file_name: Nome original do arquivo, útil para detecção de banco/tipo.
+        :param table_backend: Backend das tabelas de PDFs sem texto ('tabula', o padrão, 'tabula_jvm', 'pymupdf' ou 'auto'; ver pdf_tables).
         """
         print(f"Iniciando processamento para: {file_name} (Tipo: {file_type.upper()})")
 
-        extracted_data = handle_uploaded_file(file_path, file_type)
+        extracted_data = handle_uploaded_file(file_path, file_type, file_name=file_name)
         current_extracted_text = extracted_data['text']
         current_extracted_tables = extracted_data['tables']
-        self.all_extracted_text += current_extracted_text + "\n" # Acumula todo o texto
+        # Páginas sem camada de texto já passaram por OCR na leitura do PDF (None: o PDF não pôde ser lido página a página)
+        pdf_ocr_feito = extracted_data.get('ocr_pages') is not None
 
         # Se for PDF ou imagem e a extração inicial não encontrou texto ou tabelas, tentar OCR/Tabula
         if (not current_extracted_text.strip() and not current_extracted_tables) and (file_type in ['pdf', 'jpg', 'png', 'jpeg']):
             print("Conteúdo vazio. Tentando OCR/Tabula para extrair conteúdo do documento.")
             if file_type == 'pdf':
                 try:
-                    import tabula
-                    temp_dfs = tabula.read_pdf(file_path, pages='all', multiple_tables=True, pandas_options={'header': None})
-                    for df in temp_dfs:
-                        if not df.empty:
-                            current_extracted_tables.append(df)
-                    current_extracted_text += perform_ocr(file_path)
-                except ImportError:
-                    print("tabula-py não está instalado. Pulando extração de tabela via tabula.")
-                    current_extracted_text += perform_ocr(file_path)
+                    current_extracted_tables.extend(extrair_tabelas_pdf(file_path, table_backend))
+                    if not pdf_ocr_feito:
+                        current_extracted_text += perform_ocr(file_path)
+                except ImportError as e:
+                    print(f"Backend de tabelas indisponível ({e}). Pulando extração de tabelas.")
+                    if not pdf_ocr_feito:
+                        current_extracted_text += perform_ocr(file_path)
                 except Exception as e:
-                    print(f"Erro ao usar tabula-py ou OCR em PDF: {e}. Tentando OCR bruto.")
-                    current_extracted_text += perform_ocr(file_path)
+                    print(f"Erro ao extrair tabelas ou OCR em PDF: {e}. Tentando OCR bruto.")
+                    if not pdf_ocr_feito:
+                        current_extracted_text += perform_ocr(file_path)
             else: # Imagem
                 current_extracted_text += perform_ocr(file_path)
 
@@ -136,6 +206,12 @@ class FinancialAnalysisSystem:
 
         doc_type = detect_document_type(current_extracted_text, current_extracted_tables, file_type, file_name)
 
+        # Guarda o texto do documento; total, vencimento, limites e parcelamento da fatura são lidos uma única vez
+        metadados_documento = {'arquivo': file_name, 'doc_type': doc_type}
+        if doc_type == 'fatura_cartao':
+            metadados_documento['cabecalho_fatura'] = {'arquivo': file_name, **extrair_cabecalho_fatura(current_extracted_text)}
+        self.document_texts.adicionar(file_path, current_extracted_text, **metadados_documento)
+
         if doc_type == 'contracheque':
             current_contracheque_data = processar_contracheque(current_extracted_text)
             self.contracheque_data_consolidated.update(current_contracheque_data)
@@ -143,63 +219,66 @@ class FinancialAnalysisSystem:
             return True # Contracracheque não tem transações para análise de fluxo de caixa
 
         # Extrair transações (aplica parsers específicos ou genéricos)
-        transactions = self._extract_transactions_orchestrator(current_extracted_text, current_extracted_tables, doc_type, file_type, file_name)
+        orcamento_regex = OrcamentoRegex()  # Prazo das varreduras de regex deste documento
+        transactions = self._extract_transactions_orchestrator(current_extracted_text, current_extracted_tables, doc_type, file_type, file_name, orcamento_regex)
+        if orcamento_regex.esgotado:
+            print(f"Aviso: orçamento de regex esgotado em {file_name}; as transações extraídas podem estar incompletas.")
+            self.documentos_orcamento_regex_esgotado.append(file_name)
         
         if transactions.empty:
             print(f"Nenhuma transação financeira significativa encontrada em {file_name}.")
             return False
 
-        # Acumular transações (evitando duplicatas se a mesma transação aparecer em múltiplos documentos ou extrações)
-        initial_transactions_count = len(self.all_transactions_raw_df)
-        self.all_transactions_raw_df = pd.concat([self.all_transactions_raw_df, transactions], ignore_index=True)
-        self.all_transactions_raw_df.drop_duplicates(subset=['date', 'description', 'value'], inplace=True)
+        # Confere a continuidade do saldo informado pelo extrato, quando o parser o fornece
+        if 'balance' in transactions.columns:
+            conciliacao = reconciliar_saldos(transactions, por=None)
+            divergencias = conciliacao[conciliacao['conciliacao'].isin(['lacuna', 'duplicada'])]
+            if not divergencias.empty:
+                print(f"Aviso: {len(divergencias)} linha(s) de {file_name} não conferem com o saldo informado pelo extrato.")
+                self.divergencias_saldo = pd.concat([self.divergencias_saldo, divergencias.assign(arquivo=file_name)], ignore_index=True)
+
+        # Acumular transações (evitando duplicatas se a mesma transação aparecer em múltiplos documentos ou extrações).
+        # O banco detectado pelo nome do arquivo completa as linhas sem banco, para que PDF e CSV do mesmo banco se encontrem
+        banco_documento = detect_bank_from_filename(file_name)
+        transactions['bank'] = transactions['bank'].fillna(banco_documento) if 'bank' in transactions.columns else banco_documento
+        novas_transacoes = transactions[self.deduplicador.registrar(transactions)]
+        self.all_transactions_raw_df = pd.concat([self.all_transactions_raw_df, novas_transacoes], ignore_index=True)
         
-        print(f"Transações extraídas de {file_name}: {len(self.all_transactions_raw_df) - initial_transactions_count} novas transações adicionadas.")
+        print(f"Transações extraídas de {file_name}: {len(novas_transacoes)} novas transações adicionadas.")
+
+        # Só as linhas que não eram duplicatas atualizam os agregados
+        self.analise_incremental.adicionar(categorizar_em_buckets(novas_transacoes.copy()))
+        self.indice_saldo.anexar_transacoes(novas_transacoes)
+
+        if self.transaction_store is not None:
+            # Persiste só as linhas novas deste documento, nas partições dos meses que elas tocam
+            self.transaction_store.anexar(novas_transacoes, documento=file_name, deduplicar=False)
+            self.indice_saldo.salvar(os.path.join(self.transaction_store.diretorio, ARQUIVO_INDICE_SALDO), self.transaction_store.assinatura())
         return True
 
-    def _extract_transactions_orchestrator(self, text_content: str, extracted_tables: list[pd.DataFrame], doc_type: str, file_type: str, file_name: str) -> pd.DataFrame:
+    def _extract_transactions_orchestrator(self, text_content: str, extracted_tables: list[pd.DataFrame], doc_type: str, file_type: str, file_name: str, orcamento_regex: OrcamentoRegex = None) -> pd.DataFrame:
         """
         Orquestra a extração de transações, priorizando parsers específicos e usando fallbacks.
         Esta função substitui a `extract_transactions` do `data_parsing.py`
         e a integra chamando os parsers específicos de `bank_specific_parsers.py` e `dataframe_parsers.py`.
+        Os parsers de texto compartilham `orcamento_regex` (um por documento): se ele vencer,
+        `orcamento_regex.esgotado` fica True e o resultado pode estar truncado.
         """
+        orcamento_regex = orcamento_regex or OrcamentoRegex()
         transactions = []
         
         # 1. Tentar parsers específicos de Banco/Formato (Prioridade Máxima)
-        bank_name = detect_bank_from_filename(file_name)
-        
-        if file_type == 'pdf':
-            if doc_type == 'extrato_bancario' and bank_name == 'Nubank':
-                print("Chamando parser específico: Nubank Extrato PDF")
-                transactions.extend(parse_nubank_extrato_pdf(text_content, doc_type))
-            elif doc_type == 'fatura_cartao' and bank_name == 'C6 Bank':
-                print("Chamando parser específico: C6 Fatura PDF")
-                transactions.extend(parse_c6_fatura_pdf(text_content, doc_type))
-            # Adicionar mais condições para outros bancos/tipos de PDF
-            
-        elif file_type in ['csv', 'xlsx']:
-            if doc_type == 'extrato_bancario' and bank_name == 'Nubank':
-                for df_table in extracted_tables:
-                    transactions.extend(process_nubank_extrato_csv(df_table, doc_type))
-            elif doc_type == 'fatura_cartao' and bank_name == 'Nubank':
-                for df_table in extracted_tables:
-                    transactions.extend(process_nubank_fatura_csv(df_table, doc_type))
-            elif doc_type == 'extrato_bancario' and bank_name == 'Banco Inter':
-                for df_table in extracted_tables:
-                    transactions.extend(process_inter_extrato_csv(df_table, doc_type))
-            elif doc_type == 'fatura_cartao' and bank_name == 'Banco Inter':
-                for df_table in extracted_tables:
-                    transactions.extend(process_inter_fatura_csv(df_table, doc_type))
-            elif doc_type == 'extrato_bancario' and bank_name == 'Caixa Econômica Federal':
-                for df_table in extracted_tables:
-                    transactions.extend(process_caixa_extrato_csv(df_table, doc_type))
-            elif doc_type == 'fatura_cartao' and bank_name == 'PicPay':
-                for df_table in extracted_tables:
-                    transactions.extend(process_picpay_fatura_csv(df_table, doc_type))
-            else: # CSV/XLSX genérico
-                print("Chamando parser genérico de DataFrame para CSV/XLSX.")
-                for df_table in extracted_tables:
-                    transactions.extend(process_dataframe_generic(df_table, doc_type))
+        if file_type in ['csv', 'xlsx']:
+            # Cada tabela vai ao parser do formato do seu cabeçalho, sem depender do nome do arquivo
+            for df_table in extracted_tables:
+                transactions.extend(self._extract_transactions_from_table(df_table, doc_type, file_name))
+        else:
+            # Texto: do parser mais provável para o menos provável (nome do arquivo e começo do texto)
+            for parser in REGISTRO_PARSERS.selecionar(doc_type, 'texto', nome_arquivo=file_name, texto=text_content):
+                print(f"Chamando parser específico: {parser.nome}")
+                transactions.extend(parser.funcao(text_content, doc_type, orcamento_regex))
+                if transactions:
+                    break
 
         # 2. Fallback para extração de texto bruto via regex se nada foi encontrado ou se for complementar
         # (Este é o `extract_transactions` original do `data_parsing.py` com a lógica de regex)
@@ -211,6 +290,22 @@ class FinancialAnalysisSystem:
 
         return pd.DataFrame(transactions)
 
+    def _extract_transactions_from_table(self, df_table: pd.DataFrame, doc_type: str, file_name: str) -> list[dict]:
+        """
+        Roteia uma tabela (CSV/XLSX): parser do formato reconhecido pelo cabeçalho; sem formato
+        conhecido, os parsers do banco do nome do arquivo; por fim o parser genérico, com o
+        mapeamento de colunas guardado por formato de cabeçalho.
+        """
+        parser, df_roteada = REGISTRO_PARSERS.rotear_tabela(df_table, doc_type)
+        candidatos = [parser] if parser else REGISTRO_PARSERS.selecionar(doc_type, 'tabela', nome_arquivo=file_name)
+        for candidato in candidatos:
+            print(f"Chamando parser específico: {candidato.nome}")
+            transacoes = candidato.funcao(df_roteada, doc_type)
+            if transacoes:
+                return transacoes
+        print("Chamando parser genérico de DataFrame para CSV/XLSX.")
+        return process_dataframe_generic(df_table, doc_type, REGISTRO_PARSERS.mapeamento_colunas(df_table))
+
     def _extract_transactions_from_text_fallback(self, text_content: str, doc_type: str) -> list[dict]:
         """
         Função de fallback para extrair transações de texto bruto via regex.
@@ -290,44 +385,71 @@ class FinancialAnalysisSystem:
 
         print("\n--- Realizando Análise Financeira Completa ---")
 
-        # 1. Categorizar todas as transações consolidadas
-        self.inputs_extrato_consolidated_df, self.outputs_extrato_consolidated_df, \
-        self.card_transactions_consolidated_df, self.card_credits_consolidated_df = \
-            categorize_transactions_detailed(self.all_transactions_raw_df)
+        # 1. Categorizar todas as transações consolidadas (no próprio DataFrame, com a coluna 'bucket')
+        transacoes = categorizar_em_buckets(self.all_transactions_raw_df)
 
-        print(f"Total de Transações Categorizadas: {len(self.all_transactions_raw_df)}")
+        print(f"Total de Transações Categorizadas: {len(transacoes)}")
 
         # 2. Gerar resumos e métricas
-        self.extrato_summary_consolidated = generate_extrato_summary(
-            self.inputs_extrato_consolidated_df, self.outputs_extrato_consolidated_df
-        )
-        # Para a fatura, precisamos do texto consolidado ou do texto da última fatura processada
-        self.fatura_summary_consolidated = generate_fatura_summary(
-            self.card_transactions_consolidated_df, self.card_credits_consolidated_df, self.all_extracted_text
-        )
-        self.general_financial_summary_consolidated = generate_general_financial_summary(
-            self.inputs_extrato_consolidated_df, self.outputs_extrato_consolidated_df,
-            self.card_transactions_consolidated_df, self.card_credits_consolidated_df
+        # Os resumos só leem valor, categoria e descrição: as visões carregam apenas essas colunas
+        colunas_resumo = ['value', 'specific_category', 'description']
+        entradas_extrato = selecionar_bucket(transacoes, BUCKET_ENTRADA_EXTRATO, colunas=colunas_resumo)
+        saidas_extrato = selecionar_bucket(transacoes, BUCKET_SAIDA_EXTRATO, colunas=colunas_resumo)
+        debitos_cartao = selecionar_bucket(transacoes, BUCKET_DEBITO_CARTAO, colunas=colunas_resumo)
+        creditos_cartao = selecionar_bucket(transacoes, BUCKET_CREDITO_CARTAO, colunas=colunas_resumo)
+
+        self.extrato_summary_consolidated = resumir_extrato(entradas_extrato, saidas_extrato)
+        # Para a fatura, usamos os cabeçalhos extraídos de cada documento (sem reler o texto consolidado)
+        cabecalho_fatura = consolidar_cabecalhos_fatura(self.fatura_headers)
+        self.fatura_summary_consolidated = resumir_fatura(debitos_cartao, creditos_cartao, cabecalho_fatura)
+        self.general_financial_summary_consolidated = resumir_financeiro_geral(
+            entradas_extrato, saidas_extrato, debitos_cartao, creditos_cartao
         )
+        del entradas_extrato, saidas_extrato, debitos_cartao, creditos_cartao
         
         # 3. Análise de Risco
-        self.risk_indicators_consolidated = analyze_risk(self.all_transactions_raw_df, self.all_extracted_text)
+        self.risk_indicators_consolidated = analyze_risk(self.all_transactions_raw_df, cabecalho_fatura=cabecalho_fatura, indice_saldo=self.indice_saldo)
 
         # 4. Detecção de Apostas e Movimentações Suspeitas
         self.gambling_transactions_consolidated = detectar_apostas_aprimorado(self.all_transactions_raw_df)
-        self.suspicious_transactions_consolidated = detectar_movimentacoes_suspeitas(self.all_transactions_raw_df)
+        self.suspicious_transactions_consolidated = detectar_movimentacoes_suspeitas(self.all_transactions_raw_df, REGRAS_AML_PADRAO)
 
         # 5. Cálculo do Score Financeiro Geral (do extrato principalmente)
-        # Concatenar extrato de entrada e saída para cálculo de score
-        df_for_score = pd.concat([self.inputs_extrato_consolidated_df, self.outputs_extrato_consolidated_df], ignore_index=True)
-        self.financial_score = calculate_score(df_for_score)
+        # Entradas e saídas do extrato selecionadas juntas, só com a coluna de valor
+        self.financial_score = calculate_score(
+            selecionar_bucket(transacoes, BUCKET_ENTRADA_EXTRATO, BUCKET_SAIDA_EXTRATO, colunas=['value'])
+        )
 
         print("\n--- Análise Financeira Completa Gerada ---")
         return True
 
-    def get_analysis_results(self):
+    def perform_incremental_analysis(self):
+        """
+        Atualiza resumos e score a partir dos agregados acumulados, sem reprocessar o histórico.
+        Indicadores de risco, regras AML de janela e a lista de apostas continuam sendo
+        calculados por perform_full_analysis.
+        """
+        analise = self.analise_incremental
+        if analise.total_transacoes == 0:
+            print("Nenhum dado de transação disponível para análise incremental.")
+            return False
+
+        entradas_extrato = analise.visao(BUCKET_ENTRADA_EXTRATO)
+        saidas_extrato = analise.visao(BUCKET_SAIDA_EXTRATO)
+        debitos_cartao = analise.visao(BUCKET_DEBITO_CARTAO)
+        creditos_cartao = analise.visao(BUCKET_CREDITO_CARTAO)
+
+        self.extrato_summary_consolidated = resumir_extrato(entradas_extrato, saidas_extrato)
+        self.fatura_summary_consolidated = resumir_fatura(debitos_cartao, creditos_cartao, consolidar_cabecalhos_fatura(self.fatura_headers))
+        self.general_financial_summary_consolidated = resumir_financeiro_geral(entradas_extrato, saidas_extrato, debitos_cartao, creditos_cartao)
+        self.financial_score = analise.score()
+        return True
+
+    def get_analysis_results(self, formatar: bool = True):
         """
         Retorna os resultados consolidados da análise.
+        :param formatar: Se True, os resumos são convertidos para texto pt-BR; se False, são
+                         retornados como tabelas numéricas (para cache, combinação ou serialização).
         """
         return {
             "cadastral_data": self.cadastral_data_consolidated,
@@ -336,12 +458,14 @@ class FinancialAnalysisSystem:
             "outputs_extrato": self.outputs_extrato_consolidated_df,
             "card_transactions": self.card_transactions_consolidated_df,
             "card_credits": self.card_credits_consolidated_df,
-            "extrato_summary": self.extrato_summary_consolidated,
-            "fatura_summary": self.fatura_summary_consolidated,
-            "general_financial_summary": self.general_financial_summary_consolidated,
+            "extrato_summary": formatar_resumo_extrato(self.extrato_summary_consolidated) if formatar else self.extrato_summary_consolidated,
+            "fatura_summary": formatar_tabela_metricas(self.fatura_summary_consolidated) if formatar else self.fatura_summary_consolidated,
+            "general_financial_summary": formatar_tabela_metricas(self.general_financial_summary_consolidated) if formatar else self.general_financial_summary_consolidated,
             "risk_indicators": self.risk_indicators_consolidated,
             "gambling_transactions": self.gambling_transactions_consolidated,
             "suspicious_transactions": self.suspicious_transactions_consolidated,
+            "balance_divergences": self.divergencias_saldo,
+            "regex_budget_exceeded": self.documentos_orcamento_regex_esgotado,
             "financial_score": self.financial_score
         }
 
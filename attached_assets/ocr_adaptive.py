@@ -0,0 +1,170 @@
+# ocr_adaptive.py
+
+"""
+OCR adaptativo de páginas de PDF digitalizadas: resolução baixa primeiro, alta só onde precisa.
+
+Cada página é lida a DPI_INICIAL (um quarto dos pixels de 300 DPI). As linhas com confiança
+abaixo de LIMIAR_CONFIANCA são recortadas da página e relidas a DPI_ALTO, e a releitura só
+substitui a linha se a confiança subir. Páginas em que nada foi lido, ou em que a maior parte
+das linhas é duvidosa, são relidas inteiras a DPI_ALTO. As releituras de um lote de páginas
+vão juntas ao motor (um processo tesseract por lote no backend de linha de comando).
+
+Antes do OCR cada imagem é pré-processada: a inclinação é estimada pelo perfil de projeção
+das linhas de texto e corrigida (deskew), e a imagem é binarizada pelo limiar de Otsu. O
+resultado fica num cache pelo hash do conteúdo renderizado: páginas repetidas (o mesmo
+extrato enviado de novo, páginas idênticas dentro do documento) não são processadas de novo.
+"""
+
+import hashlib
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+from ocr_engine import MOTOR_OCR, ImagemBruta, renderizar_pagina
+
+DPI_INICIAL = 150
+DPI_ALTO = 300
+LIMIAR_CONFIANCA = 70  # Confiança média da linha (0-100) abaixo da qual ela é relida a DPI_ALTO
+FRACAO_MAXIMA_REGIOES = 0.5  # Acima disso de linhas duvidosas, relê a página inteira
+MARGEM_REGIAO_PONTOS = 3
+ANGULO_MAXIMO_GRAUS = 3.0
+PASSO_ANGULO_GRAUS = 0.25
+TAMANHO_CACHE_PREPROCESSAMENTO = 64
+
+
+def limiar_otsu(pixels: np.ndarray) -> int:
+    """Limiar de Otsu: o tom que melhor separa tinta e fundo no histograma da imagem."""
+    histograma = np.bincount(pixels.ravel(), minlength=256).astype(np.float64)
+    tons = np.arange(256)
+    peso_fundo = np.cumsum(histograma)
+    peso_tinta = peso_fundo[-1] - peso_fundo
+    soma = np.cumsum(histograma * tons)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media_fundo = soma / peso_fundo
+        media_tinta = (soma[-1] - soma) / peso_tinta
+        variancia_entre = peso_fundo * peso_tinta * (media_fundo - media_tinta) ** 2
+    return int(np.argmax(np.nan_to_num(variancia_entre)))  # Imagem de um tom só: nan em todo tom, limiar 0
+
+
+def binarizar(pixels: np.ndarray) -> np.ndarray:
+    """Imagem só com preto (0) e branco (255), pelo limiar de Otsu."""
+    return np.where(pixels > limiar_otsu(pixels), 255, 0).astype(np.uint8)
+
+
+def estimar_inclinacao(binaria: np.ndarray) -> float:
+    """
+    Ângulo (graus, anti-horário) que deixa as linhas de texto horizontais: o que concentra a
+    tinta no menor número de linhas de pixels (maior soma dos quadrados do perfil de projeção).
+    """
+    passo = max(1, binaria.shape[1] // 800)  # Amostra de ~800 px de largura basta para o ângulo
+    ys, xs = np.nonzero(binaria[::passo, ::passo] == 0)
+    if len(ys) < 100:
+        return 0.0
+    melhor_angulo, melhor_pontuacao = 0.0, -1.0
+    for angulo in np.arange(-ANGULO_MAXIMO_GRAUS, ANGULO_MAXIMO_GRAUS + PASSO_ANGULO_GRAUS / 2, PASSO_ANGULO_GRAUS):
+        linhas = np.round(ys - xs * math.tan(math.radians(angulo))).astype(np.int64)
+        pontuacao = float(np.sum(np.bincount(linhas - linhas.min()).astype(np.float64) ** 2))
+        if pontuacao > melhor_pontuacao:
+            melhor_angulo, melhor_pontuacao = float(angulo), pontuacao
+    return melhor_angulo
+
+
+def caixa_antes_da_rotacao(caixa: tuple, angulo: float, largura: int, altura: int) -> tuple:
+    """Caixa (x0, y0, x1, y1) da imagem corrigida levada de volta à imagem original (rotação em torno do centro)."""
+    cx, cy = largura / 2, altura / 2
+    cos, sen = math.cos(math.radians(angulo)), math.sin(math.radians(angulo))
+    cantos = [(x - cx, y - cy) for x in (caixa[0], caixa[2]) for y in (caixa[1], caixa[3])]
+    xs = [cx + dx * cos - dy * sen for dx, dy in cantos]
+    ys = [cy + dx * sen + dy * cos for dx, dy in cantos]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def preprocessar(imagem: ImagemBruta, angulo: float = None) -> tuple[ImagemBruta, float]:
+    """Corrige a inclinação (estimada se `angulo` for None) e binariza. Devolve a imagem e o ângulo usado."""
+    pixels = np.frombuffer(imagem.dados, dtype=np.uint8).reshape(imagem.altura, imagem.bytes_por_linha)[:, :imagem.largura]
+    if angulo is None:
+        angulo = estimar_inclinacao(binarizar(pixels))
+    if abs(angulo) >= PASSO_ANGULO_GRAUS / 2:
+        from PIL import Image
+        pixels = np.asarray(imagem.como_pil().rotate(angulo, resample=Image.BILINEAR, fillcolor=255))
+    binaria = binarizar(pixels)
+    return ImagemBruta(binaria, imagem.largura, imagem.altura, imagem.largura, origem=binaria), angulo
+
+
+class CachePreprocessamento:
+    """Imagens pré-processadas pelo hash do conteúdo renderizado (LRU com até `tamanho` entradas)."""
+
+    def __init__(self, tamanho: int = TAMANHO_CACHE_PREPROCESSAMENTO):
+        self.tamanho = tamanho
+        self._itens = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+
+    def preprocessar(self, imagem: ImagemBruta, angulo: float = None) -> tuple[ImagemBruta, float]:
+        chave = (hashlib.blake2b(imagem.dados, digest_size=16).digest(), imagem.largura, imagem.altura, angulo)
+        if chave in self._itens:
+            self.acertos += 1
+            self._itens.move_to_end(chave)
+            return self._itens[chave]
+        self.falhas += 1
+        resultado = self._itens[chave] = preprocessar(imagem, angulo)
+        if len(self._itens) > self.tamanho:
+            self._itens.popitem(last=False)
+        return resultado
+
+
+CACHE_PREPROCESSAMENTO = CachePreprocessamento()
+
+
+def _texto(linhas: list[dict]) -> str:
+    return '\n'.join(linha['texto'] for linha in linhas)
+
+
+def _confianca(linhas: list[dict]) -> float:
+    return sum(linha['confianca'] for linha in linhas) / len(linhas) if linhas else 0.0
+
+
+def ocr_paginas_adaptativo(paginas, motor=MOTOR_OCR, cache: CachePreprocessamento = CACHE_PREPROCESSAMENTO):
+    """
+    Texto de cada página do PyMuPDF (gerador, na ordem), com releitura a DPI_ALTO só das linhas
+    ou páginas de baixa confiança. As páginas são processadas em lotes de `motor.paginas_por_lote`.
+    """
+    lote = []
+    for pagina in paginas:
+        lote.append(pagina)
+        if len(lote) == motor.paginas_por_lote:
+            yield from _ocr_lote_adaptativo(lote, motor, cache)
+            lote = []
+    if lote:
+        yield from _ocr_lote_adaptativo(lote, motor, cache)
+
+
+def _ocr_lote_adaptativo(paginas: list, motor, cache: CachePreprocessamento) -> list[str]:
+    preprocessadas = [cache.preprocessar(renderizar_pagina(pagina, DPI_INICIAL)) for pagina in paginas]
+    linhas_paginas = list(motor.reconhecer_linhas(imagem for imagem, _ in preprocessadas))
+
+    # Releituras a DPI_ALTO: (página, índice da linha ou None para a página inteira, imagem)
+    releituras = []
+    escala = 72 / DPI_INICIAL
+    for numero, (pagina, (imagem, angulo), linhas) in enumerate(zip(paginas, preprocessadas, linhas_paginas)):
+        duvidosas = [indice for indice, linha in enumerate(linhas) if linha['confianca'] < LIMIAR_CONFIANCA]
+        if not linhas or len(duvidosas) > FRACAO_MAXIMA_REGIOES * len(linhas):
+            releituras.append((numero, None, cache.preprocessar(renderizar_pagina(pagina, DPI_ALTO), angulo)[0]))
+            continue
+        for indice in duvidosas:
+            x0, y0, x1, y1 = caixa_antes_da_rotacao(linhas[indice]['caixa'], angulo, imagem.largura, imagem.altura)
+            regiao = (
+                x0 * escala - MARGEM_REGIAO_PONTOS, y0 * escala - MARGEM_REGIAO_PONTOS,
+                x1 * escala + MARGEM_REGIAO_PONTOS, y1 * escala + MARGEM_REGIAO_PONTOS,
+            )
+            releituras.append((numero, indice, cache.preprocessar(renderizar_pagina(pagina, DPI_ALTO, clip=regiao), angulo)[0]))
+
+    for (numero, indice, _), relidas in zip(releituras, motor.reconhecer_linhas(imagem for _, _, imagem in releituras)):
+        linhas = linhas_paginas[numero]
+        if indice is None:
+            if _confianca(relidas) >= _confianca(linhas):
+                linhas_paginas[numero] = relidas
+        elif relidas and _confianca(relidas) > linhas[indice]['confianca']:
+            linhas[indice] = {**linhas[indice], 'texto': ' '.join(linha['texto'] for linha in relidas), 'confianca': _confianca(relidas)}
+    return [_texto(linhas) for linhas in linhas_paginas]
@@ -0,0 +1,184 @@
+# ocr_engine.py
+
+"""
+Motor de OCR residente: o Tesseract e os modelos de idioma ('por+eng') são carregados uma vez
+e reaproveitados em todas as páginas, com as imagens passadas direto da memória.
+
+`pytesseract.image_to_string` grava cada imagem num PNG temporário e abre um novo processo
+`tesseract`, que relê os traineddata a cada página. Aqui há dois backends:
+
+- tesserocr (se instalado): a API do Tesseract fica aberta no processo e recebe cada imagem
+  PIL sem passar pelo disco. É o backend preferido.
+- linha de comando: as páginas de um lote viram um único TIFF multipágina em memória, enviado
+  pela entrada padrão a uma só execução do `tesseract`, que devolve o texto das páginas
+  separado por form feed. Um processo (e uma carga dos modelos) por lote, não por página.
+
+Páginas de PDF são renderizadas direto em tons de cinza (1 byte por pixel, um terço do RGB)
+e entregues ao motor como `ImagemBruta`: uma vista sobre o buffer do pixmap do PyMuPDF, sem
+cópia para uma imagem PIL nem passagem por PNG.
+"""
+
+import io
+import subprocess
+import threading
+
+IDIOMAS_PADRAO = 'por+eng'
+# Páginas por execução do tesseract no backend de linha de comando (limita a memória do TIFF)
+PAGINAS_POR_LOTE = 16
+DPI_PADRAO = 300
+
+
+def tesserocr_disponivel() -> bool:
+    try:
+        import tesserocr  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ImagemBruta:
+    """Imagem em tons de cinza (8 bits) sobre um buffer existente, sem cópia dos pixels."""
+
+    def __init__(self, dados, largura: int, altura: int, bytes_por_linha: int, origem=None):
+        self.dados = dados
+        self.largura = largura
+        self.altura = altura
+        self.bytes_por_linha = bytes_por_linha
+        self._origem = origem  # Dono do buffer (ex.: o pixmap), mantido vivo enquanto a imagem existir
+
+    @classmethod
+    def de_pixmap(cls, pix) -> 'ImagemBruta':
+        """Vista sobre as amostras de um pixmap do PyMuPDF em tons de cinza e sem alfa."""
+        dados = pix.samples_mv if hasattr(pix, 'samples_mv') else pix.samples  # samples_mv: PyMuPDF >= 1.19.4, sem cópia
+        return cls(dados, pix.width, pix.height, pix.stride, origem=pix)
+
+    def como_pil(self):
+        """Imagem PIL modo 'L' que compartilha o mesmo buffer (Image.frombuffer, sem cópia)."""
+        from PIL import Image
+        return Image.frombuffer('L', (self.largura, self.altura), self.dados, 'raw', 'L', self.bytes_por_linha, 1)
+
+
+def renderizar_pagina(page, dpi: int = DPI_PADRAO, clip=None) -> ImagemBruta:
+    """
+    Renderiza uma página do PyMuPDF já em tons de cinza, pronta para o OCR. `clip` restringe
+    a um retângulo (em pontos, nas coordenadas da página como ela é exibida).
+    """
+    import fitz # PyMuPDF
+    if clip is not None:
+        clip = fitz.Rect(clip) * page.derotation_matrix  # get_pixmap recorta nas coordenadas sem rotação
+    pix = page.get_pixmap(matrix=fitz.Matrix(dpi / 72, dpi / 72), colorspace=fitz.csGRAY, alpha=False, clip=clip)
+    return ImagemBruta.de_pixmap(pix)
+
+
+def linhas_de_tsv(tsv: str, total_paginas: int) -> list[list[dict]]:
+    """
+    Linhas de texto de cada página a partir da saída TSV do tesseract (uma linha por palavra).
+    Cada linha: {'texto', 'confianca' (média das palavras, 0-100), 'caixa' (x0, y0, x1, y1) em pixels}.
+    """
+    paginas = [{} for _ in range(total_paginas)]
+    for registro in tsv.splitlines()[1:]:
+        campos = registro.split('\t', 11)
+        if len(campos) < 12 or campos[0] != '5' or not campos[11].strip() or float(campos[10]) < 0:
+            continue
+        pagina, bloco, paragrafo, linha = (int(campo) for campo in campos[1:5])
+        x, y, largura, altura = (int(campo) for campo in campos[6:10])
+        palavras = paginas[pagina - 1].setdefault((bloco, paragrafo, linha), [])
+        palavras.append((campos[11].strip(), float(campos[10]), (x, y, x + largura, y + altura)))
+    return [[
+        {
+            'texto': ' '.join(texto for texto, _, _ in palavras),
+            'confianca': sum(confianca for _, confianca, _ in palavras) / len(palavras),
+            'caixa': (
+                min(caixa[0] for _, _, caixa in palavras), min(caixa[1] for _, _, caixa in palavras),
+                max(caixa[2] for _, _, caixa in palavras), max(caixa[3] for _, _, caixa in palavras),
+            ),
+        }
+        for palavras in linhas.values()
+    ] for linhas in paginas]
+
+
+class MotorOCR:
+    """OCR de uma sequência de imagens (PIL ou ImagemBruta), com o engine carregado uma única vez."""
+
+    def __init__(self, idiomas: str = IDIOMAS_PADRAO, paginas_por_lote: int = PAGINAS_POR_LOTE, backend: str = None):
+        self.idiomas = idiomas
+        self.paginas_por_lote = paginas_por_lote
+        self.backend = backend or ('tesserocr' if tesserocr_disponivel() else 'tesseract')
+        self._api = None
+        self._trava = threading.Lock()  # A API do tesserocr não pode ser usada por duas threads ao mesmo tempo
+
+    def reconhecer(self, imagens):
+        """
+        Texto de cada imagem, na mesma ordem. É um gerador: as imagens podem ser produzidas
+        sob demanda (ex.: páginas renderizadas uma a uma) e só um lote fica em memória.
+        """
+        if self.backend == 'tesserocr':
+            return (self._reconhecer_tesserocr(imagem) for imagem in imagens)
+        return self._em_lotes(imagens, self._reconhecer_lote_cli)
+
+    def reconhecer_linhas(self, imagens):
+        """Como `reconhecer`, mas com as linhas de cada imagem e a confiança e a caixa de cada uma (ver `linhas_de_tsv`)."""
+        if self.backend == 'tesserocr':
+            return (self._linhas_tesserocr(imagem) for imagem in imagens)
+        return self._em_lotes(imagens, lambda lote: linhas_de_tsv(self._executar_cli(lote, 'tsv'), len(lote)))
+
+    def _em_lotes(self, imagens, processar_lote):
+        lote = []
+        for imagem in imagens:
+            lote.append(imagem)
+            if len(lote) == self.paginas_por_lote:
+                yield from processar_lote(lote)
+                lote = []
+        if lote:
+            yield from processar_lote(lote)
+
+    def _definir_imagem(self, imagem) -> None:
+        import tesserocr
+        if self._api is None:
+            self._api = tesserocr.PyTessBaseAPI(lang=self.idiomas)
+        if isinstance(imagem, ImagemBruta):
+            # SetImageBytes exige bytes: uma cópia em cinza, sem conversão de formato
+            dados = imagem.dados if isinstance(imagem.dados, bytes) else bytes(imagem.dados)
+            self._api.SetImageBytes(dados, imagem.largura, imagem.altura, 1, imagem.bytes_por_linha)
+        else:
+            self._api.SetImage(imagem)
+
+    def _reconhecer_tesserocr(self, imagem) -> str:
+        with self._trava:
+            self._definir_imagem(imagem)
+            return self._api.GetUTF8Text()
+
+    def _linhas_tesserocr(self, imagem) -> list[dict]:
+        import tesserocr
+        nivel = tesserocr.RIL.TEXTLINE
+        with self._trava:
+            self._definir_imagem(imagem)
+            self._api.Recognize()
+            linhas = []
+            for linha in tesserocr.iterate_level(self._api.GetIterator(), nivel):
+                texto = (linha.GetUTF8Text(nivel) or '').strip()
+                if texto:
+                    linhas.append({'texto': texto, 'confianca': linha.Confidence(nivel), 'caixa': linha.BoundingBox(nivel)})
+            return linhas
+
+    def _executar_cli(self, lote: list, *configuracoes: str) -> str:
+        import pytesseract
+        lote = [imagem.como_pil() if isinstance(imagem, ImagemBruta) else imagem for imagem in lote]
+        tiff = io.BytesIO()  # TIFF sem compressão: os pixels são copiados como estão
+        lote[0].save(tiff, format='TIFF', save_all=True, append_images=lote[1:])
+        try:
+            saida = subprocess.run(
+                [pytesseract.pytesseract.tesseract_cmd, 'stdin', 'stdout', '-l', self.idiomas, *configuracoes],
+                input=tiff.getvalue(), capture_output=True, check=True,
+            ).stdout
+        except FileNotFoundError:
+            raise pytesseract.TesseractNotFoundError()
+        return saida.decode('utf-8', errors='replace')
+
+    def _reconhecer_lote_cli(self, lote: list) -> list[str]:
+        # Cada página termina num form feed; páginas sem texto ainda ocupam sua posição
+        paginas = self._executar_cli(lote).split('\f')[:len(lote)]
+        return paginas + [''] * (len(lote) - len(paginas))
+
+
+MOTOR_OCR = MotorOCR()
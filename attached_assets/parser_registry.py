@@ -0,0 +1,444 @@
+# parser_registry.py
+
+"""
+Registro dos parsers específicos de banco, consultado no lugar das cadeias de if/elif.
+
+Cada banco declara como é reconhecido (trechos do nome do arquivo e do texto) e cada parser
+declara o banco, os tipos de documento e os tipos de entrada que aceita ('texto' para
+PDF/OCR, 'tabela' para CSV/XLSX) e onde a função está (módulo e nome). Funções de texto
+recebem (texto, doc_type, orcamento): o OrcamentoRegex do documento, compartilhado entre os
+parsers tentados, que diz ao chamador se a extração foi interrompida. A escolha do parser
+é uma única consulta: os parsers compatíveis com o documento são ordenados pela pontuação
+de `sniff()`, que só olha o nome do arquivo e o começo do texto.
+
+Tabelas (CSV/XLSX) são roteadas pelo cabeçalho, sem depender do nome do arquivo: a
+assinatura da tabela é o conjunto normalizado dos nomes das colunas, e um dicionário leva
+cada assinatura declarada pelos parsers ao parser do formato (O(1) por tabela). Para
+assinaturas desconhecidas, o mapeamento automático de colunas do parser genérico é
+calculado uma vez e guardado: tabelas repetidas do mesmo formato não refazem a inferência.
+
+Os identificadores dos bancos ficam só aqui: a detecção do banco pelo texto do parser
+unificado (`BrazilianBanksParser.detect_bank`) também consulta o registro.
+
+Os módulos dos parsers só são importados quando um parser deles é usado pela primeira vez:
+bancos que não aparecem nos documentos não custam nada na inicialização.
+"""
+
+import importlib
+import re
+import unicodedata
+
+# Quanto do texto o sniff() examina: os identificadores do banco ficam no cabeçalho
+TAMANHO_AMOSTRA_SNIFF = 20_000
+
+# O que extrair das páginas de um PDF: só o texto, só as tabelas (todas as páginas), ou o
+# texto e as tabelas das páginas cuja geometria sugere uma grade
+MODOS_EXTRACAO_PDF = ('texto', 'tabelas', 'auto')
+
+# No notebook as células são salvas com o nome curto; no repositório, com o sufixo da exportação
+_MODULOS_CELULAS = {
+    'bank_specific_parsers': 'bank_specific_parsers_1750515734450_1750930357073',
+    'dataframe_parsers': 'dataframe_parsers_1750515734454_1750930357013',
+}
+
+# Na ordem de prioridade da detecção pelo nome do arquivo ('c6' antes de 'inter', etc.).
+# Identificadores de texto são comparados como palavras inteiras, sem acentos nem caixa
+# ('ITAÚ' também casa 'Itau'); vale o que aparece primeiro no documento (ver pontos_texto)
+# 'codigos': como os parsers gravam o banco na coluna 'bank' das transações (ex.: 'inter')
+BANCOS_PADRAO = [
+    {'banco': 'C6 Bank', 'identificadores_arquivo': ['c6'], 'identificadores_texto': ['C6 BANK', 'BANCO C6'], 'codigos': ['c6']},
+    {'banco': 'Nubank', 'identificadores_arquivo': ['nubank', 'nu_pagamentos'], 'identificadores_texto': ['NUBANK', 'NU PAGAMENTOS', 'NUCONTA'], 'codigos': ['nubank', 'nu pagamentos']},
+    {'banco': 'Caixa Econômica Federal', 'identificadores_arquivo': ['caixa'], 'identificadores_texto': ['CAIXA ECONÔMICA', 'SAC CAIXA', 'ALÔ CAIXA', 'CEF'], 'codigos': ['caixa', 'cef']},
+    {'banco': 'Banco Inter', 'identificadores_arquivo': ['inter'], 'identificadores_texto': ['BANCO INTER'], 'codigos': ['inter']},
+    {'banco': 'PicPay', 'identificadores_arquivo': ['picpay'], 'identificadores_texto': ['PICPAY', 'PIC PAY'], 'codigos': ['picpay']},
+    {'banco': 'Bradesco', 'identificadores_arquivo': ['bradesco'], 'identificadores_texto': ['BRADESCO'], 'codigos': ['bradesco']},
+    {'banco': 'Itaú', 'identificadores_arquivo': ['itau'], 'identificadores_texto': ['ITAÚ', 'UNIBANCO'], 'codigos': ['itau']},
+    {'banco': 'Santander', 'identificadores_arquivo': ['santander'], 'identificadores_texto': ['SANTANDER'], 'codigos': ['santander']},
+    {'banco': 'Banco do Brasil', 'identificadores_arquivo': ['banco_do_brasil', 'bancodobrasil'], 'identificadores_texto': ['BANCO DO BRASIL'], 'codigos': ['bb']},
+    {'banco': 'InfinitePay', 'identificadores_arquivo': ['infinitepay'], 'identificadores_texto': ['INFINITEPAY', 'INFINITE PAY'], 'codigos': ['infinitepay']},
+    {'banco': 'Stone', 'identificadores_arquivo': ['stone'], 'identificadores_texto': ['STONE'], 'codigos': ['stone']},
+    # Reconhecidos pelo texto, sem parser próprio (extratos vão ao parser genérico)
+    {'banco': 'Banco Original', 'identificadores_arquivo': ['banco_original'], 'identificadores_texto': ['BANCO ORIGINAL'], 'codigos': ['original']},
+    {'banco': 'Banco Next', 'identificadores_arquivo': ['banco_next'], 'identificadores_texto': ['BANCO NEXT'], 'codigos': ['next']},
+    {'banco': 'PagBank', 'identificadores_arquivo': ['pagbank', 'pagseguro'], 'identificadores_texto': ['PAGBANK', 'PAG BANK', 'PAGSEGURO'], 'codigos': ['pagbank']},
+    {'banco': 'Mercado Pago', 'identificadores_arquivo': ['mercadopago', 'mercado_pago'], 'identificadores_texto': ['MERCADO PAGO', 'MERCADOPAGO'], 'codigos': ['mercadopago']},
+    {'banco': 'Will Bank', 'identificadores_arquivo': ['willbank', 'will_bank'], 'identificadores_texto': ['WILL BANK', 'BANCO WILL'], 'codigos': ['will_bank']},
+    {'banco': 'BTG Pactual', 'identificadores_arquivo': ['btg'], 'identificadores_texto': ['BTG PACTUAL'], 'codigos': ['btg']},
+    {'banco': 'XP Investimentos', 'identificadores_arquivo': [], 'identificadores_texto': ['XP INVESTIMENTOS'], 'codigos': ['xp']},
+]
+
+# Valores de 'bank' que não identificam banco nenhum (comparados já normalizados)
+BANCOS_NAO_IDENTIFICADOS = ('', 'desconhecido', 'unknown', 'nan', 'none')
+
+PARSERS_PADRAO = [
+    {
+        'nome': 'nubank_extrato_pdf',
+        'banco': 'Nubank',
+        'modulo': 'bank_specific_parsers',
+        'funcao': 'parse_nubank_extrato_pdf',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'c6_fatura_pdf',
+        'banco': 'C6 Bank',
+        'modulo': 'bank_specific_parsers',
+        'funcao': 'parse_c6_fatura_pdf',
+        'tipos_documento': ['fatura_cartao'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'caixa_extrato_pdf',
+        'banco': 'Caixa Econômica Federal',
+        'modulo': 'caixa_extrato_parser',
+        'funcao': 'parse_caixa_extrato_pdf',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'itau_extrato_pdf',
+        'banco': 'Itaú',
+        'modulo': 'brazilian_banks_parser',
+        'funcao': 'parse_itau_extrato_pdf',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'bradesco_extrato_pdf',
+        'banco': 'Bradesco',
+        'modulo': 'brazilian_banks_parser',
+        'funcao': 'parse_bradesco_extrato_pdf',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'santander_extrato_pdf',
+        'banco': 'Santander',
+        'modulo': 'brazilian_banks_parser',
+        'funcao': 'parse_santander_extrato_pdf',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'bb_extrato_pdf',
+        'banco': 'Banco do Brasil',
+        'modulo': 'brazilian_banks_parser',
+        'funcao': 'parse_bb_extrato_pdf',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'inter_extrato_pdf',
+        'banco': 'Banco Inter',
+        'modulo': 'brazilian_banks_parser',
+        'funcao': 'parse_inter_extrato_pdf',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'infinitepay_extrato_pdf',
+        'banco': 'InfinitePay',
+        'modulo': 'brazilian_banks_parser',
+        'funcao': 'parse_infinitepay_extrato_pdf',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'stone_extrato_pdf',
+        'banco': 'Stone',
+        'modulo': 'brazilian_banks_parser',
+        'funcao': 'parse_stone_extrato_pdf',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'picpay_extrato_pdf',
+        'banco': 'PicPay',
+        'modulo': 'brazilian_banks_parser',
+        'funcao': 'parse_picpay_extrato_pdf',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['texto'],
+        'extracao_pdf': 'texto',
+    },
+    {
+        'nome': 'nubank_extrato_csv',
+        'banco': 'Nubank',
+        'modulo': 'dataframe_parsers',
+        'funcao': 'process_nubank_extrato_csv',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['tabela'],
+        'assinaturas': [['Data', 'Valor', 'Identificador', 'Descrição'], ['Data', 'Descrição', 'Valor']],
+    },
+    {
+        'nome': 'nubank_fatura_csv',
+        'banco': 'Nubank',
+        'modulo': 'dataframe_parsers',
+        'funcao': 'process_nubank_fatura_csv',
+        'tipos_documento': ['fatura_cartao'],
+        'entradas': ['tabela'],
+        'assinaturas': [['Data da transação', 'Estabelecimento', 'Valor']],
+    },
+    {
+        'nome': 'inter_extrato_csv',
+        'banco': 'Banco Inter',
+        'modulo': 'dataframe_parsers',
+        'funcao': 'process_inter_extrato_csv',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['tabela'],
+        'assinaturas': [['Data', 'Histórico', 'Valor']],
+    },
+    {
+        'nome': 'inter_fatura_csv',
+        'banco': 'Banco Inter',
+        'modulo': 'dataframe_parsers',
+        'funcao': 'process_inter_fatura_csv',
+        'tipos_documento': ['fatura_cartao'],
+        'entradas': ['tabela'],
+        'assinaturas': [['Data', 'Descrição', 'Valor']],  # Igual à do extrato Nubank: o tipo do documento desempata
+    },
+    {
+        'nome': 'caixa_extrato_csv',
+        'banco': 'Caixa Econômica Federal',
+        'modulo': 'dataframe_parsers',
+        'funcao': 'process_caixa_extrato_csv',
+        'tipos_documento': ['extrato_bancario'],
+        'entradas': ['tabela'],
+        'assinaturas': [['Data Mov.', 'Nr. Doc.', 'Histórico', 'Valor', 'Saldo'], ['Data Mov.', 'Histórico', 'Débito', 'Crédito', 'Saldo']],
+    },
+    {
+        'nome': 'picpay_fatura_csv',
+        'banco': 'PicPay',
+        'modulo': 'dataframe_parsers',
+        'funcao': 'process_picpay_fatura_csv',
+        'tipos_documento': ['fatura_cartao'],
+        'entradas': ['tabela'],
+        'assinaturas': [['Data', 'Descrição', 'Valor', 'Tipo']],
+    },
+]
+
+_MODULOS_CARREGADOS = {}
+
+
+def carregar_funcao(modulo: str, funcao: str):
+    """Importa `modulo` na primeira chamada (nome curto ou, para células, o do repositório) e devolve `funcao`."""
+    if modulo not in _MODULOS_CARREGADOS:
+        try:
+            _MODULOS_CARREGADOS[modulo] = importlib.import_module(modulo)
+        except ModuleNotFoundError as erro:
+            if erro.name != modulo or modulo not in _MODULOS_CELULAS:
+                raise
+            _MODULOS_CARREGADOS[modulo] = importlib.import_module(_MODULOS_CELULAS[modulo])
+    return getattr(_MODULOS_CARREGADOS[modulo], funcao)
+
+
+def normalizar_coluna(nome) -> str:
+    """Nome de coluna comparável: minúsculo, sem acentos, sem pontos e com '_' virando espaço."""
+    sem_acentos = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sem_acentos.lower().replace('.', '').replace('_', ' ').split())
+
+
+def normalizar_texto(texto: str) -> str:
+    """Texto comparável com os identificadores dos bancos: maiúsculo e sem acentos."""
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii').upper()
+
+
+def padrao_identificadores(identificadores) -> re.Pattern | None:
+    """Um padrão com os identificadores de texto de um banco, como palavras inteiras (None se não há)."""
+    if not identificadores:
+        return None
+    return re.compile(r'\b(?:' + '|'.join(re.escape(normalizar_texto(i)) for i in identificadores) + r')\b')
+
+
+def pontos_texto(padrao: re.Pattern | None, amostra: str) -> float:
+    """
+    Pontuação (0 a 1) dos identificadores de um banco numa amostra já normalizada, pela posição
+    do primeiro que aparece: o banco do documento está no cabeçalho, e os bancos de contrapartes
+    (ex.: 'TED BRADESCO' num extrato do Itaú) só aparecem depois, nas transações. 0 se nenhum aparece.
+    """
+    casamento = padrao.search(amostra) if padrao is not None else None
+    return 1.0 - casamento.start() / (len(amostra) + 1) if casamento else 0.0
+
+
+def assinatura_colunas(colunas) -> frozenset:
+    """Assinatura do cabeçalho de uma tabela: conjunto dos nomes de coluna normalizados."""
+    return frozenset(normalizar_coluna(c) for c in colunas)
+
+
+class ParserBancario:
+    """Um parser registrado: o que ele aceita, como reconhecê-lo e a função (carregada só no uso)."""
+
+    def __init__(self, nome: str, banco: dict, modulo: str, funcao: str, tipos_documento: list[str], entradas: list[str], assinaturas: list[list[str]] = (), extracao_pdf: str = None):
+        self.nome = nome
+        self.banco = banco['banco']
+        self.modulo = modulo
+        self.nome_funcao = funcao
+        self.tipos_documento = tuple(tipos_documento)
+        self.entradas = tuple(entradas)
+        # Assinatura -> {nome normalizado: nome exato que a função do parser lê}
+        self.colunas_declaradas = {assinatura_colunas(colunas): {normalizar_coluna(c): c for c in colunas} for colunas in assinaturas}
+        self.assinaturas = tuple(self.colunas_declaradas)
+        self.extracao_pdf = extracao_pdf  # O que o parser usa de um PDF (um de MODOS_EXTRACAO_PDF); None se não lê PDF
+        self._identificadores_arquivo = tuple(banco['identificadores_arquivo'])
+        self._padrao_texto = padrao_identificadores(banco['identificadores_texto'])
+
+    def __repr__(self) -> str:
+        return f"ParserBancario({self.nome!r})"
+
+    @property
+    def funcao(self):
+        return carregar_funcao(self.modulo, self.nome_funcao)
+
+    def aceita(self, doc_type: str, entrada: str) -> bool:
+        return doc_type in self.tipos_documento and entrada in self.entradas
+
+    def sniff(self, nome_arquivo: str = '', amostra: str = '') -> float:
+        """
+        Pontuação barata de reconhecimento (0 = não reconhece): 1 se o nome do arquivo é do
+        banco, mais `pontos_texto` dos identificadores do banco na amostra (já normalizada por
+        `normalizar_texto`): quanto mais cedo o banco aparece no documento, maior.
+        """
+        pontos = 1.0 if any(i in nome_arquivo.lower() for i in self._identificadores_arquivo) else 0.0
+        if amostra:
+            pontos += pontos_texto(self._padrao_texto, amostra)
+        return pontos
+
+
+class RegistroParsers:
+    """Bancos e parsers conhecidos, com a detecção do banco e a escolha ordenada do parser."""
+
+    def __init__(self, bancos: list[dict] = None, parsers: list[dict] = None):
+        self._bancos = {}
+        self._nomes_bancos = {}  # Nome, variação ou código normalizado -> nome do banco
+        self._padroes_texto = {}  # Nome do banco -> padrão dos seus identificadores de texto
+        self._parsers = []
+        self._por_assinatura = {}  # Assinatura do cabeçalho -> parsers que a declaram
+        self._mapeamentos = {}  # Assinatura -> mapeamento aprendido {coluna padrão: nome normalizado}
+        for banco in (bancos if bancos is not None else BANCOS_PADRAO):
+            self.registrar_banco(banco)
+        for parser in (parsers if parsers is not None else PARSERS_PADRAO):
+            self.registrar(parser)
+
+    def registrar_banco(self, banco: dict) -> None:
+        self._bancos[banco['banco']] = banco
+        self._padroes_texto[banco['banco']] = padrao_identificadores(banco['identificadores_texto'])
+        for apelido in (banco['banco'], *banco.get('codigos', ())):
+            self._nomes_bancos[normalizar_coluna(apelido)] = banco['banco']
+
+    def banco_por_texto(self, texto: str) -> str | None:
+        """
+        Banco cujo identificador de texto aparece primeiro no começo do documento (ver
+        `pontos_texto`; empates na ordem de registro); None se nenhum aparece.
+        """
+        amostra = normalizar_texto(texto[:TAMANHO_AMOSTRA_SNIFF])
+        pontuados = [(pontos_texto(padrao, amostra), banco) for banco, padrao in self._padroes_texto.items()]
+        pontos, banco = max(pontuados, key=lambda par: par[0], default=(0, None))
+        return banco if pontos > 0 else None
+
+    def codigo_banco(self, banco: str) -> str:
+        """Código com que os parsers gravam o banco (o primeiro de 'codigos'), ex.: 'Banco do Brasil' -> 'bb'."""
+        return self._bancos[banco].get('codigos', [normalizar_coluna(banco)])[0]
+
+    def nome_banco(self, valor) -> str:
+        """
+        Nome registrado do banco para um valor de 'bank' vindo de qualquer parser ('inter',
+        'BANCO INTER', 'Itau' -> o nome de BANCOS_PADRAO). Valores que não identificam banco
+        ('Desconhecido', 'unknown', vazio) viram ''; bancos não registrados ficam como estão.
+        """
+        if valor is None or valor != valor:  # None ou NaN
+            return ''
+        normalizado = normalizar_coluna(valor)
+        if normalizado in BANCOS_NAO_IDENTIFICADOS:
+            return ''
+        return self._nomes_bancos.get(normalizado, str(valor).strip())
+
+    def registrar(self, parser: dict) -> ParserBancario:
+        """Registra um parser (dicionário como os de PARSERS_PADRAO); o banco já deve estar registrado."""
+        registrado = ParserBancario(banco=self._bancos[parser['banco']], **{k: v for k, v in parser.items() if k != 'banco'})
+        self._parsers.append(registrado)
+        for assinatura in registrado.assinaturas:
+            self._por_assinatura.setdefault(assinatura, []).append(registrado)
+        return registrado
+
+    @property
+    def parsers(self) -> list[ParserBancario]:
+        return list(self._parsers)
+
+    def banco_por_arquivo(self, nome_arquivo: str) -> str:
+        """Primeiro banco (na ordem de registro) cujo identificador aparece no nome do arquivo."""
+        nome_arquivo = nome_arquivo.lower()
+        for banco in self._bancos.values():
+            if any(i in nome_arquivo for i in banco['identificadores_arquivo']):
+                return banco['banco']
+        return 'Desconhecido'
+
+    def selecionar(self, doc_type: str, entrada: str, nome_arquivo: str = '', texto: str = '') -> list[ParserBancario]:
+        """
+        Parsers que aceitam o documento e o reconhecem (sniff > 0), do mais para o menos
+        provável; empates ficam na ordem de registro.
+        """
+        amostra = normalizar_texto(texto[:TAMANHO_AMOSTRA_SNIFF])
+        pontuados = [(parser.sniff(nome_arquivo, amostra), parser) for parser in self._parsers if parser.aceita(doc_type, entrada)]
+        return [parser for pontos, parser in sorted(pontuados, key=lambda par: -par[0]) if pontos > 0]
+
+    def modo_extracao_pdf(self, nome_arquivo: str = '', texto: str = '', doc_type: str = None) -> str:
+        """
+        O que extrair de um PDF (ver MODOS_EXTRACAO_PDF), segundo o parser de PDF que melhor
+        reconhece o documento, entre os que aceitam `doc_type` (todos, se o tipo não é conhecido:
+        None ou 'desconhecido'). Sem parser reconhecido, 'auto'.
+        """
+        amostra = normalizar_texto(texto[:TAMANHO_AMOSTRA_SNIFF])
+        pontuados = [
+            (parser.sniff(nome_arquivo, amostra), parser) for parser in self._parsers
+            if parser.extracao_pdf and doc_type in (None, 'desconhecido', *parser.tipos_documento)
+        ]
+        pontos, parser = max(pontuados, key=lambda par: par[0], default=(0, None))
+        return parser.extracao_pdf if pontos > 0 else 'auto'
+
+    def parser_por_cabecalho(self, colunas, doc_type: str) -> ParserBancario | None:
+        """
+        Parser cujo formato tem exatamente estas colunas (uma consulta pela assinatura). Entre
+        formatos com o mesmo cabeçalho, vale o que aceita o tipo do documento; se o tipo não
+        ajudar (ex.: 'desconhecido'), só um cabeçalho exclusivo de um parser decide.
+        """
+        candidatos = self._por_assinatura.get(assinatura_colunas(colunas), [])
+        for parser in candidatos:
+            if doc_type in parser.tipos_documento:
+                return parser
+        return candidatos[0] if len(candidatos) == 1 else None
+
+    def rotear_tabela(self, df, doc_type: str) -> tuple:
+        """
+        Parser do formato do cabeçalho (ver `parser_por_cabecalho`) e a tabela com as colunas
+        renomeadas para os nomes exatos que ele lê (ex.: 'DATA MOV' -> 'Data Mov.'). Sem
+        formato reconhecido, (None, df).
+        """
+        parser = self.parser_por_cabecalho(df.columns, doc_type)
+        if parser is None:
+            return None, df
+        declaradas = parser.colunas_declaradas[assinatura_colunas(df.columns)]
+        return parser, df.rename(columns={c: declaradas[normalizar_coluna(c)] for c in df.columns})
+
+    def mapeamento_colunas(self, df) -> dict:
+        """
+        Mapeamento automático de colunas do parser genérico (`_mapear_colunas_automaticamente`),
+        calculado uma vez por assinatura de cabeçalho e traduzido para as colunas de `df`.
+        """
+        originais = {normalizar_coluna(c): c for c in df.columns}
+        assinatura = frozenset(originais)
+        if assinatura not in self._mapeamentos:
+            inferido = carregar_funcao('dataframe_parsers', '_mapear_colunas_automaticamente')(df)
+            self._mapeamentos[assinatura] = {padrao: normalizar_coluna(coluna) for padrao, coluna in inferido.items()}
+        return {padrao: originais[coluna] for padrao, coluna in self._mapeamentos[assinatura].items()}
+
+
+REGISTRO_PARSERS = RegistroParsers()
@@ -0,0 +1,78 @@
+# pdf_tables.py
+
+"""
+Extração de tabelas de PDF com backend escolhido a cada chamada.
+
+O fallback antigo chamava `tabula.read_pdf`, que abre um processo Java novo por chamada:
+a partida da JVM (alguns segundos) era paga a cada documento. Backends disponíveis:
+
+- 'pymupdf': detecção de tabelas no próprio processo (`page.find_tables()`, PyMuPDF >= 1.23),
+  pela geometria de linhas e textos da página que já é carregada para o OCR. Sem Java.
+- 'tabula_jvm': tabula-py (>= 2.9) com jpype (`force_subprocess=False`): uma única JVM fica carregada
+  no processo e é reaproveitada por todos os documentos.
+- 'tabula': tabula-py (>= 2.9) em subprocesso, como antes (uma JVM por chamada). É o padrão
+  até que benchmark_tabelas_pdf.py mostre, em extratos reais, que os outros extraem as mesmas tabelas.
+- 'auto': o primeiro disponível, nessa ordem.
+
+Todos devolvem DataFrames sem cabeçalho (colunas 0..n), como o fallback com
+`pandas_options={'header': None}`.
+"""
+
+import importlib.util
+
+import pandas as pd
+
+BACKENDS_TABELAS = ('pymupdf', 'tabula_jvm', 'tabula')
+BACKEND_TABELAS_PADRAO = 'tabula'
+
+
+def backend_disponivel(backend: str) -> bool:
+    """
+    Se as dependências do backend estão instaladas. Os backends do tabula só procuram os pacotes,
+    sem importá-los; o 'pymupdf' importa o fitz para conferir se a versão tem `find_tables`.
+    """
+    if backend == 'pymupdf':
+        if importlib.util.find_spec('fitz') is None:
+            return False
+        import fitz # PyMuPDF
+        return hasattr(fitz.Page, 'find_tables')
+    if backend == 'tabula_jvm':
+        return importlib.util.find_spec('tabula') is not None and importlib.util.find_spec('jpype') is not None
+    if backend == 'tabula':
+        return importlib.util.find_spec('tabula') is not None
+    raise ValueError(f"Backend de tabelas desconhecido: {backend}")
+
+
+def resolver_backend(backend: str = BACKEND_TABELAS_PADRAO) -> str:
+    """Nome do backend a usar: o pedido, ou o primeiro disponível para 'auto'."""
+    if backend != 'auto':
+        return backend
+    for candidato in BACKENDS_TABELAS:
+        if backend_disponivel(candidato):
+            return candidato
+    raise ImportError("Nenhum backend de extração de tabelas instalado (PyMuPDF >= 1.23 ou tabula-py).")
+
+
+def extrair_tabelas_pdf(file_path: str, backend: str = BACKEND_TABELAS_PADRAO) -> list[pd.DataFrame]:
+    """Tabelas não vazias de todas as páginas do PDF, na ordem, pelo backend escolhido."""
+    backend = resolver_backend(backend)
+    if backend == 'pymupdf':
+        tabelas = _tabelas_pymupdf(file_path)
+    else:
+        import tabula
+        tabelas = tabula.read_pdf(
+            file_path, pages='all', multiple_tables=True, pandas_options={'header': None},
+            force_subprocess=(backend == 'tabula'),
+        )
+    return [df for df in tabelas if not df.empty]
+
+
+def _tabelas_pymupdf(file_path: str) -> list[pd.DataFrame]:
+    import fitz # PyMuPDF
+    tabelas = []
+    with fitz.open(file_path) as pdf_document:
+        for page in pdf_document:
+            for tabela in page.find_tables().tables:
+                linhas = [linha for linha in tabela.extract() if any(celula not in (None, '') for celula in linha)]
+                tabelas.append(pd.DataFrame(linhas))
+    return tabelas
@@ -5,164 +5,223 @@ import numpy as np
 from datetime import datetime
 
 # Importa as funções auxiliares de parsing para formatação (ex: parse_financial_value)
-# from data_parsing import parse_financial_value
+# from data_parsing import parse_financial_value, extrair_cabecalho_fatura
 
+# Os resumos são gerados em duas etapas:
+# 1. resumir_* produz tabelas numéricas tipadas (float64/datetime64), que podem ser
+#    guardadas em cache, somadas entre períodos e serializadas sem perda;
+# 2. formatar_* converte essas tabelas para texto pt-BR de forma vetorizada, apenas na exibição.
+# generate_*_summary combina as duas etapas e mantém a saída formatada de antes.
 
-def generate_extrato_summary(inputs_df: pd.DataFrame, outputs_df: pd.DataFrame) -> pd.DataFrame:
+# Colunas das tabelas de métricas (resumo da fatura e resumo geral)
+COLUNAS_METRICAS = ['Métrica', 'Valor', 'Percentual', 'Data', 'Formato']
+FORMATOS_METRICAS = ['moeda', 'percentual', 'data', 'parcelamento', 'titulo', 'moeda_percentual']
+
+_TROCA_SEPARADORES_PT_BR = str.maketrans(',.', '.,')
+
+
+# --- Etapa de formatação (pt-BR) ---
+
+def formatar_numero_brl(valores: pd.Series) -> pd.Series:
+    """Formata números com separador de milhar '.' e decimal ',' (ex.: 1.234,56). Nulos continuam nulos."""
+    valores = pd.Series(valores, dtype='float64')
+    return valores.map('{:,.2f}'.format, na_action='ignore').astype(object).str.translate(_TROCA_SEPARADORES_PT_BR)
+
+def formatar_moeda_brl(valores: pd.Series, vazio: str = 'Não Identificado') -> pd.Series:
+    """Formata valores como 'R$ 1.234,56'; valores nulos viram `vazio`."""
+    valores = pd.Series(valores, dtype='float64')
+    return ('R$ ' + formatar_numero_brl(valores)).where(valores.notna(), vazio)
+
+def formatar_percentual(valores: pd.Series, vazio: str = '0.00%') -> pd.Series:
+    """Formata percentuais como '12.34%' (mesmo formato dos relatórios existentes)."""
+    valores = pd.Series(valores, dtype='float64')
+    return valores.map('{:.2f}%'.format, na_action='ignore').astype(object).where(valores.notna(), vazio)
+
+def formatar_resumo_extrato(resumo: pd.DataFrame) -> pd.DataFrame:
     """
-    Gera um resumo consolidado das entradas e saídas do extrato por categoria específica,
-    incluindo totais e percentuais.
+    Converte o resumo numérico do extrato (Entrada/Saída por categoria) para exibição,
+    acrescentando os percentuais e a linha 'Total Geral'.
     """
-    summary_data = []
+    if resumo.empty:
+        return pd.DataFrame({"Categoria": [], "Entrada": [], "Saída": [], "Total": [], "% do Total de Entrada": [], "% do Total de Saída": []})
 
-    if not inputs_df.empty:
-        inputs_by_specific_category = inputs_df.groupby('specific_category')['value'].sum().reset_index()
-        inputs_by_specific_category.rename(columns={'value': 'Total'}, inplace=True)
-        inputs_by_specific_category['Tipo'] = 'Entrada'
-        summary_data.append(inputs_by_specific_category)
+    total_entradas = resumo['Entrada'].sum()
+    total_saidas = resumo['Saída'].sum()
 
-    if not outputs_df.empty:
-        outputs_by_specific_category = outputs_df.groupby('specific_category')['value'].sum().reset_index()
-        outputs_by_specific_category.rename(columns={'value': 'Total'}, inplace=True)
-        outputs_by_specific_category['Tipo'] = 'Saída'
-        summary_data.append(outputs_by_specific_category)
+    formatado = pd.DataFrame(index=pd.Index(list(resumo.index) + ['Total Geral'], name='Categoria'))
+    formatado['Entrada'] = formatar_moeda_brl(np.append(resumo['Entrada'].to_numpy(), total_entradas)).to_numpy()
+    formatado['Saída'] = formatar_moeda_brl(np.append(resumo['Saída'].to_numpy(), total_saidas)).to_numpy()
 
-    if not summary_data:
-        return pd.DataFrame({"Categoria": [], "Entrada": [], "Saída": [], "Total": [], "% do Total de Entrada": [], "% do Total de Saída": []})
-    
-    full_summary = pd.concat(summary_data, ignore_index=True)
-    pivot_summary = full_summary.pivot_table(index='specific_category', columns='Tipo', values='Total', aggfunc='sum', fill_value=0)
-    pivot_summary.columns.name = None
-    pivot_summary.index.name = 'Categoria'
-
-    total_inputs_overall = pivot_summary['Entrada'].sum()
-    total_outputs_overall = pivot_summary['Saída'].sum()
-
-    pivot_summary['% do Total de Entrada'] = (pivot_summary['Entrada'] / total_inputs_overall * 100).replace([np.inf, -np.inf], 0).fillna(0).apply(lambda x: f"{x:.2f}%") if total_inputs_overall != 0 else '0.00%'
-    pivot_summary['% do Total de Saída'] = (abs(pivot_summary['Saída']) / abs(total_outputs_overall) * 100).replace([np.inf, -np.inf], 0).fillna(0).apply(lambda x: f"{x:.2f}%") if total_outputs_overall != 0 else '0.00%'
-
-    pivot_summary.loc['Total Geral'] = [
-        total_inputs_overall,
-        total_outputs_overall,
-        '100.00%',
-        '100.00%'
-    ]
-    # Formatar os totais gerais da linha 'Total Geral'
-    pivot_summary.loc['Total Geral', 'Entrada'] = f"R$ {total_inputs_overall:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')
-    pivot_summary.loc['Total Geral', 'Saída'] = f"R$ {total_outputs_overall:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')
+    for coluna, valores, total in (('% do Total de Entrada', resumo['Entrada'], total_entradas),
+                                   ('% do Total de Saída', resumo['Saída'].abs(), abs(total_saidas))):
+        if total != 0:
+            percentuais = formatar_percentual((valores / total * 100).replace([np.inf, -np.inf], 0).fillna(0)).to_numpy()
+        else:
+            percentuais = np.full(len(resumo), '0.00%', dtype=object)
+        formatado[coluna] = np.append(percentuais, '100.00%')
 
-    # Formatar os valores monetários nas colunas 'Entrada' e 'Saída'
-    for col in ['Entrada', 'Saída']:
-        if col in pivot_summary.columns:
-            # Não formatar a linha 'Total Geral' novamente se já formatada
-            pivot_summary[col] = pivot_summary[col].apply(lambda x: f"R$ {x:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',') if isinstance(x, (float, int)) else x)
-    
-    return pivot_summary
+    return formatado
 
-def generate_fatura_summary(card_transactions_df: pd.DataFrame, card_credits_df: pd.DataFrame, text_content: str) -> pd.DataFrame:
+def formatar_tabela_metricas(tabela: pd.DataFrame) -> pd.DataFrame:
     """
-    Gera um resumo da fatura de cartão de crédito, incluindo valores principais,
-    limites e agrupamento de compras por categoria de gasto.
+    Converte uma tabela de métricas (COLUNAS_METRICAS) para as colunas 'Métrica' e 'Valor' em texto,
+    formatando cada grupo de linhas de acordo com a coluna 'Formato'.
     """
-    summary_list = []
+    if tabela.empty:
+        return pd.DataFrame({"Métrica": [], "Valor": []})
 
-    # Importa a função de parsing de valor
-    # from data_parsing import parse_financial_value, parse_date_string # Certifique-se de que estão acessíveis
-    
-    # Extrair valores principais da fatura do texto completo
-    total_fatura_match = re.search(r'Valor da fatura:\s*R\$?\s*([\d\.,]+)', text_content, re.IGNORECASE)
-    vencimento_fatura_match = re.search(r'Vencimento:\s*(\d{2}/\d{2}/\d{4}|\d{1,2}\s+de\s+\w+)', text_content, re.IGNORECASE)
-    limite_total_match = re.search(r'Limite total:\s*R\$?\s*([\d\.,]+)', text_content, re.IGNORECASE)
-    limite_disponivel_match = re.search(r'Disponível\s*R\$?\s*([\d\.,]+)', text_content, re.IGNORECASE)
-    parcelamento_info_match = re.search(r'(?:Parcelamento em \dx|Entrada \+ \dx de R\$?\s*[\d\.,]+).*?(?:R\$?\s*([\d\.,]+))', text_content, re.IGNORECASE | re.DOTALL) # Tenta pegar o valor do parcelamento
+    formato = tabela['Formato'].astype(str).to_numpy()
+    texto = pd.Series('', index=tabela.index, dtype=object)
 
+    moeda = formato == 'moeda'
+    texto[moeda] = formatar_moeda_brl(tabela.loc[moeda, 'Valor']).to_numpy()
 
-    total_fatura_value = parse_financial_value(total_fatura_match.group(1)) if total_fatura_match else None
-    vencimento_fatura_date = parse_date_string(vencimento_fatura_match.group(1)) if vencimento_fatura_match else "Não Identificado"
-    
-    # Se a data de vencimento for datetime, formatar
-    vencimento_fatura_display = vencimento_fatura_date.strftime('%d/%m/%Y') if isinstance(vencimento_fatura_date, datetime) else "Não Identificado"
+    percentual = formato == 'percentual'
+    texto[percentual] = formatar_percentual(tabela.loc[percentual, 'Valor'], vazio='N/A (Sem Entradas)').to_numpy()
 
-    limite_total_value = parse_financial_value(limite_total_match.group(1)) if limite_total_match else None
-    limite_disponivel_value = parse_financial_value(limite_disponivel_match.group(1)) if limite_disponivel_match else None
-    
-    parcelamento_val = parse_financial_value(parcelamento_info_match.group(1)) if parcelamento_info_match else None
-    parcelamento_info_display = f"Entrada + parcelas (aprox. R$ {parcelamento_val:,.2f})".replace('.', '#').replace(',', '.').replace('#', ',') if parcelamento_val is not None else "Não detectado"
+    data = formato == 'data'
+    datas = pd.to_datetime(tabela.loc[data, 'Data'])
+    texto[data] = datas.dt.strftime('%d/%m/%Y').astype(object).where(datas.notna(), 'Não Identificado').to_numpy()
 
+    parcelamento = formato == 'parcelamento'
+    valores = tabela.loc[parcelamento, 'Valor']
+    texto[parcelamento] = ('Entrada + parcelas (aprox. ' + formatar_moeda_brl(valores) + ')').where(valores.notna(), 'Não detectado').to_numpy()
 
-    summary_list.append({"Métrica": "Valor Total da Fatura (Vencimento)", "Valor": f"R$ {total_fatura_value:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',') if total_fatura_value is not None else "Não Identificado"})
-    summary_list.append({"Métrica": "Data de Vencimento", "Valor": vencimento_fatura_display})
-    summary_list.append({"Métrica": "Limite Total do Cartão", "Valor": f"R$ {limite_total_value:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',') if limite_total_value is not None else "Não Identificado"})
-    summary_list.append({"Métrica": "Limite Disponível do Cartão", "Valor": f"R$ {limite_disponivel_value:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',') if limite_disponivel_value is not None else "Não Identificado"})
-    summary_list.append({"Métrica": "Informações de Parcelamento/Rotativo", "Valor": parcelamento_info_display})
+    moeda_percentual = formato == 'moeda_percentual'
+    texto[moeda_percentual] = (
+        formatar_moeda_brl(tabela.loc[moeda_percentual, 'Valor']) + ' ('
+        + formatar_numero_brl(tabela.loc[moeda_percentual, 'Percentual'].fillna(0)) + '%)'
+    ).to_numpy()
 
+    return pd.DataFrame({'Métrica': tabela['Métrica'].to_numpy(), 'Valor': texto.to_numpy()})
 
-    total_card_purchases = card_transactions_df['value'].sum() if not card_transactions_df.empty else 0
-    total_card_credits_sum = card_credits_df['value'].sum() if not card_credits_df.empty else 0
-    
-    summary_list.append({"Métrica": "Total de Compras/Débitos (Fatura)", "Valor": f"R$ {total_card_purchases:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')})
-    summary_list.append({"Métrica": "Total de Créditos/Pagamentos (Fatura)", "Valor": f"R$ {total_card_credits_sum:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')})
 
-    if not card_transactions_df.empty:
-        purchases_by_category = card_transactions_df.groupby('specific_category')['value'].sum().reset_index()
-        total_purchases_abs = abs(purchases_by_category['value'].sum())
-
-        summary_list.append({"Métrica": "#### Gastos por Categoria (Cartão)", "Valor": ""})
-        for _, row in purchases_by_category.iterrows():
-            percent = (abs(row['value']) / total_purchases_abs * 100) if total_purchases_abs != 0 else 0
-            summary_list.append({
-                "Métrica": f"- {row['specific_category']}",
-                "Valor": f"R$ {row['value']:,.2f} ({percent:.2f}%)".replace('.', '#').replace(',', '.').replace('#', ',')
-            })
-            
-    return pd.DataFrame(summary_list)
+# --- Etapa numérica ---
 
-def generate_general_financial_summary(inputs_extrato_df: pd.DataFrame, outputs_extrato_df: pd.DataFrame, card_transactions_df: pd.DataFrame, card_credits_df: pd.DataFrame) -> pd.DataFrame:
+def _tabela_metricas(linhas: list[dict]) -> pd.DataFrame:
+    """Monta uma tabela de métricas com tipos fixos a partir de dicionários parciais."""
+    tabela = pd.DataFrame(linhas, columns=COLUNAS_METRICAS)
+    return tabela.astype({
+        'Métrica': object,
+        'Valor': 'float64',
+        'Percentual': 'float64',
+        'Data': 'datetime64[ns]',
+        'Formato': pd.CategoricalDtype(FORMATOS_METRICAS),
+    })
+
+def resumir_extrato(inputs_df: pd.DataFrame, outputs_df: pd.DataFrame) -> pd.DataFrame:
     """
-    Gera um resumo financeiro geral consolidando dados do extrato e do cartão,
-    com comparativos e percentuais.
+    Soma as entradas e saídas do extrato por categoria específica.
+    Retorna uma tabela float64 indexada por 'Categoria' com as colunas 'Entrada' e 'Saída';
+    resumos de períodos diferentes podem ser combinados com `a.add(b, fill_value=0)`.
     """
-    total_extrato_inputs = inputs_extrato_df['value'].sum() if not inputs_extrato_df.empty else 0
-    total_extrato_outputs = outputs_extrato_df['value'].sum() if not outputs_extrato_df.empty else 0
-    
-    total_card_expenditures = card_transactions_df['value'].sum() if not card_transactions_df.empty else 0
-    total_card_credits_sum = card_credits_df['value'].sum() if not card_credits_df.empty else 0
+    colunas = {}
+    if not inputs_df.empty:
+        colunas['Entrada'] = inputs_df.groupby('specific_category')['value'].sum()
+    if not outputs_df.empty:
+        colunas['Saída'] = outputs_df.groupby('specific_category')['value'].sum()
 
-    net_extrato_balance = total_extrato_inputs + total_extrato_outputs
+    if not colunas:
+        return pd.DataFrame({'Entrada': pd.Series(dtype='float64'), 'Saída': pd.Series(dtype='float64')}).rename_axis('Categoria')
 
-    total_overall_outputs = total_extrato_outputs + total_card_expenditures
+    resumo = pd.DataFrame(colunas).reindex(columns=['Entrada', 'Saída']).fillna(0.0).astype('float64')
+    resumo.index.name = 'Categoria'
+    return resumo.sort_index()
 
-    summary_list = [
-        {"Métrica": "Total de Entradas (Extrato)", "Valor": f"R$ {total_extrato_inputs:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')},
-        {"Métrica": "Total de Saídas (Extrato)", "Valor": f"R$ {total_extrato_outputs:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')},
-        {"Métrica": "Saldo Líquido da Conta (Extrato)", "Valor": f"R$ {net_extrato_balance:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')},
-        {"Métrica": "Total de Compras/Débitos (Fatura Cartão)", "Valor": f"R$ {total_card_expenditures:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')},
-        {"Métrica": "Total de Créditos/Pagamentos (Fatura Cartão)", "Valor": f"R$ {total_card_credits_sum:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')},
-        {"Métrica": "Total Consolidado de Saídas (Extrato + Cartão)", "Valor": f"R$ {total_overall_outputs:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')},
-        {"Métrica": "Saldo Geral Consolidado (Entradas Extrato - Saídas Consolidadas)", "Valor": f"R$ {(total_extrato_inputs + total_overall_outputs):,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')}
+def resumir_fatura(card_transactions_df: pd.DataFrame, card_credits_df: pd.DataFrame, cabecalho_fatura: dict | str) -> pd.DataFrame:
+    """
+    Resumo numérico da fatura de cartão de crédito: valores principais, limites e
+    compras agrupadas por categoria de gasto (ver COLUNAS_METRICAS).
+    `cabecalho_fatura` é o resultado de extrair_cabecalho_fatura/consolidar_cabecalhos_fatura,
+    guardado por documento; um texto ainda é aceito e passa pela mesma extração.
+    """
+    if isinstance(cabecalho_fatura, str):
+        cabecalho_fatura = extrair_cabecalho_fatura(cabecalho_fatura)
+    vencimento_fatura_date = cabecalho_fatura.get('vencimento')
+
+    linhas = [
+        {"Métrica": "Valor Total da Fatura (Vencimento)", "Valor": cabecalho_fatura.get('total_fatura'), "Formato": 'moeda'},
+        {"Métrica": "Data de Vencimento", "Data": vencimento_fatura_date if isinstance(vencimento_fatura_date, datetime) else None, "Formato": 'data'},
+        {"Métrica": "Limite Total do Cartão", "Valor": cabecalho_fatura.get('limite_total'), "Formato": 'moeda'},
+        {"Métrica": "Limite Disponível do Cartão", "Valor": cabecalho_fatura.get('limite_disponivel'), "Formato": 'moeda'},
+        {"Métrica": "Informações de Parcelamento/Rotativo", "Valor": cabecalho_fatura.get('parcelamento'), "Formato": 'parcelamento'},
+        {"Métrica": "Total de Compras/Débitos (Fatura)", "Valor": card_transactions_df['value'].sum() if not card_transactions_df.empty else 0.0, "Formato": 'moeda'},
+        {"Métrica": "Total de Créditos/Pagamentos (Fatura)", "Valor": card_credits_df['value'].sum() if not card_credits_df.empty else 0.0, "Formato": 'moeda'},
     ]
+    tabela = _tabela_metricas(linhas)
 
-    df_summary = pd.DataFrame(summary_list)
+    if not card_transactions_df.empty:
+        purchases_by_category = card_transactions_df.groupby('specific_category')['value'].sum()
+        total_purchases_abs = abs(purchases_by_category.sum())
+        percentuais = purchases_by_category.abs() / total_purchases_abs * 100 if total_purchases_abs != 0 else purchases_by_category * 0.0
+
+        categorias = _tabela_metricas([{"Métrica": "#### Gastos por Categoria (Cartão)", "Formato": 'titulo'}])
+        por_categoria = _tabela_metricas({
+            "Métrica": "- " + purchases_by_category.index.astype(str),
+            "Valor": purchases_by_category.to_numpy(),
+            "Percentual": percentuais.to_numpy(),
+            "Formato": 'moeda_percentual',
+        })
+        tabela = pd.concat([tabela, categorias, por_categoria], ignore_index=True)
+
+    return tabela
+
+def resumir_financeiro_geral(inputs_extrato_df: pd.DataFrame, outputs_extrato_df: pd.DataFrame, card_transactions_df: pd.DataFrame, card_credits_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Resumo financeiro geral numérico, consolidando extrato e cartão com comparativos e
+    percentuais (ver COLUNAS_METRICAS). Percentuais sem entradas no extrato ficam nulos.
+    """
+    total_extrato_inputs = inputs_extrato_df['value'].sum() if not inputs_extrato_df.empty else 0.0
+    total_extrato_outputs = outputs_extrato_df['value'].sum() if not outputs_extrato_df.empty else 0.0
 
-    if total_extrato_inputs > 0:
-        outputs_vs_inputs_percent = (abs(total_extrato_outputs) / total_extrato_inputs * 100)
-        df_summary.loc[len(df_summary)] = {"Métrica": "Saídas (Extrato) em % das Entradas (Extrato)", "Valor": f"{outputs_vs_inputs_percent:.2f}%"}
-        
-        card_exp_vs_inputs_percent = (abs(total_card_expenditures) / total_extrato_inputs * 100)
-        df_summary.loc[len(df_summary)] = {"Métrica": "Compras de Cartão em % das Entradas (Extrato)", "Valor": f"{card_exp_vs_inputs_percent:.2f}%"}
+    total_card_expenditures = card_transactions_df['value'].sum() if not card_transactions_df.empty else 0.0
+    total_card_credits_sum = card_credits_df['value'].sum() if not card_credits_df.empty else 0.0
 
-        overall_outputs_vs_inputs_percent = (abs(total_overall_outputs) / total_extrato_inputs * 100)
-        df_summary.loc[len(df_summary)] = {"Métrica": "Saídas Consolidadas em % das Entradas (Extrato)", "Valor": f"{overall_outputs_vs_inputs_percent:.2f}%"}
-    else:
-        df_summary.loc[len(df_summary)] = {"Métrica": "Saídas (Extrato) em % das Entradas (Extrato)", "Valor": "N/A (Sem Entradas)"}
-        df_summary.loc[len(df_summary)] = {"Métrica": "Compras de Cartão em % das Entradas (Extrato)", "Valor": "N/A (Sem Entradas)"}
-        df_summary.loc[len(df_summary)] = {"Métrica": "Saídas Consolidadas em % das Entradas (Extrato)", "Valor": "N/A (Sem Entradas)"}
+    net_extrato_balance = total_extrato_inputs + total_extrato_outputs
+    total_overall_outputs = total_extrato_outputs + total_card_expenditures
 
-    total_pix_recebido = inputs_extrato_df[inputs_extrato_df['specific_category'] == 'PIX Recebido']['value'].sum() if not inputs_extrato_df.empty else 0
-    total_pix_enviado = outputs_extrato_df[outputs_extrato_df['specific_category'] == 'PIX Enviado']['value'].sum() if not outputs_extrato_df.empty else 0
+    def percentual_das_entradas(valor):
+        return abs(valor) / total_extrato_inputs * 100 if total_extrato_inputs > 0 else None
+
+    total_pix_recebido = inputs_extrato_df.loc[inputs_extrato_df['specific_category'] == 'PIX Recebido', 'value'].sum() if not inputs_extrato_df.empty else 0.0
+    total_pix_enviado = outputs_extrato_df.loc[outputs_extrato_df['specific_category'] == 'PIX Enviado', 'value'].sum() if not outputs_extrato_df.empty else 0.0
+
+    return _tabela_metricas([
+        {"Métrica": "Total de Entradas (Extrato)", "Valor": total_extrato_inputs, "Formato": 'moeda'},
+        {"Métrica": "Total de Saídas (Extrato)", "Valor": total_extrato_outputs, "Formato": 'moeda'},
+        {"Métrica": "Saldo Líquido da Conta (Extrato)", "Valor": net_extrato_balance, "Formato": 'moeda'},
+        {"Métrica": "Total de Compras/Débitos (Fatura Cartão)", "Valor": total_card_expenditures, "Formato": 'moeda'},
+        {"Métrica": "Total de Créditos/Pagamentos (Fatura Cartão)", "Valor": total_card_credits_sum, "Formato": 'moeda'},
+        {"Métrica": "Total Consolidado de Saídas (Extrato + Cartão)", "Valor": total_overall_outputs, "Formato": 'moeda'},
+        {"Métrica": "Saldo Geral Consolidado (Entradas Extrato - Saídas Consolidadas)", "Valor": total_extrato_inputs + total_overall_outputs, "Formato": 'moeda'},
+        {"Métrica": "Saídas (Extrato) em % das Entradas (Extrato)", "Valor": percentual_das_entradas(total_extrato_outputs), "Formato": 'percentual'},
+        {"Métrica": "Compras de Cartão em % das Entradas (Extrato)", "Valor": percentual_das_entradas(total_card_expenditures), "Formato": 'percentual'},
+        {"Métrica": "Saídas Consolidadas em % das Entradas (Extrato)", "Valor": percentual_das_entradas(total_overall_outputs), "Formato": 'percentual'},
+        {"Métrica": "Total PIX Recebido", "Valor": total_pix_recebido, "Formato": 'moeda'},
+        {"Métrica": "Total PIX Enviado", "Valor": total_pix_enviado, "Formato": 'moeda'},
+        {"Métrica": "Saldo Líquido de PIX", "Valor": total_pix_recebido + total_pix_enviado, "Formato": 'moeda'},
+    ])
+
+
+# --- Resumos formatados (numérico + formatação) ---
+
+def generate_extrato_summary(inputs_df: pd.DataFrame, outputs_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gera um resumo consolidado das entradas e saídas do extrato por categoria específica,
+    incluindo totais e percentuais.
+    """
+    return formatar_resumo_extrato(resumir_extrato(inputs_df, outputs_df))
 
-    df_summary.loc[len(df_summary)] = {"Métrica": "Total PIX Recebido", "Valor": f"R$ {total_pix_recebido:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')}
-    df_summary.loc[len(df_summary)] = {"Métrica": "Total PIX Enviado", "Valor": f"R$ {total_pix_enviado:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')}
-    df_summary.loc[len(df_summary)] = {"Métrica": "Saldo Líquido de PIX", "Valor": f"R$ {(total_pix_recebido + total_pix_enviado):,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')}
+def generate_fatura_summary(card_transactions_df: pd.DataFrame, card_credits_df: pd.DataFrame, text_content: dict | str) -> pd.DataFrame:
+    """
+    Gera um resumo da fatura de cartão de crédito, incluindo valores principais,
+    limites e agrupamento de compras por categoria de gasto.
+    """
+    return formatar_tabela_metricas(resumir_fatura(card_transactions_df, card_credits_df, text_content))
 
-    return df_summary
\ No newline at end of file
+def generate_general_financial_summary(inputs_extrato_df: pd.DataFrame, outputs_extrato_df: pd.DataFrame, card_transactions_df: pd.DataFrame, card_credits_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gera um resumo financeiro geral consolidando dados do extrato e do cartão,
+    com comparativos e percentuais.
+    """
+    return formatar_tabela_metricas(resumir_financeiro_geral(inputs_extrato_df, outputs_extrato_df, card_transactions_df, card_credits_df))
\ No newline at end of file
@@ -0,0 +1,156 @@
+# transaction_dedup.py
+
+"""
+Deduplicação de transações entre documentos que se sobrepõem (ex.: PDF e CSV do mesmo período).
+
+Cada transação vira uma chave normalizada: dia, valor em centavos e descrição normalizada
+(maiúsculas, sem acentos nem pontuação, com os códigos de histórico da Caixa e suas descrições
+legíveis unificados), dentro da partição (banco, conta) da linha. As chaves são comparadas como
+multiconjunto: se o histórico já tem c ocorrências de uma chave e o documento traz d, só d - c
+são novas. Assim, duas compras idênticas no mesmo dia continuam sendo duas.
+
+O banco é levado ao nome do registro de parsers (`REGISTRO_PARSERS.nome_banco`: o código 'inter'
+do parser de PDF e o 'Banco Inter' do nome do arquivo são o mesmo banco) e a conta aos dígitos.
+Duas partições só são comparadas nos campos que ambas têm: banco ou conta vazios (o documento
+não os identifica) são compatíveis com qualquer valor, iguais só se ambos estiverem preenchidos.
+
+O histórico fica ordenado por (partição, dia). Cada documento só é comparado com a janela de
+dias que ele cobre em cada partição compatível (busca binária na ordem), e as ocorrências são
+contadas por hash. O custo é linear no tamanho do documento mais a janela, e a inserção no
+histórico é a intercalação de duas sequências já ordenadas.
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from caixa_extrato_parser import MAPEAMENTO_HISTORICOS_CAIXA
+from parser_registry import REGISTRO_PARSERS
+
+_NS_POR_DIA = 86_400 * 10**9
+_DESLOCAMENTO_DIA = 2**31  # Dias (com sinal) ocupam os 32 bits baixos da ordem; 0 = sem data
+_CENTAVOS_SEM_VALOR = np.int64(-2**62)
+
+
+def _canonico(texto: str) -> str:
+    sem_acentos = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^A-Z0-9]+', ' ', sem_acentos.upper()).strip()
+
+
+# Código e descrição legível de cada histórico da Caixa viram o mesmo termo (o código)
+_SINONIMOS = {_canonico(termo): _canonico(codigo) for codigo, descricao in MAPEAMENTO_HISTORICOS_CAIXA.items() for termo in (codigo, descricao)}
+_PADRAO_SINONIMOS = re.compile(r'\b(?:' + '|'.join(map(re.escape, sorted(_SINONIMOS, key=len, reverse=True))) + r')\b')
+
+
+def normalizar_descricao(descricao: str) -> str:
+    """Forma canônica da descrição, igual para o texto bruto do banco e o limpo pelos parsers."""
+    return _PADRAO_SINONIMOS.sub(lambda m: _SINONIMOS[m.group(0)], _canonico(str(descricao)))
+
+
+def _normalizar_coluna(transacoes: pd.DataFrame, coluna: str, normalizar) -> tuple[np.ndarray, np.ndarray]:
+    """Códigos por linha e valores normalizados distintos (uma normalização por valor distinto)."""
+    if coluna not in transacoes.columns:
+        return np.zeros(len(transacoes), dtype=np.intp), np.array([''], dtype=object)
+    codigos, unicos = pd.factorize(transacoes[coluna].fillna('').astype(str))
+    # Valores distintos que normalizam igual (ex.: 'Itaú' e 'itau') passam a ter o mesmo código
+    codigos_normalizados, normalizados = pd.factorize(np.array([normalizar(v) for v in unicos], dtype=object))
+    return codigos_normalizados[codigos], normalizados
+
+
+class DeduplicadorTransacoes:
+    """Histórico de chaves de transação, para separar as linhas novas de cada documento."""
+
+    def __init__(self):
+        self._particoes = {}  # (banco, conta) normalizados -> id
+        self._chaves_particoes = []  # id -> (banco, conta)
+        self._ordem = np.empty(0, dtype=np.int64)  # (id da partição << 32) | dia deslocado, crescente
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._ordem)
+
+    def registrar(self, transacoes: pd.DataFrame) -> np.ndarray:
+        """
+        Máscara (na ordem de `transacoes`) das transações que ainda não estão no histórico,
+        respeitando a contagem de ocorrências de cada chave. As novas são acrescentadas.
+        """
+        ordem, hashes = self._chaves(transacoes)
+        particoes = ordem >> 32
+        ocorrencia = pd.Series(hashes).groupby([particoes, hashes], sort=False).cumcount().to_numpy()
+        ja_vistas = np.zeros(len(ordem), dtype=np.int64)
+        for particao in np.unique(particoes):
+            linhas = particoes == particao
+            contagens = self._contagens_na_janela(int(particao), ordem[linhas])
+            ja_vistas[linhas] = pd.Series(hashes[linhas]).map(contagens).fillna(0).to_numpy()
+        novas = ocorrencia >= ja_vistas
+        self._inserir(ordem[novas], hashes[novas])
+        return novas
+
+    def adicionar(self, transacoes: pd.DataFrame) -> None:
+        """Acrescenta todas as transações ao histórico, sem conferir (ex.: histórico já deduplicado)."""
+        self._inserir(*self._chaves(transacoes))
+
+    def _chaves(self, transacoes: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        if transacoes.empty:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.uint64)
+
+        codigos_banco, bancos = _normalizar_coluna(transacoes, 'bank', lambda banco: _canonico(REGISTRO_PARSERS.nome_banco(banco)))
+        codigos_conta, contas = _normalizar_coluna(transacoes, 'account', lambda conta: re.sub(r'\D', '', conta))
+        codigos, pares = pd.factorize(codigos_banco * len(contas) + codigos_conta)
+        ids = np.array([self._id_particao(bancos[par // len(contas)], contas[par % len(contas)]) for par in pares], dtype=np.int64)[codigos]
+
+        datas = pd.to_datetime(transacoes['date'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        dias = np.where(np.isnat(datas), -_DESLOCAMENTO_DIA, datas.astype(np.int64) // _NS_POR_DIA)
+        ordem = (ids << 32) | (dias + _DESLOCAMENTO_DIA)
+
+        valores = pd.to_numeric(transacoes['value'], errors='coerce').to_numpy(dtype=np.float64)
+        centavos = np.where(np.isnan(valores), _CENTAVOS_SEM_VALOR, np.round(np.nan_to_num(valores) * 100).astype(np.int64))
+        codigos_descricao, descricoes = _normalizar_coluna(transacoes, 'description', normalizar_descricao)
+
+        # Hash das descrições distintas propagado às linhas; a chave só combina inteiros. A partição
+        # fica fora do hash: a mesma transação tem o mesmo hash em partições compatíveis
+        hashes = pd.util.hash_pandas_object(pd.DataFrame({
+            'dia': dias,
+            'centavos': centavos,
+            'descricao': pd.util.hash_array(descricoes)[codigos_descricao],
+        }), index=False).to_numpy()
+        return ordem, hashes
+
+    def _id_particao(self, banco: str, conta: str) -> int:
+        if (banco, conta) not in self._particoes:
+            self._particoes[(banco, conta)] = len(self._chaves_particoes)
+            self._chaves_particoes.append((banco, conta))
+        return self._particoes[(banco, conta)]
+
+    def _compativeis(self, particao: int) -> list[int]:
+        """Partições com o mesmo banco e a mesma conta, onde os dois lados os têm."""
+        banco, conta = self._chaves_particoes[particao]
+        return [
+            outra for outra, (outro_banco, outra_conta) in enumerate(self._chaves_particoes)
+            if (not banco or not outro_banco or banco == outro_banco) and (not conta or not outra_conta or conta == outra_conta)
+        ]
+
+    def _contagens_na_janela(self, particao: int, ordem: np.ndarray) -> pd.Series:
+        """
+        Ocorrências de cada hash no histórico das partições compatíveis com `particao`, só nos
+        dias que as linhas do documento (com essa `ordem`) cobrem.
+        """
+        if not len(self._ordem) or not len(ordem):
+            return pd.Series(dtype=np.int64)
+        dias = ordem & 0xFFFFFFFF
+        outras = np.array(self._compativeis(particao), dtype=np.int64) << 32
+        inicios = np.searchsorted(self._ordem, outras | dias.min(), side='left')
+        fins = np.searchsorted(self._ordem, outras | dias.max(), side='right')
+        candidatos = np.concatenate([self._hashes[inicio:fim] for inicio, fim in zip(inicios, fins)])
+        return pd.Series(candidatos).value_counts()
+
+    def _inserir(self, ordem: np.ndarray, hashes: np.ndarray) -> None:
+        if not len(ordem):
+            return
+        # Histórico já ordenado + documento: a ordenação estável só intercala as duas sequências
+        ordem_total = np.concatenate([self._ordem, ordem])
+        posicoes = np.argsort(ordem_total, kind='stable')
+        self._ordem = ordem_total[posicoes]
+        self._hashes = np.concatenate([self._hashes, hashes])[posicoes]
@@ -0,0 +1,72 @@
+# transaction_regex.py
+
+"""
+Padrões de linha de transação com custo linear e orçamento de tempo de regex por documento.
+
+Os padrões "data  descrição  valor", com a descrição num quantificador preguiçoso como
+`[^0-9]+?` seguido de espaços e do valor, não eram ancorados: em textos de OCR com longos
+trechos sem dígitos, cada posição inicial reexaminava o trecho até o fim (custo quadrático
+no tamanho do trecho). Aqui cada padrão
+começa no início de uma linha, nenhum trecho atravessa a quebra de linha e os quantificadores
+são possessivos (Python 3.11+): o que já foi consumido não é reexaminado por retrocesso.
+
+A descrição "até o valor" vira uma sequência de palavras. Antes de cada palavra seguinte,
+uma lookahead negativa confere se o restante da linha (a cauda: valor, tipo, saldo...) já
+casa ali; se casar, a descrição termina. É a mesma descrição mais curta que o quantificador
+preguiçoso escolhia, mas cada palavra é lida um número fixo de vezes.
+
+O orçamento é a proteção restante para documentos gigantes: as varreduras de um documento
+compartilham um prazo, conferido entre um casamento (ou linha) e o próximo. Vencido o prazo,
+as varreduras param e o documento fica com as transações lidas até ali.
+"""
+
+import logging
+import re
+import time
+
+ORCAMENTO_PADRAO_SEGUNDOS = 5.0
+
+# Parêntese que abre grupo de captura (não escapado e sem "?" em seguida)
+_GRUPO_CAPTURA = re.compile(r'(?<!\\)\((?!\?)')
+
+
+def descricao_ate(cauda: str, caractere: str = r'[^0-9\s]') -> str:
+    """
+    Grupo da descrição (palavras de `caractere`, separadas por espaço ou tab) seguido de
+    espaço e da `cauda`. A descrição termina na primeira palavra em que a cauda casa.
+    """
+    palavra = caractere + '++'
+    guarda = _GRUPO_CAPTURA.sub('(?:', cauda)  # Cópia sem capturas, para não renumerar os grupos
+    return rf'({palavra}(?:[ \t]++(?!{guarda}){palavra})*+)[ \t]++{cauda}'
+
+
+def padrao_linha(padrao: str, flags: int = 0) -> re.Pattern:
+    """Compila `padrao` ancorado no início de cada linha (espaços iniciais ignorados)."""
+    return re.compile(r'^[ \t]*+' + padrao, re.MULTILINE | flags)
+
+
+class OrcamentoRegex:
+    """Prazo compartilhado pelas varreduras de regex de um documento (conta a partir do primeiro uso)."""
+
+    def __init__(self, segundos: float = ORCAMENTO_PADRAO_SEGUNDOS):
+        self.segundos = segundos
+        self._prazo = None
+        self.esgotado = False
+
+    def vencido(self) -> bool:
+        """Se o prazo do documento já venceu (avisa uma única vez)."""
+        if self._prazo is None:
+            self._prazo = time.perf_counter() + self.segundos
+        if not self.esgotado and time.perf_counter() > self._prazo:
+            self.esgotado = True
+            logging.warning(f"Orçamento de regex de {self.segundos:.1f}s esgotado: transações restantes do documento ignoradas")
+        return self.esgotado
+
+    def finditer(self, padrao: re.Pattern, texto: str):
+        """Como `padrao.finditer(texto)`, mas para de produzir casamentos quando o prazo vence."""
+        if self.vencido():
+            return
+        for match in padrao.finditer(texto):
+            if self.vencido():
+                return
+            yield match
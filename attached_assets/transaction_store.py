@@ -0,0 +1,140 @@
+# transaction_store.py
+
+"""
+Armazenamento persistente das transações de cada cliente, em arquivos Arrow IPC
+particionados por mês:
+
+    <raiz>/<cliente>/mes=2025-05/parte-000001.arrow
+
+Cada documento novo só acrescenta arquivos de parte aos meses que ele toca (sem reescrever
+o histórico), e a leitura abre as partes por memory-map, sem copiar os dados do disco.
+Requer pyarrow.
+"""
+
+import os
+import re
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+
+# Colunas que identificam uma transação repetida entre documentos (critério exato; o main.py separa as
+# linhas novas com o DeduplicadorTransacoes e grava com deduplicar=False)
+CHAVE_TRANSACAO = ['date', 'description', 'value']
+PARTICAO_SEM_DATA = 'sem_data'
+
+
+class TransactionStore:
+    """Transações de um cliente, persistidas por mês em Arrow IPC."""
+
+    def __init__(self, raiz: str, cliente: str):
+        if pa is None:
+            raise ImportError("pyarrow não está instalado. Instale com 'pip install pyarrow' para usar o TransactionStore.")
+        self.diretorio = os.path.join(raiz, re.sub(r'[^\w.-]', '_', cliente))
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    def meses(self) -> list[str]:
+        """Partições existentes (AAAA-MM, e 'sem_data' para transações sem data válida), em ordem."""
+        return sorted(
+            nome[len('mes='):] for nome in os.listdir(self.diretorio)
+            if nome.startswith('mes=') and os.path.isdir(os.path.join(self.diretorio, nome))
+        )
+
+    def assinatura(self) -> str:
+        """
+        Resumo do que está gravado (cada parte com tamanho e data de modificação), sem ler os
+        dados: muda sempre que uma parte é gravada, compactada ou removida. Serve para conferir
+        se um arquivo derivado do histórico (ex.: o índice de saldo) ainda corresponde a ele.
+        """
+        partes = []
+        for mes in self.meses():
+            for caminho in self._partes(mes):
+                estado = os.stat(caminho)
+                partes.append(f"{mes}/{os.path.basename(caminho)}:{estado.st_size}:{estado.st_mtime_ns}")
+        return ';'.join(partes)
+
+    def _diretorio_mes(self, mes: str) -> str:
+        return os.path.join(self.diretorio, f"mes={mes}")
+
+    def _partes(self, mes: str) -> list[str]:
+        diretorio = self._diretorio_mes(mes)
+        if not os.path.isdir(diretorio):
+            return []
+        return [os.path.join(diretorio, nome) for nome in sorted(os.listdir(diretorio)) if nome.endswith('.arrow')]
+
+    def _ler_mes(self, mes: str, colunas: list[str] | None = None) -> 'pa.Table | None':
+        tabelas = []
+        for caminho in self._partes(mes):
+            # Os buffers da tabela apontam para o arquivo mapeado (o mapa vive enquanto forem usados)
+            tabela = ipc.open_file(pa.memory_map(caminho, 'r')).read_all()
+            tabelas.append(tabela.select([c for c in colunas if c in tabela.column_names]) if colunas else tabela)
+        if not tabelas:
+            return None
+        return pa.concat_tables(tabelas, promote_options='default')
+
+    def carregar(self, meses: list[str] | None = None, colunas: list[str] | None = None) -> pd.DataFrame:
+        """Lê as transações dos meses pedidos (todos, por padrão) num único DataFrame."""
+        tabelas = [t for t in (self._ler_mes(mes, colunas) for mes in (meses if meses is not None else self.meses())) if t is not None]
+        if not tabelas:
+            return pd.DataFrame(columns=colunas or [])
+        return pa.concat_tables(tabelas, promote_options='default').to_pandas()
+
+    def anexar(self, transacoes: pd.DataFrame, documento: str | None = None, deduplicar: bool = True) -> int:
+        """
+        Acrescenta as transações de um documento, ignorando as que já estão no armazenamento
+        (mesma data, descrição e valor). Só as partições dos meses presentes em `transacoes`
+        são consultadas. Com `deduplicar=False`, grava todas (o chamador já separou as novas,
+        ex.: com o DeduplicadorTransacoes). Retorna o número de transações gravadas.
+        """
+        if transacoes.empty:
+            return 0
+
+        novas = transacoes.copy()
+        novas['date'] = pd.to_datetime(novas['date'], errors='coerce')
+        if documento is not None:
+            novas['documento'] = documento
+        if deduplicar:
+            novas.drop_duplicates(subset=CHAVE_TRANSACAO, inplace=True)
+        particoes = novas['date'].dt.strftime('%Y-%m').fillna(PARTICAO_SEM_DATA)
+
+        gravadas = 0
+        for mes, linhas in novas.groupby(particoes, sort=True):
+            existentes = self._ler_mes(mes, CHAVE_TRANSACAO) if deduplicar else None
+            if existentes is not None and existentes.num_rows:
+                chaves_existentes = pd.MultiIndex.from_frame(existentes.to_pandas()[CHAVE_TRANSACAO])
+                linhas = linhas[~pd.MultiIndex.from_frame(linhas[CHAVE_TRANSACAO]).isin(chaves_existentes)]
+            if linhas.empty:
+                continue
+            self._gravar_parte(mes, linhas)
+            gravadas += len(linhas)
+        return gravadas
+
+    def _gravar_parte(self, mes: str, linhas: pd.DataFrame) -> None:
+        diretorio = self._diretorio_mes(mes)
+        os.makedirs(diretorio, exist_ok=True)
+        self._gravar_tabela(mes, pa.Table.from_pandas(linhas, preserve_index=False))
+
+    def _gravar_tabela(self, mes: str, tabela: 'pa.Table') -> None:
+        partes = self._partes(mes)
+        numero = int(os.path.basename(partes[-1])[len('parte-'):-len('.arrow')]) + 1 if partes else 1
+        caminho = os.path.join(self._diretorio_mes(mes), f"parte-{numero:06d}.arrow")
+        # Grava num arquivo temporário e renomeia: leitores nunca veem uma parte incompleta.
+        # Sem compressão, para que a leitura por memory-map não precise copiar os dados
+        temporario = caminho + '.tmp'
+        with pa.OSFile(temporario, 'wb') as destino, ipc.new_file(destino, tabela.schema) as escritor:
+            escritor.write_table(tabela)
+        os.replace(temporario, caminho)
+
+    def compactar(self, mes: str) -> None:
+        """Junta as partes de um mês num único arquivo (útil após muitos uploads pequenos)."""
+        partes = self._partes(mes)
+        if len(partes) < 2:
+            return
+        # A parte compactada é gravada antes de remover as antigas, para não perder dados numa falha
+        self._gravar_tabela(mes, self._ler_mes(mes))
+        for parte in partes:
+            os.remove(parte)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do DeduplicadorTransacoes: custo de montar o histórico e de separar as linhas novas
+de um documento que se sobrepõe a ele, conforme o histórico cresce.
+
+Uso:
+    python benchmark_deduplicacao.py [N_MAXIMO]
+
+O tempo por linha deve ficar estável (custo linear) até históricos de 1 milhão de linhas.
+"""
+
+import sys
+import time
+sys.path.append('attached_assets')
+
+import numpy as np
+import pandas as pd
+
+from transaction_dedup import DeduplicadorTransacoes
+
+
+def gerar_historico(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.Timestamp('2021-01-01') + pd.to_timedelta(rng.integers(0, 4 * 365, n), unit='D'),
+        'description': rng.choice([f'ESTABELECIMENTO {i}' for i in range(20_000)], n),
+        'value': np.round(rng.normal(-30, 300, n), 2),
+        'bank': rng.choice(['Nubank', 'Caixa Econômica Federal', 'Itaú', 'Banco Inter'], n),
+    })
+
+
+if __name__ == "__main__":
+    n_maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{'histórico':>10} {'montar (s)':>11} {'µs/linha':>9} {'documento (s)':>14} {'novas':>7}")
+    n = 125_000
+    while n <= n_maximo:
+        historico = gerar_historico(n, seed=1)
+        deduplicador = DeduplicadorTransacoes()
+        inicio = time.perf_counter()
+        deduplicador.adicionar(historico)
+        tempo_montagem = time.perf_counter() - inicio
+
+        # Documento de um mês: metade já está no histórico (reexportação), metade é nova
+        ultimo_mes = historico[historico['date'] >= historico['date'].max() - pd.Timedelta(days=30)]
+        repetidas = ultimo_mes.head(5_000)
+        documento = pd.concat([repetidas, gerar_historico(len(repetidas), seed=2).assign(date=repetidas['date'].to_numpy())])
+        inicio = time.perf_counter()
+        novas = deduplicador.registrar(documento)
+        tempo_documento = time.perf_counter() - inicio
+
+        print(f"{n:>10,} {tempo_montagem:>11.3f} {tempo_montagem / n * 1e6:>9.2f} {tempo_documento:>14.3f} {int(novas.sum()):>7,}")
+        n *= 2
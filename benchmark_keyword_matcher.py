@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do KeywordMatcher: custo de busca conforme a lista de termos cresce.
+
+Uso:
+    python benchmark_keyword_matcher.py [N_DESCRICOES]
+
+Compara a busca linear original (`any(termo in descricao ...)`) com o matcher compilado
+em trie para listas de ~150 a dezenas de milhares de nomes de estabelecimentos.
+"""
+
+import random
+import string
+import sys
+import time
+sys.path.append('attached_assets')
+
+from keyword_dictionaries import obter_dicionarios
+from keyword_matcher import KeywordMatcher
+
+
+def gerar_nomes(n: int, seed: int = 1) -> list[str]:
+    """Gera nomes sintéticos de estabelecimentos (2 a 3 palavras)."""
+    rng = random.Random(seed)
+    palavra = lambda: ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+    return [' '.join(palavra() for _ in range(rng.randint(2, 3))) for _ in range(n)]
+
+
+def cronometrar(funcao, descricoes: list[str]) -> tuple[int, float]:
+    inicio = time.perf_counter()
+    encontrados = sum(1 for d in descricoes if funcao(d))
+    return encontrados, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    n_descricoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    base = list(obter_dicionarios().listas['sites_apostas']) + list(obter_dicionarios().listas['processadoras_pagamento_nao_aposta'])
+    descricoes = [f"pix {nome} {i}" for i, nome in enumerate(gerar_nomes(n_descricoes, seed=2))]
+
+    print(f"{n_descricoes:,} descrições distintas")
+    print(f"{'termos':>8} {'linear (s)':>12} {'trie (s)':>10}")
+    for extra in (0, 1_000, 10_000, 30_000):
+        termos = base + gerar_nomes(extra)
+        matcher = KeywordMatcher(termos)
+        linear = (lambda d, termos=termos: any(t in d.lower() for t in termos)) if extra <= 10_000 else None
+        encontrados, tempo_trie = cronometrar(matcher.contem, descricoes)
+        if linear:
+            encontrados_linear, tempo_linear = cronometrar(linear, descricoes)
+            assert encontrados_linear == encontrados
+            print(f"{len(termos):>8,} {tempo_linear:>12.3f} {tempo_trie:>10.3f}")
+        else:
+            print(f"{len(termos):>8,} {'-':>12} {tempo_trie:>10.3f}")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de detectar_movimentacoes_suspeitas sobre um histórico sintético.
+
+Uso:
+    python benchmark_movimentacoes_suspeitas.py [N_TRANSACOES] [--comparar]
+
+Com --comparar, executa também a implementação anterior (groupby em Python + iterrows)
+e verifica que as duas produzem exatamente os mesmos alertas.
+"""
+
+import glob
+import importlib.util
+import sys
+import time
+sys.path.append('attached_assets')
+
+import numpy as np
+import pandas as pd
+
+
+def carregar_modulo(prefixo: str):
+    """Carrega um módulo de attached_assets pelo prefixo do nome do arquivo."""
+    caminho = sorted(glob.glob(f"attached_assets/{prefixo}_*.py"))[0]
+    spec = importlib.util.spec_from_file_location(prefixo, caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def gerar_historico(n: int, seed: int = 42) -> pd.DataFrame:
+    """Gera n transações distribuídas em ~3 anos, com horários, extrato e fatura."""
+    rng = np.random.default_rng(seed)
+    inicio = np.datetime64('2022-01-01T00:00')
+    minutos = rng.integers(0, 3 * 365 * 24 * 60, size=n)
+    valores = np.round(rng.lognormal(5, 1.5, size=n), 2) * np.where(rng.random(n) < 0.6, -1, 1)
+    return pd.DataFrame({
+        'date': pd.to_datetime(inicio + minutos.astype('timedelta64[m]')),
+        'description': rng.choice(['PIX ENVIADO', 'PIX RECEBIDO', 'COMPRA DEBITO', 'PAG BOLETO', 'TED'], size=n),
+        'value': valores,
+        'doc_type': rng.choice(['extrato_bancario', 'fatura_cartao'], size=n, p=[0.8, 0.2]),
+    })
+
+
+def detectar_movimentacoes_suspeitas_legado(transactions_df: pd.DataFrame) -> list[dict]:
+    """Implementação anterior (referência para comparação)."""
+    suspeitas = []
+    if transactions_df.empty: return suspeitas
+
+    transactions_df['date'] = pd.to_datetime(transactions_df['date'], errors='coerce')
+    transactions_df.dropna(subset=['date', 'value'], inplace=True)
+    if transactions_df.empty: return suspeitas
+
+    extrato_df = transactions_df[transactions_df['doc_type'] == 'extrato_bancario'].copy()
+    if not extrato_df.empty:
+        daily_transactions = extrato_df.groupby(extrato_df['date'].dt.date)
+        for date, group in daily_transactions:
+            total_entrada_dia = group[group['value'] >= 0]['value'].sum()
+            total_saida_dia = abs(group[group['value'] < 0]['value'].sum())
+            if total_entrada_dia > 500 and total_saida_dia >= total_entrada_dia * 0.85 and total_saida_dia > 0:
+                suspeitas.append({
+                    'DATA': date.strftime('%d/%m/%Y'),
+                    'TIPO': 'Movimentação Circular (Pass-through)',
+                    'DESCRICAO': f'Recebeu R$ {total_entrada_dia:,.2f} e repassou R$ {total_saida_dia:,.2f} no mesmo dia.',
+                    'VALOR': f"R$ {total_entrada_dia:,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
+                    'ALERTA': 'Padrão circular pode indicar "pass-through" de recursos. Verificar origem/destino.'
+                })
+        for date, group in daily_transactions:
+            saidas_dia = group[group['value'] < 0].copy().sort_values(by='date')
+            pequenas_saidas = saidas_dia[abs(saidas_dia['value']) < 1000]
+            if len(pequenas_saidas) >= 5 and abs(pequenas_saidas['value'].sum()) > 1500:
+                suspeitas.append({
+                    'DATA': date.strftime('%d/%m/%Y'),
+                    'TIPO': 'Possível Estruturação (Pequenas Saídas)',
+                    'DESCRICAO': f'{len(pequenas_saidas)} transações de baixo valor totalizando R$ {abs(pequenas_saidas["value"].sum()):,.2f}.',
+                    'VALOR': f"R$ {abs(pequenas_saidas['value'].sum()):,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
+                    'ALERTA': 'Múltiplas pequenas saídas no mesmo dia. Pode ser tentativa de disfarçar transações maiores.'
+                })
+
+    for _, t in transactions_df.iterrows():
+        if pd.notna(t['date']) and pd.notna(t['value']):
+            hora = t['date'].hour
+            if 0 <= hora <= 5 and abs(t['value']) > 500:
+                suspeitas.append({
+                    'DATA': t['date'].strftime('%d/%m/%Y %H:%M'),
+                    'TIPO': 'Horário Atípico (Madrugada)',
+                    'DESCRICAO': t['description'],
+                    'VALOR': f"R$ {abs(t['value']):,.2f}".replace('.', '#').replace(',', '.').replace('#', ','),
+                    'ALERTA': 'Transação de valor considerável em horário incomum. Verificar legitimidade.'
+                })
+
+    return suspeitas
+
+
+def cronometrar(funcao, df: pd.DataFrame):
+    inicio = time.perf_counter()
+    resultado = funcao(df.copy())
+    return resultado, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    n = int(argumentos[0]) if argumentos else 1_000_000
+    comparar = '--comparar' in sys.argv
+
+    financial_analysis = carregar_modulo('financial_analysis')
+    historico = gerar_historico(n)
+    print(f"Histórico sintético: {n:,} transações")
+
+    alertas, tempo = cronometrar(financial_analysis.detectar_movimentacoes_suspeitas, historico)
+    print(f"Vetorizado: {tempo:.2f}s ({len(alertas):,} alertas)")
+
+    if comparar:
+        alertas_legado, tempo_legado = cronometrar(detectar_movimentacoes_suspeitas_legado, historico)
+        print(f"Legado:     {tempo_legado:.2f}s ({len(alertas_legado):,} alertas) - speedup {tempo_legado / tempo:.1f}x")
+        if alertas != alertas_legado:
+            print("ERRO: os alertas diferem da implementação anterior.")
+            sys.exit(1)
+        print("Alertas idênticos à implementação anterior.")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do OCR por documento: o `perform_ocr` antigo (um `pytesseract.image_to_string` por
+página, com PNG temporário e um processo tesseract novo a cada página) contra o MotorOCR
+(engine residente com tesserocr, ou um processo tesseract por lote de páginas).
+
+Uso:
+    python benchmark_ocr.py [ARQUIVO.pdf] [N_PAGINAS]
+
+Sem PDF, usa páginas sintéticas de extrato (N_PAGINAS, padrão 8). O texto reconhecido deve
+ser o mesmo nos dois caminhos; o tempo por página do MotorOCR deve ficar abaixo do antigo,
+pois os modelos 'por+eng' são carregados uma vez e não a cada página.
+"""
+
+import sys
+import time
+sys.path.append('attached_assets')
+
+import pytesseract
+from PIL import Image, ImageDraw
+
+from ocr_engine import IDIOMAS_PADRAO, MotorOCR, tesserocr_disponivel
+
+
+def paginas_sinteticas(n: int) -> list:
+    paginas = []
+    for numero in range(n):
+        imagem = Image.new('RGB', (2480, 3508), 'white')  # A4 a 300 DPI
+        desenho = ImageDraw.Draw(imagem)
+        for linha in range(60):
+            desenho.text((150, 150 + linha * 52), f"{linha % 28 + 1:02d}/05/2025  PIX ENVIADO FULANO {numero}-{linha}  R$ {linha * 13.7:,.2f}", fill='black')
+        paginas.append(imagem)
+    return paginas
+
+
+def paginas_pdf(caminho: str) -> list:
+    import fitz
+    with fitz.open(caminho) as documento:
+        return [
+            Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+            for pix in (pagina.get_pixmap(matrix=fitz.Matrix(300/72, 300/72)) for pagina in documento)
+        ]
+
+
+def medir(nome: str, reconhecer, paginas: list) -> list[str]:
+    inicio = time.perf_counter()
+    textos = reconhecer(paginas)
+    tempo = time.perf_counter() - inicio
+    print(f"{nome:<28} {tempo:>9.2f} {tempo / len(paginas):>11.3f}")
+    return textos
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    if argumentos and argumentos[0].lower().endswith('.pdf'):
+        paginas = paginas_pdf(argumentos.pop(0))
+    else:
+        paginas = paginas_sinteticas(int(argumentos[0]) if argumentos else 8)
+
+    print(f"{len(paginas)} páginas")
+    print(f"{'caminho':<28} {'total (s)':>9} {'s/página':>11}")
+    antigo = medir('pytesseract por página', lambda imagens: [pytesseract.image_to_string(imagem, lang=IDIOMAS_PADRAO) for imagem in imagens], paginas)
+    backends = ['tesseract'] + (['tesserocr'] if tesserocr_disponivel() else [])
+    for backend in backends:
+        motor = MotorOCR(backend=backend)
+        novo = medir(f'MotorOCR ({backend})', lambda imagens: list(motor.reconhecer(imagens)), paginas)
+        iguais = sum(a.split() == b.split() for a, b in zip(antigo, novo))
+        print(f"{'':<28} páginas com o mesmo texto do antigo: {iguais}/{len(paginas)}")
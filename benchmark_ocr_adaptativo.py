@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do OCR adaptativo contra o OCR fixo a 300 DPI num conjunto de extratos digitalizados:
+latência média por página e transações que os parsers encontram no texto de cada modo.
+
+Uso:
+    python benchmark_ocr_adaptativo.py PASTA_OU_PDF [PASTA_OU_PDF ...]
+
+A latência por página do modo adaptativo deve ficar abaixo da do fixo, com o mesmo número de
+transações ou mais (recall relativo ao fixo >= 1,00). A segunda passada do adaptativo mostra
+o efeito do cache de pré-processamento sobre páginas já vistas.
+"""
+
+import os
+import sys
+import time
+sys.path.append('attached_assets')
+
+import fitz # PyMuPDF
+
+import ocr_adaptive
+from brazilian_banks_parser import parse_brazilian_bank_document
+from ocr_engine import MOTOR_OCR, renderizar_pagina
+
+
+def listar_pdfs(caminhos: list[str]) -> list[str]:
+    pdfs = []
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            pdfs.extend(sorted(os.path.join(caminho, nome) for nome in os.listdir(caminho) if nome.lower().endswith('.pdf')))
+        else:
+            pdfs.append(caminho)
+    return pdfs
+
+
+def ocr_fixo(paginas):
+    return MOTOR_OCR.reconhecer(renderizar_pagina(pagina) for pagina in paginas)
+
+
+def medir(nome: str, ocr, pdfs: list[str]) -> int:
+    paginas_total, transacoes_total, inicio = 0, 0, time.perf_counter()
+    for caminho in pdfs:
+        with fitz.open(caminho) as documento:
+            texto = "\n".join(ocr(list(documento)))
+            paginas_total += documento.page_count
+        transacoes_total += len(parse_brazilian_bank_document(texto).get('transactions', []))
+    tempo = time.perf_counter() - inicio
+    print(f"{nome:<26} {paginas_total:>8} {tempo / paginas_total:>11.3f} {transacoes_total:>11}")
+    return transacoes_total
+
+
+if __name__ == "__main__":
+    pdfs = listar_pdfs(sys.argv[1:])
+    if not pdfs:
+        sys.exit(__doc__)
+    print(f"backend: {MOTOR_OCR.backend}")
+    print(f"{'modo':<26} {'páginas':>8} {'s/página':>11} {'transações':>11}")
+    fixo = medir('fixo 300 DPI', ocr_fixo, pdfs)
+    adaptativo = medir('adaptativo', ocr_adaptive.ocr_paginas_adaptativo, pdfs)
+    medir('adaptativo (com cache)', ocr_adaptive.ocr_paginas_adaptativo, pdfs)
+    cache = ocr_adaptive.CACHE_PREPROCESSAMENTO
+    print(f"recall relativo ao fixo: {adaptativo / fixo if fixo else float('nan'):.2f}")
+    print(f"cache de pré-processamento: {cache.acertos} acertos, {cache.falhas} falhas")
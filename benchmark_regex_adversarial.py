@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark adversarial dos padrões de linha de transação: textos de OCR degenerados (longas
+sequências de espaços, "R$" perdido pelo OCR, linhas "Pix Para" sem valor, dígitos sem fim)
+contra os padrões antigos (sem âncora, com retrocesso) e os novos (ancorados e possessivos).
+
+Uso:
+    python benchmark_regex_adversarial.py [TAMANHO_MAXIMO]
+
+O tempo por KB dos padrões novos deve ficar estável conforme o texto dobra (custo linear);
+o dos antigos dobra junto (custo quadrático) e eles deixam de ser medidos após 2 s.
+"""
+
+import re
+import sys
+import time
+sys.path.append('attached_assets')
+
+from brazilian_banks_parser import BrazilianBanksParser
+
+LIMITE_ANTIGO_SEGUNDOS = 2.0
+
+# (caso, padrão antigo, padrão novo, gerador do texto adversarial com ~n caracteres)
+CASOS = [
+    (
+        'itau: espaços sem valor',
+        r'(\d{2}\/\d{2}\/\d{4})\s+([^0-9]+?)\s+([\d\.,]+)\s+([CD])\s+([\d\.,]+)\s+([CD])',
+        BrazilianBanksParser.ITAU_LINE,
+        lambda n: '01/05/2025 PIX' + ' ' * n + 'FIM\n',
+    ),
+    (
+        'nubank: OCR sem "R$"',
+        r'(\d{2}\/\d{2}\/\d{4})\s+([^R$]+)\s+R\$\s*([\d\.,]+)',
+        BrazilianBanksParser.NUBANK_LINE,
+        lambda n: '01/05/2025 PIX ENVIADO FULANO 10,00\n' * (n // 35),
+    ),
+    (
+        'bb: OCR sem "R$"',
+        r'(\d{2}\/\d{2})\s+(\d{2}\/\d{2})\s+(Entrada|Saída|Débito de Cartão)\s+([^R]+)\s+R\$\s*([\d\.,]+|[\-\d\.,]+)',
+        BrazilianBanksParser.BB_LINE,
+        lambda n: '01/05 01/05 Saída PIX ENVIADO 10,00\n' * (n // 36),
+    ),
+    (
+        'infinitepay: "Pix Para" sem valor',
+        r'Pix\s+(?:Para|De)\s+([^0-9+-]+?)\s+([+-]?[\d\.,]+)',
+        BrazilianBanksParser.INFINITEPAY_SIMPLE_PIX_LINE,
+        lambda n: 'Pix Para FULANO DE TAL\n' * (n // 23),
+    ),
+    (
+        'genérico: espaços sem valor',
+        r'(\d{2}/\d{2})\s+([^0-9]+?)\s+([\d\.,]+)',
+        BrazilianBanksParser.GENERIC_STATEMENT_LINE[0],
+        lambda n: '01/05 PIX' + ' ' * n + 'FIM\n',
+    ),
+    (
+        'caixa: saldo com dígitos sem fim',
+        r'([\d.,]+)\s+([CD])',
+        re.compile(r'(?<![\d.,])([\d.,]++)[ \t]++([CD])'),
+        lambda n: '1' * n,
+    ),
+]
+
+
+def medir(padrao, texto: str) -> float:
+    inicio = time.perf_counter()
+    for _ in re.finditer(padrao, texto) if isinstance(padrao, str) else padrao.finditer(texto):
+        pass
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    tamanho_maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 4_000_000
+    print(f"{'caso':<36} {'tamanho':>10} {'antigo (s)':>11} {'novo (s)':>9} {'novo µs/KB':>11}")
+    for caso, antigo, novo, gerar in CASOS:
+        antigo_ativo = True
+        n = 4_000
+        while n <= tamanho_maximo:
+            texto = gerar(n)
+            tempo_antigo = medir(antigo, texto) if antigo_ativo else None
+            tempo_novo = medir(novo, texto)
+            antigo_ativo = antigo_ativo and tempo_antigo < LIMITE_ANTIGO_SEGUNDOS
+            coluna_antigo = f"{tempo_antigo:>11.3f}" if tempo_antigo is not None else f"{'—':>11}"
+            print(f"{caso:<36} {len(texto):>10,} {coluna_antigo} {tempo_novo:>9.4f} {tempo_novo / len(texto) * 1e9:>11.1f}")
+            n *= 2
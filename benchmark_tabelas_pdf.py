@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da extração de tabelas de PDF por backend: tabula em subprocesso (o fallback antigo,
+uma JVM por documento), tabula com a JVM residente (jpype) e a detecção no processo do PyMuPDF.
+
+Uso:
+    python benchmark_tabelas_pdf.py ARQUIVO.pdf [ARQUIVO.pdf ...]
+
+Cada backend processa os documentos em sequência, no mesmo processo. O primeiro documento do
+'tabula_jvm' inclui a partida da JVM; nos seguintes ela já está carregada e o tempo por
+documento deve cair para o da extração em si. O 'tabula' paga a partida em todos.
+"""
+
+import sys
+import time
+sys.path.append('attached_assets')
+
+from pdf_tables import BACKENDS_TABELAS, backend_disponivel, extrair_tabelas_pdf
+
+
+if __name__ == "__main__":
+    pdfs = sys.argv[1:]
+    if not pdfs:
+        sys.exit(__doc__)
+    print(f"{'backend':<12} {'1º doc (s)':>11} {'demais (s/doc)':>15} {'total (s)':>10} {'tabelas':>8}")
+    for backend in BACKENDS_TABELAS:
+        if not backend_disponivel(backend):
+            print(f"{backend:<12} {'indisponível':>11}")
+            continue
+        tempos, tabelas = [], 0
+        for caminho in pdfs:
+            inicio = time.perf_counter()
+            tabelas += len(extrair_tabelas_pdf(caminho, backend))
+            tempos.append(time.perf_counter() - inicio)
+        demais = sum(tempos[1:]) / (len(tempos) - 1) if len(tempos) > 1 else float('nan')
+        print(f"{backend:<12} {tempos[0]:>11.2f} {demais:>15.2f} {sum(tempos):>10.2f} {tabelas:>8}")
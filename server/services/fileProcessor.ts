@@ -117,12 +117,15 @@ sys.path.append('${path.join(process.cwd(), 'attached_assets')}')
 # Import the existing modules
 from file_io_utils_1750515734455_1750930356999 import handle_uploaded_file, detect_file_type_by_filename, detect_bank_from_filename, perform_ocr
 from data_parsing_1750515734453_1750930357029 import parse_date_string, parse_financial_value, extrair_dados_cadastrais, processar_contracheque
-from dataframe_parsers_1750515734454_1750930357013 import process_dataframe_generic, process_nubank_extrato_csv, process_nubank_fatura_csv, process_inter_extrato_csv, process_inter_fatura_csv, process_caixa_extrato_csv, process_picpay_fatura_csv
-from bank_specific_parsers_1750515734450_1750930357073 import parse_nubank_extrato_pdf, parse_c6_fatura_pdf
+from dataframe_parsers_1750515734454_1750930357013 import process_dataframe_generic
 from categorization_logic_1750515734451_1750930357059 import categorizar_transacao_granular, categorize_transactions_detailed
 from config_1750515734453_1750930357044 import SITES_APOSTAS, PROCESSADORAS_PAGAMENTO_NAO_APOSTA, MAPPING_COLUNAS_PADRAO_GENERICO
-from caixa_extrato_parser import parse_caixa_extrato_pdf, process_caixa_extrato_text
 from brazilian_banks_parser import parse_brazilian_bank_document, BrazilianBanksParser
+from keyword_dictionaries import obter_dicionarios
+from keyword_matcher import mascara_palavras_chave
+from balance_index import reconciliar_saldos
+from parser_registry import REGISTRO_PARSERS
+from transaction_regex import OrcamentoRegex
 
 def extract_transactions(file_path, file_type):
     """Main function to extract and categorize transactions from documents."""
@@ -133,76 +136,46 @@ def extract_transactions(file_path, file_type):
         bank = detect_bank_from_filename(filename)
         
         # Handle file upload and extraction
-        extracted_data = handle_uploaded_file(file_path, file_type)
+        extracted_data = handle_uploaded_file(file_path, file_type, file_name=filename)
         
         transactions = []
+        regex_budget = OrcamentoRegex()  # Shared by the text parsers of this document
         
         # Process based on file type and bank
         if file_type == 'pdf':
             text_content = extracted_data.get('text', '')
             
-            # Use the NEW unified Brazilian banks parser FIRST
-            try:
-                parser = BrazilianBanksParser()
-                detected_bank = parser.detect_bank(text_content)
-                detected_doc_type = parser.detect_document_type(text_content)
-                
-                print(f"Detected bank: {detected_bank}, doc type: {detected_doc_type}")
-                
-                if detected_doc_type == 'extrato_bancario':
-                    transactions = parser.parse_bank_statement(text_content, detected_bank)
-                elif detected_doc_type == 'fatura_cartao':
-                    transactions = parser.parse_credit_card_statement(text_content, detected_bank)
-                
-                if transactions:
-                    bank = detected_bank
-                    doc_type = detected_doc_type
-                    print(f"NEW parser extracted {len(transactions)} transactions from {detected_bank}")
-                
-            except Exception as e:
-                print(f"NEW unified parser error: {e}")
-            
-            # Fallback to old parsers only if new parser didn't work
-            if not transactions:
-                if 'nubank' in bank.lower() and doc_type == 'extrato_bancario':
-                    transactions = parse_nubank_extrato_pdf(text_content, doc_type)
-                elif 'c6' in bank.lower() and doc_type == 'fatura_cartao':
-                    transactions = parse_c6_fatura_pdf(text_content, doc_type)
-                elif 'caixa' in bank.lower() or 'CAIXA' in text_content:
-                    # Use the Caixa specific parser
-                    caixa_result = process_caixa_extrato_text(text_content)
-                    if caixa_result.get('processing_success', False):
-                        transactions = caixa_result.get('transactions', [])
-                
-                # Try the old unified parser as last resort
-                if not transactions:
-                    try:
-                        unified_result = parse_brazilian_bank_document(text_content, doc_type)
-                        if unified_result.get('processing_success', False):
-                            transactions = unified_result.get('transactions', [])
-                            bank = unified_result.get('bank', bank)
-                            print(f"Old unified parser extracted {len(transactions)} transactions from {unified_result.get('bank', 'unknown')} bank")
-                    except Exception as e:
-                        print(f"Old unified parser failed: {e}")
-            
-            # Generic fallback for PDFs that might be bank statements
+            def parse_text(text):
+                """
+                Registered text parsers, most likely first (filename and text sniff); first one with
+                transactions wins. The doc type comes from the text; the filename's only when there is none.
+                """
+                text_doc_type = BrazilianBanksParser().detect_document_type(text) if text.strip() else doc_type
+                for parser in REGISTRO_PARSERS.selecionar(text_doc_type, 'texto', nome_arquivo=filename, texto=text):
+                    found = parser.funcao(text, text_doc_type, regex_budget)
+                    if found:
+                        print(f"{parser.nome} extracted {len(found)} transactions")
+                        return found, parser.banco, text_doc_type
+                return [], bank, doc_type
+
+            transactions, bank, doc_type = parse_text(text_content)
+
+            # Unified parser's generic line patterns as last resort
             if not transactions and text_content.strip():
-                # Try to detect if it looks like a Caixa statement
-                if any(indicator in text_content.upper() for indicator in [
-                    'CAIXA ECONÔMICA', 'SAC CAIXA', 'ALÔ CAIXA', 'EXTRATO POR PERÍODO'
-                ]):
-                    transactions = parse_caixa_extrato_pdf(text_content, doc_type)
+                try:
+                    unified_result = parse_brazilian_bank_document(text_content, doc_type, regex_budget)
+                    if unified_result.get('processing_success', False):
+                        transactions = unified_result.get('transactions', [])
+                        bank = REGISTRO_PARSERS.nome_banco(unified_result.get('bank')) or bank
+                        print(f"Unified parser extracted {len(transactions)} transactions from {bank}")
+                except Exception as e:
+                    print(f"Unified parser failed: {e}")
             
-            # OCR fallback for scanned PDFs
-            if not transactions and not text_content.strip():
+            # OCR fallback for scanned PDFs (pages without a text layer were already OCR'd when read)
+            if not transactions and not text_content.strip() and extracted_data.get('ocr_pages') is None:
                 ocr_text = perform_ocr(file_path)
                 if ocr_text:
-                    if 'nubank' in bank.lower():
-                        transactions = parse_nubank_extrato_pdf(ocr_text, doc_type)
-                    elif any(indicator in ocr_text.upper() for indicator in [
-                        'CAIXA ECONÔMICA', 'SAC CAIXA', 'ALÔ CAIXA'
-                    ]):
-                        transactions = parse_caixa_extrato_pdf(ocr_text, doc_type)
+                    transactions, bank, doc_type = parse_text(ocr_text)
         
         elif file_type in ['csv', 'xlsx']:
             # Process DataFrames
@@ -210,24 +183,16 @@ def extract_transactions(file_path, file_type):
             if tables:
                 df = tables[0]  # Use first table
                 
-                # Try bank-specific processors
-                if 'nubank' in bank.lower():
-                    if doc_type == 'extrato_bancario':
-                        transactions = process_nubank_extrato_csv(df, doc_type)
-                    elif doc_type == 'fatura_cartao':
-                        transactions = process_nubank_fatura_csv(df, doc_type)
-                elif 'inter' in bank.lower():
-                    if doc_type == 'extrato_bancario':
-                        transactions = process_inter_extrato_csv(df, doc_type)
-                    elif doc_type == 'fatura_cartao':
-                        transactions = process_inter_fatura_csv(df, doc_type)
-                elif 'caixa' in bank.lower():
-                    transactions = process_caixa_extrato_csv(df, doc_type)
-                elif 'picpay' in bank.lower():
-                    transactions = process_picpay_fatura_csv(df, doc_type)
-                else:
-                    # Generic processor
-                    transactions = process_dataframe_generic(df, doc_type)
+                # Try the processor for the table's header format, then the filename's bank
+                header_parser, routed_df = REGISTRO_PARSERS.rotear_tabela(df, doc_type)
+                candidates = [header_parser] if header_parser else REGISTRO_PARSERS.selecionar(doc_type, 'tabela', nome_arquivo=filename)
+                for parser in candidates:
+                    transactions = parser.funcao(routed_df, doc_type)
+                    if transactions:
+                        break
+                if not transactions:
+                    # Generic processor, with the column mapping cached per header format
+                    transactions = process_dataframe_generic(df, doc_type, REGISTRO_PARSERS.mapeamento_colunas(df))
         
         # Convert datetime objects to strings for JSON serialization
         for transaction in transactions:
@@ -259,20 +224,26 @@ def extract_transactions(file_path, file_type):
                     'card_credits': card_credits_df.to_dict('records') if not card_credits_df.empty else []
                 }
         
+        # Check statement-reported balances for dropped or duplicated lines
+        balance_check = None
+        if transactions and any(t.get('balance') is not None for t in transactions):
+            reconciliation = reconciliar_saldos(pd.DataFrame(transactions), por=None)['conciliacao']
+            balance_check = {
+                'checked': int(reconciliation.notna().sum()),
+                'gaps': int((reconciliation == 'lacuna').sum()),
+                'duplicates': int((reconciliation == 'duplicada').sum())
+            }
+        
         # Calculate financial summary
         if transactions:
             total_income = sum(t['value'] for t in transactions if t['value'] > 0)
             total_expenses = sum(abs(t['value']) for t in transactions if t['value'] < 0)
             net_balance = total_income - total_expenses
             
-            # Detect betting transactions
-            betting_transactions = []
-            for transaction in transactions:
-                desc_lower = transaction['description'].lower()
-                if any(site in desc_lower for site in SITES_APOSTAS):
-                    # Check if it's not a legitimate processor
-                    if not any(proc in desc_lower for proc in PROCESSADORAS_PAGAMENTO_NAO_APOSTA):
-                        betting_transactions.append(transaction)
+            # Detect betting transactions (excluding legitimate processors), one scan per distinct description
+            dictionaries = obter_dicionarios()
+            betting_mask = mascara_palavras_chave([t['description'] for t in transactions], dictionaries.sites_apostas, dictionaries.processadoras)
+            betting_transactions = [t for t, is_betting in zip(transactions, betting_mask) if is_betting]
             
             financial_summary = {
                 'total_income': total_income,
@@ -281,7 +252,8 @@ def extract_transactions(file_path, file_type):
                 'transaction_count': len(transactions),
                 'betting_transactions': betting_transactions,
                 'betting_amount': sum(abs(t['value']) for t in betting_transactions),
-                'categorized_data': categorized_data
+                'categorized_data': categorized_data,
+                'balance_check': balance_check
             }
         
         result = {
@@ -290,6 +262,8 @@ def extract_transactions(file_path, file_type):
             'doc_type': doc_type,
             'bank': bank,
             'transactions': transactions,
+            # Regex time budget ran out: the transactions of this document may be incomplete
+            'regex_budget_exceeded': regex_budget.esgotado,
             'personal_data': personal_data,
             'financial_summary': financial_summary,
             'success': True
@@ -345,9 +319,14 @@ if __name__ == "__main__":
   private generateCreditScoreScript(transactions: any[], personalData: any): string {
     return `
 import json
+import re
+import sys
 import pandas as pd
 from datetime import datetime, timedelta
 
+sys.path.append('${path.join(process.cwd(), 'attached_assets')}')
+from balance_index import RunningBalanceIndex
+
 def calculate_credit_score(transactions, personal_data):
     """Calculate credit score based on transaction history and personal data."""
     
@@ -395,16 +374,15 @@ def calculate_credit_score(transactions, personal_data):
         score += 30
     
     # Betting detection penalty (25% weight)
-    betting_count = 0
-    betting_amount = 0
-    
     sites_apostas = ['bet365', 'betano', 'sportingbet', 'pixbet', 'blaze', 'stake', 'aposta', 'cassino']
+    betting_pattern = re.compile('|'.join(map(re.escape, sites_apostas)))
     
-    for transaction in transactions:
-        desc_lower = transaction['description'].lower()
-        if any(site in desc_lower for site in sites_apostas):
-            betting_count += 1
-            betting_amount += abs(transaction['value'])
+    # One regex scan per distinct description, broadcast back as a mask
+    descriptions = df['description'].astype(str).str.lower()
+    betting_descriptions = [d for d in descriptions.unique() if betting_pattern.search(d)]
+    betting_mask = descriptions.isin(betting_descriptions)
+    betting_count = int(betting_mask.sum())
+    betting_amount = df.loc[betting_mask, 'value'].abs().sum()
     
     if betting_count > 0:
         total_amount = sum(abs(t['value']) for t in transactions)
@@ -414,18 +392,14 @@ def calculate_credit_score(transactions, personal_data):
         score -= penalty
     
     # Balance consistency (10% weight)
-    values = [t['value'] for t in transactions]
-    running_balance = []
-    balance = 0
-    
-    for value in values:
-        balance += value
-        running_balance.append(balance)
+    # Running balance over date-sorted transactions (same index used by analyze_risk)
+    df['date'] = pd.to_datetime(df['date'], format='ISO8601', utc=True, errors='coerce').dt.tz_localize(None)
+    balance_index = RunningBalanceIndex.de_transacoes(df, doc_type=None)
     
-    negative_balance_count = sum(1 for b in running_balance if b < 0)
+    negative_balance_count = balance_index.contagem_negativos
     if negative_balance_count == 0:
         score += 50
-    elif negative_balance_count < len(running_balance) * 0.1:
+    elif negative_balance_count < len(balance_index) * 0.1:
         score += 30
     
     # Recent activity (10% weight)
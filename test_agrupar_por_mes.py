@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib
+import sys
+sys.path.append('attached_assets')
+
+import pandas as pd
+
+financial_analysis = importlib.import_module('financial_analysis_1750515734457_1750930356985')
+
+
+def _transacoes():
+    return pd.DataFrame({
+        'date': ['2025-01-05', '2025-01-20', '2025-02-03', None],
+        'value': [1000.0, -250.0, -100.0, 50.0],
+        'specific_category': ['Salário', 'Alimentação', 'Alimentação', 'Outros/Diversos'],
+        'bank': ['nubank', 'nubank', 'inter', 'inter'],
+    })
+
+
+def test_tabela_mensal_tipada():
+    mensal = financial_analysis.agrupar_por_mes(_transacoes())
+    assert isinstance(mensal.index, pd.PeriodIndex)
+    assert mensal.dtypes.eq('float64').all()
+    assert mensal.loc[pd.Period('2025-01', 'M')].tolist() == [1000.0, -250.0, 750.0]
+
+
+def test_rollup_por_categoria_e_banco():
+    mensal = financial_analysis.agrupar_por_mes(_transacoes(), por_categoria=True, por_banco=True)
+    assert mensal.index.names == ['mes', 'specific_category', 'bank']
+    assert mensal.loc[(pd.Period('2025-02', 'M'), 'Alimentação', 'inter'), 'Saída'] == -100.0
+
+
+def test_adaptador_legado():
+    assert financial_analysis.group_by_month(_transacoes()) == {
+        '2025-01': {'Entrada': 1000.0, 'Saída': -250.0, 'Saldo': 750.0},
+        '2025-02': {'Entrada': 0.0, 'Saída': -100.0, 'Saldo': -100.0},
+    }
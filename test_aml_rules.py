@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('attached_assets')
+
+import pandas as pd
+import pytest
+
+from aml_rules import avaliar_regras
+
+REGRA_PIX_24H = {
+    'nome': 'pix_24h',
+    'janela': '24h',
+    'filtro': {'descricao': r'pix'},
+    'condicao': {'soma_min': 1000}
+}
+REGRA_PEQUENAS_3D = {
+    'nome': 'pequenas_3d',
+    'janela': '3D',
+    'filtro': {'fluxo': 'saida', 'valor_abs_max': 1000},
+    'condicao': {'qtd_min': 3}
+}
+REGRA_RAZAO_7D = {
+    'nome': 'razao_7d',
+    'janela': '7D',
+    'condicao': {'entrada_min': 1000, 'razao_saida_entrada_min': 0.9}
+}
+
+
+def _transacoes(linhas):
+    return pd.DataFrame(linhas, columns=['date', 'description', 'value']).assign(doc_type='extrato_bancario')
+
+
+def test_janela_24h_soma_apenas_transacoes_dentro_da_janela():
+    df = _transacoes([
+        ('2025-05-01 10:00', 'PIX ENVIADO', -600),
+        ('2025-05-02 09:00', 'PIX ENVIADO', -500),  # 23h depois: soma 1100 na janela
+        ('2025-05-04 09:00', 'PIX ENVIADO', -500),  # 48h depois: janela só tem 500
+        ('2025-05-04 09:30', 'COMPRA DEBITO', -5000),
+    ])
+    alertas = avaliar_regras(df, [REGRA_PIX_24H])
+    assert [a['DATA'] for a in alertas] == ['02/05/2025']
+    assert alertas[0]['VALOR'] == 'R$ 1.100,00'
+
+
+def test_varias_regras_e_janelas_numa_unica_chamada():
+    df = _transacoes([
+        ('2025-05-01', 'PIX RECEBIDO', 2000),
+        ('2025-05-02', 'PAG BOLETO', -300),
+        ('2025-05-03', 'PAG BOLETO', -300),
+        ('2025-05-03', 'PIX ENVIADO', -900),
+        ('2025-05-05', 'PIX ENVIADO', -400),
+    ])
+    alertas = avaliar_regras(df, [REGRA_PIX_24H, REGRA_PEQUENAS_3D, REGRA_RAZAO_7D])
+    por_regra = {}
+    for alerta in alertas:
+        por_regra.setdefault(alerta['REGRA'], []).append(alerta['DATA'])
+    assert por_regra['pix_24h'] == ['01/05/2025']
+    assert por_regra['pequenas_3d'] == ['03/05/2025', '05/05/2025']
+    assert por_regra['razao_7d'] == ['05/05/2025']
+
+
+def test_ordem_de_entrada_nao_altera_resultado():
+    df = _transacoes([
+        ('2025-05-03', 'PAG BOLETO', -300),
+        ('2025-05-01', 'PAG BOLETO', -300),
+        ('2025-05-02', 'PAG BOLETO', -300),
+    ])
+    assert avaliar_regras(df, [REGRA_PEQUENAS_3D]) == avaliar_regras(df.iloc[::-1], [REGRA_PEQUENAS_3D])
+
+
+def test_regra_invalida_gera_erro():
+    with pytest.raises(ValueError):
+        avaliar_regras(_transacoes([('2025-05-01', 'PIX', -1)]), [{'nome': 'x', 'janela': '1D', 'condicao': {'media_min': 1}}])
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('attached_assets')
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from balance_index import RunningBalanceIndex, reconciliar_saldos
+
+
+def gerar_extrato(n: int, seed: int, inicio: str = '2025-01-01') -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'date': pd.Timestamp(inicio) + pd.to_timedelta(rng.integers(0, 90 * 24 * 60, n), unit='min'),
+        'value': np.round(rng.normal(-20, 400, n), 2),
+        'doc_type': 'extrato_bancario',
+    })
+
+
+def metricas_por_recalculo(extrato: pd.DataFrame) -> tuple[int, float]:
+    """Cálculo anterior do analyze_risk: ordena, acumula e filtra os saldos negativos."""
+    ordenado = extrato.sort_values(by='date', kind='stable').reset_index(drop=True)
+    saldos = ordenado['value'].cumsum()
+    negativos = ordenado[saldos < 0]
+    return negativos['date'].dt.date.nunique(), saldos[saldos < 0].min()
+
+
+@pytest.mark.parametrize('seed', [1, 2])
+def test_anexar_em_lotes_equivale_ao_recalculo(seed):
+    extrato = gerar_extrato(3000, seed)
+    indice = RunningBalanceIndex()
+    # Lotes em ordem cronológica (caminho O(k)) seguidos de um lote com datas antigas (reconstrução)
+    ordenado = extrato.sort_values(by='date', kind='stable')
+    lotes = [ordenado.iloc[:1000], ordenado.iloc[1000:2500], extrato.loc[ordenado.index[2500:]].sample(frac=1, random_state=seed)]
+    historico = pd.DataFrame()
+    for lote in lotes[:2]:
+        indice.anexar_transacoes(lote)
+        historico = pd.concat([historico, lote])
+        assert (indice.dias_negativos, indice.saldo_minimo) == pytest.approx(metricas_por_recalculo(historico))
+
+    antigos = gerar_extrato(200, seed + 10, inicio='2024-12-01')
+    indice.anexar_transacoes(pd.concat([lotes[2], antigos]))
+    historico = pd.concat([historico, lotes[2], antigos])
+    assert len(indice) == len(historico)
+    assert (indice.dias_negativos, indice.saldo_minimo) == pytest.approx(metricas_por_recalculo(historico))
+    assert indice.contagem_negativos == int((historico.sort_values(by='date', kind='stable')['value'].cumsum() < 0).sum())
+
+
+def test_saldo_em_data_e_persistencia(tmp_path):
+    extrato = pd.DataFrame({
+        'date': pd.to_datetime(['2025-03-02 10:00', '2025-03-01 09:00', '2025-03-03 08:00', None]),
+        'value': [-500.0, 300.0, 100.0, 50.0],
+        'doc_type': ['extrato_bancario', 'extrato_bancario', 'extrato_bancario', 'extrato_bancario'],
+    })
+    indice = RunningBalanceIndex.de_transacoes(extrato)
+    assert len(indice) == 3  # Transação sem data fica de fora
+    assert indice.saldo_em('2025-02-28') == 0.0
+    assert indice.saldo_em('2025-03-01 09:00') == 300.0
+    assert indice.saldo_em('2025-03-02 23:59') == -200.0
+    assert indice.saldo_em('2025-12-31') == -100.0
+    assert (indice.dias_negativos, indice.saldo_minimo) == (2, -200.0)
+
+    caminho = str(tmp_path / 'indice.npz')
+    indice.salvar(caminho)
+    carregado = RunningBalanceIndex.carregar(caminho)
+    pd.testing.assert_series_equal(carregado.saldos(), indice.saldos())
+    carregado.anexar(pd.to_datetime(['2025-03-04']), [150.0])
+    assert carregado.saldo_final == 50.0
+    assert carregado.dias_negativos == 2
+
+
+def test_saldo_informado_ancora_o_indice():
+    # Extrato começa com saldo anterior de 1.000: o índice parte dele, não de zero
+    extrato = pd.DataFrame({
+        'date': pd.to_datetime(['2025-05-05', '2025-05-06', '2025-05-07']),
+        'value': [-300.0, -900.0, 250.0],
+        'balance': [700.0, -200.0, np.nan],
+        'doc_type': 'extrato_bancario',
+    })
+    indice = RunningBalanceIndex.de_transacoes(extrato)
+    assert indice.ancorado
+    assert indice.saldos().tolist() == [700.0, -200.0, 50.0]
+    assert (indice.dias_negativos, indice.saldo_minimo) == (1, -200.0)
+
+    # Um lote sem saldo continua do último saldo; um lote com saldo corrige a partir dele
+    indice.anexar(pd.to_datetime(['2025-05-08']), [-100.0])
+    indice.anexar(pd.to_datetime(['2025-05-09', '2025-05-10']), [10.0, 20.0], [500.0, np.nan])
+    assert indice.saldos().tolist()[-3:] == [-50.0, 500.0, 520.0]
+
+
+
+def test_saldo_ancorado_por_conta_e_somado_entre_contas():
+    # Duas contas com saldo informado, intercaladas, e uma terceira sem saldo informado
+    extrato = pd.DataFrame({
+        'date': pd.to_datetime(['2025-05-05', '2025-05-06', '2025-05-07', '2025-05-08', '2025-05-09']),
+        'value': [-50.0, -10.0, -100.0, -10.0, -50.0],
+        'balance': [5000.0, -10.0, np.nan, -20.0, 4950.0],
+        'bank': ['Caixa Econômica Federal', 'Banco Inter', 'Nubank', 'Banco Inter', 'caixa econômica federal '],
+        'account': ['123', '9', None, '9', '123'],
+        'doc_type': 'extrato_bancario',
+    })
+    indice = RunningBalanceIndex.de_transacoes(extrato)
+    # Caixa abre em 5.050, a conta do Inter em 0; os -100 do Nubank não são apagados pelo saldo seguinte da Caixa
+    assert indice.saldos().tolist() == [5000.0, 4990.0, 4890.0, 4880.0, 4830.0]
+    assert (indice.contagem_negativos, indice.saldo_minimo) == (0, 4830.0)
+
+    # Anexar em ordem (caminho O(k)) continua cada conta do próprio saldo
+    indice.anexar(pd.to_datetime(['2025-05-10', '2025-05-11']), [-5.0, 0.0], [np.nan, 4900.0],
+                  ['BANCO INTER|9', 'CAIXA ECONÔMICA FEDERAL|123'])
+    assert indice.saldos().tolist()[-2:] == [4825.0, 4775.0]
+
+
+def test_reconciliar_saldos_aponta_lacunas_e_linhas_repetidas():
+    extrato = pd.DataFrame({
+        'date': pd.to_datetime(['2025-05-05', '2025-05-05', '2025-05-08', '2025-05-08', '2025-05-08', '2025-05-09']),
+        'description': ['CRED PIX', 'ENVIO PIX', 'PAG BOLETO', 'PAG BOLETO', 'TARIFA', 'CRED PIX'],
+        'value': [100.0, -30.0, -20.0, -20.0, -5.0, 40.0],
+        'balance': [100.0, 70.0, 50.0, 50.0, 45.0, 60.0],  # Falta uma saída de 25 antes da última linha
+    })
+    conciliacao = reconciliar_saldos(extrato, por=None)
+    assert conciliacao['conciliacao'].tolist()[1:] == ['ok', 'ok', 'duplicada', 'ok', 'lacuna']
+    assert pd.isna(conciliacao['conciliacao'].iloc[0])
+    assert conciliacao['diferenca_saldo'].iloc[-1] == pytest.approx(-25.0)
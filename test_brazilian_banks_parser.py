@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+import time
+sys.path.append('attached_assets')
+
+from brazilian_banks_parser import BrazilianBanksParser
+from transaction_regex import OrcamentoRegex
+
+
+def test_parser_generico_gera_no_maximo_uma_transacao_por_linha():
+    texto = (
+        "EXTRATO 01/05/2025\n"
+        "  02/05/2025 PIX RECEBIDO 1.000,00\n"
+        "03/05 TARIFA 12,50\n"
+        "05-05-2025 COMPRA MERCADO 80,00\n"
+    )
+    transacoes = BrazilianBanksParser()._parse_generic_transactions(texto, 'generic')
+    # O cabeçalho não se junta à linha seguinte, e a data completa não é lida de novo como DD/MM
+    assert [(t['date'][:10], t['description'], t['value']) for t in transacoes] == [
+        ('2025-05-02', 'Pix Recebido', 1000.0),
+        (transacoes[1]['date'][:4] + '-05-03', 'Tarifa', 12.5),
+        ('2025-05-05', 'Compra Mercado', 80.0),
+    ]
+
+
+def test_fatura_generica_aceita_data_com_traco():
+    transacoes = BrazilianBanksParser()._parse_generic_credit_card("12/05 PADARIA 9,90\n13-05 FARMACIA 30,00\n", 'generic')
+    assert [(t['description'], t['value']) for t in transacoes] == [('Padaria', -9.9), ('Farmacia', -30.0)]
+
+
+def test_padroes_ancorados_sao_lineares_em_texto_degenerado():
+    # Linha de OCR com uma longa sequência de espaços e sem valor: o padrão antigo era quadrático nela
+    texto = '01/05/2025 PIX' + ' ' * 200_000 + 'FIM\n02/05/2025 PIX ENVIADO 10,00 D 90,00 C\n'
+    inicio = time.perf_counter()
+    transacoes = BrazilianBanksParser()._parse_itau_transactions(texto)
+    assert time.perf_counter() - inicio < 1.0
+    assert [(t['description'], t['value'], t['balance']) for t in transacoes] == [('Pix Enviado', -10.0, 90.0)]
+
+
+def test_orcamento_esgotado_interrompe_o_documento():
+    parser = BrazilianBanksParser()
+    parser.orcamento_regex = OrcamentoRegex(segundos=-1.0)
+    assert parser._parse_generic_transactions("12/05 PADARIA 9,90\n", 'generic') == []
+    assert parser.orcamento_regex.esgotado
+
+
+def test_orcamento_do_documento_e_compartilhado_pelo_parser_unificado():
+    from brazilian_banks_parser import parse_brazilian_bank_document
+    orcamento = OrcamentoRegex(segundos=-1.0)
+    fatura = BrazilianBanksParser().parse_credit_card_statement("FATURA CARTÃO\n12/05 PADARIA 9,90\n", 'generic', orcamento)
+    resultado = parse_brazilian_bank_document("EXTRATO SALDO\n12/05 PADARIA 9,90\n", orcamento=orcamento)
+    assert fatura == [] and resultado['transactions'] == []
+    assert resultado['regex_budget_exceeded'] and orcamento.esgotado
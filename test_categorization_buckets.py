@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib
+import sys
+sys.path.append('attached_assets')
+
+import pandas as pd
+
+categorization_logic = importlib.import_module('categorization_logic_1750515734451_1750930357059')
+
+
+def _transacoes():
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2025-05-01', '2025-05-02', '2025-05-03', '2025-05-04', '2025-05-05', '2025-05-06']),
+        'description': ['PIX RECEBIDO FULANO', 'PIX ENVIADO CICLANO', 'UBER TRIP', 'ESTORNO UBER', 'PGTO FAT', 'SALDO'],
+        'value': ['1500.00', -200.0, -35.5, 35.5, 800.0, 'n/a'],
+        'doc_type': ['extrato_bancario', 'extrato_bancario', 'fatura_cartao', 'fatura_cartao', 'fatura_cartao', 'extrato_bancario'],
+    })
+
+
+def test_buckets_no_proprio_dataframe():
+    df = _transacoes()
+    resultado = categorization_logic.categorizar_em_buckets(df)
+
+    assert resultado is df
+    assert len(df) == 5  # Valor inválido descartado
+    assert isinstance(df['bucket'].dtype, pd.CategoricalDtype)
+    assert df['bucket'].tolist() == ['entrada_extrato', 'saida_extrato', 'debito_cartao', 'credito_cartao', 'credito_cartao']
+    assert df['specific_category'].tolist()[3:] == ['Estorno na Fatura', 'Pagamento de Fatura (Crédito)']
+
+
+def test_selecionar_bucket_une_visoes_e_colunas():
+    df = categorization_logic.categorizar_em_buckets(_transacoes())
+    extrato = categorization_logic.selecionar_bucket(df, 'entrada_extrato', 'saida_extrato', colunas=['value'])
+    assert list(extrato.columns) == ['value']
+    assert extrato['value'].tolist() == [1500.0, -200.0]
+
+
+def test_categorize_transactions_detailed_mantem_quatro_tabelas():
+    entradas, saidas, cartao, creditos = categorization_logic.categorize_transactions_detailed(_transacoes())
+    assert (len(entradas), len(saidas), len(cartao), len(creditos)) == (1, 1, 1, 2)
+    assert creditos['category'].eq('Entrada').all()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import mmap
+import os
+import re
+import sys
+sys.path.append('attached_assets')
+
+from document_text_store import DocumentTextStore
+
+
+def test_despeja_documentos_antigos_alem_do_orcamento(tmp_path):
+    store = DocumentTextStore(orcamento_bytes=100, diretorio=str(tmp_path))
+    store.adicionar('a.pdf', 'Extrato março ' + 'x' * 60, doc_type='extrato_bancario')
+    store.adicionar('b.pdf', 'Fatura abril Limite total: R$ 2.000,00', doc_type='fatura_cartao')
+    assert store.bytes_residentes <= 100
+    assert store.documentos() == ['a.pdf', 'b.pdf']
+    assert store.documentos('fatura_cartao') == ['b.pdf']
+
+    # 'a.pdf' foi para disco e volta via mmap, sem mudar o texto
+    conteudo = store.conteudo('a.pdf')
+    assert isinstance(conteudo, mmap.mmap)
+    assert re.search(rb'Extrato mar', conteudo)
+    conteudo.close()
+    assert store.texto('a.pdf') == 'Extrato março ' + 'x' * 60
+    assert store.metadados('a.pdf')['doc_type'] == 'extrato_bancario'
+
+    store.fechar()
+    assert not os.listdir(tmp_path)
+
+
+def test_substituir_documento_atualiza_orcamento():
+    store = DocumentTextStore(orcamento_bytes=1000)
+    store.adicionar('a.pdf', 'x' * 300)
+    store.adicionar('a.pdf', 'y' * 10)
+    assert len(store) == 1
+    assert store.bytes_residentes == 10
+    assert store.texto('a.pdf') == 'y' * 10
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Harness de equivalência: alimenta AnaliseIncremental documento a documento e, após cada
+lote, compara os agregados com o recálculo completo sobre todo o histórico acumulado.
+"""
+
+import importlib
+import sys
+sys.path.append('attached_assets')
+
+import numpy as np
+import pandas as pd
+import pytest
+
+categorization_logic = importlib.import_module('categorization_logic_1750515734451_1750930357059')
+financial_analysis = importlib.import_module('financial_analysis_1750515734457_1750930356985')
+report_generation = importlib.import_module('report_generation_1750515734458_1750930356953')
+
+TIPOS_DIARIOS = ('Movimentação Circular (Pass-through)', 'Possível Estruturação (Pequenas Saídas)')
+
+
+def gerar_documentos(n_documentos: int, seed: int) -> list[pd.DataFrame]:
+    """Documentos sintéticos com períodos sobrepostos (lotes novos também caem em dias já vistos)."""
+    rng = np.random.default_rng(seed)
+    descricoes = ['PIX RECEBIDO FULANO', 'PIX ENVIADO CICLANO', 'SUPERMERCADO', 'UBER TRIP', 'PAGAMENTO BET365',
+                  'PIX BETANO PREMIO', 'ESTORNO LOJA', 'PGTO FAT CARTAO', 'SALARIO EMPRESA', 'TARIFA']
+    documentos = []
+    for i in range(n_documentos):
+        n = int(rng.integers(20, 200))
+        inicio = np.datetime64('2025-01-01') + np.timedelta64(int(rng.integers(0, 120)), 'D')
+        valores = np.round(rng.lognormal(5, 1.2, n), 2) * np.where(rng.random(n) < 0.6, -1, 1)
+        documentos.append(pd.DataFrame({
+            'date': pd.to_datetime(inicio + rng.integers(0, 45 * 24 * 60, n).astype('timedelta64[m]')),
+            'description': rng.choice(descricoes, n),
+            'value': valores,
+            'doc_type': 'fatura_cartao' if i % 3 == 2 else 'extrato_bancario',
+        }))
+    return documentos
+
+
+def comparar_com_recalculo(analise, historico: pd.DataFrame) -> None:
+    completo = categorization_logic.categorizar_em_buckets(historico.copy())
+    selecionar = categorization_logic.selecionar_bucket
+
+    esperado = report_generation.resumir_extrato(selecionar(completo, 'entrada_extrato'), selecionar(completo, 'saida_extrato'))
+    obtido = report_generation.resumir_extrato(analise.visao('entrada_extrato'), analise.visao('saida_extrato'))
+    pd.testing.assert_frame_equal(obtido, esperado, rtol=1e-9)
+
+    for bucket in categorization_logic.BUCKETS:
+        assert analise.total(bucket) == pytest.approx(selecionar(completo, bucket)['value'].sum(), rel=1e-9, abs=1e-6)
+
+    assert analise.score() == financial_analysis.calculate_score(selecionar(completo, 'entrada_extrato', 'saida_extrato'))
+
+    alertas = [a for a in financial_analysis.detectar_movimentacoes_suspeitas(completo) if a['TIPO'] in TIPOS_DIARIOS]
+    assert analise.alertas_diarios() == alertas
+
+    diario = financial_analysis.agregar_extrato_diario(completo)
+    pd.testing.assert_series_equal(analise.saldo_diario(), (diario['entrada'] - diario['saida']).cumsum(), rtol=1e-9)
+
+    apostas = financial_analysis.detectar_apostas_aprimorado(completo)
+    totais = analise.totais_apostas()
+    assert totais.get('qtd_saida', 0) == sum(a['TIPO'].startswith('Saída') for a in apostas)
+    assert totais.get('qtd_entrada', 0) == sum(a['TIPO'].startswith('Entrada') for a in apostas)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_incremental_equivale_ao_recalculo_completo(seed):
+    analise = financial_analysis.AnaliseIncremental()
+    historico = pd.DataFrame()
+    for documento in gerar_documentos(8, seed):
+        # Mesmo critério de deduplicação do FinancialAnalysisSystem: só as linhas novas entram no lote
+        inicial = len(historico)
+        historico = pd.concat([historico, documento], ignore_index=True).drop_duplicates(subset=['date', 'description', 'value'])
+        novas = historico[historico.index >= inicial]
+        analise.adicionar(categorization_logic.categorizar_em_buckets(novas.copy()))
+        historico = historico.reset_index(drop=True)
+        comparar_com_recalculo(analise, historico)
+    assert analise.total_transacoes == len(historico)
+
+
+def test_lote_informa_dias_e_meses_afetados():
+    analise = financial_analysis.AnaliseIncremental()
+    lote = categorization_logic.categorizar_em_buckets(pd.DataFrame({
+        'date': pd.to_datetime(['2025-03-01 10:00', '2025-03-01 18:00', '2025-04-02 09:00']),
+        'description': ['PIX RECEBIDO', 'PIX ENVIADO', 'UBER'],
+        'value': [1000.0, -900.0, -20.0],
+        'doc_type': ['extrato_bancario', 'extrato_bancario', 'fatura_cartao'],
+    }))
+    afetados = analise.adicionar(lote)
+    assert afetados['meses'] == ['2025-03', '2025-04']
+    assert afetados['dias'] == [pd.Timestamp('2025-03-01')]
+    assert [a['TIPO'] for a in analise.alertas_diarios()] == ['Movimentação Circular (Pass-through)']
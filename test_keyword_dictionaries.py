@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import random
+import sys
+sys.path.append('attached_assets')
+
+from keyword_dictionaries import KeywordDictionaryStore, obter_dicionarios
+from keyword_matcher import KeywordMatcher, mascara_palavras_chave
+
+
+def _gravar(caminho, sites, versao=1):
+    dados = {
+        'versao': versao,
+        'listas': {'sites_apostas': sites, 'processadoras_pagamento_nao_aposta': ['mercado pago']},
+        'categorias': {'Apostas e Jogos de Azar': ['@sites_apostas', 'aposta']}
+    }
+    caminho.write_text(json.dumps(dados), encoding='utf-8')
+    # Garante mtime diferente mesmo em sistemas de arquivos com baixa resolução
+    os.utime(caminho, ns=(versao * 10**9, versao * 10**9))
+
+
+def test_matcher_equivale_a_busca_por_substring():
+    random.seed(7)
+    for _ in range(200):
+        termos = [''.join(random.choices('ab.- ', k=random.randint(1, 4))) for _ in range(random.randint(1, 15))]
+        matcher = KeywordMatcher(termos)
+        for _ in range(30):
+            texto = ''.join(random.choices('abc.- ', k=random.randint(0, 12)))
+            assert matcher.contem(texto) == any(t in texto for t in termos)
+
+
+def test_mascara_exclui_processadoras_e_ignora_nulos():
+    mascara = mascara_palavras_chave(['PIX BET365', 'Mercado Pago Bet365', None, 'pix bet365'],
+                                     KeywordMatcher(['bet365']), KeywordMatcher(['mercado pago']))
+    assert mascara.tolist() == [True, False, False, True]
+
+
+def test_recarrega_quando_o_arquivo_muda(tmp_path):
+    caminho = tmp_path / 'dicionarios.json'
+    _gravar(caminho, ['bet365'])
+    store = KeywordDictionaryStore(str(caminho), intervalo_verificacao=0)
+    antes = store.atual()
+    assert antes.sites_apostas.contem('PIX BET365')
+    assert not antes.sites_apostas.contem('PIX NOVACASA')
+
+    _gravar(caminho, ['bet365', 'novacasa'], versao=2)
+    depois = store.atual()
+    assert depois.versao != antes.versao
+    assert depois.sites_apostas.contem('PIX NOVACASA')
+    assert dict(depois.categorias)['Apostas e Jogos de Azar'].contem('novacasa')
+    # O snapshot antigo continua consistente para quem já o obteve
+    assert not antes.sites_apostas.contem('PIX NOVACASA')
+
+
+def test_arquivo_invalido_mantem_versao_anterior(tmp_path):
+    caminho = tmp_path / 'dicionarios.json'
+    _gravar(caminho, ['bet365'])
+    store = KeywordDictionaryStore(str(caminho), intervalo_verificacao=0)
+    versao = store.atual().versao
+
+    caminho.write_text('{ invalido', encoding='utf-8')
+    os.utime(caminho, ns=(5 * 10**9, 5 * 10**9))
+    assert store.atual().versao == versao
+
+    # JSON válido, mas com outra forma: lista no topo, lista no lugar do objeto, termo que não é texto
+    for mtime, conteudo in enumerate([[1, 2], {'listas': ['bet365']}, {'listas': {'sites_apostas': [1]}}], start=6):
+        caminho.write_text(json.dumps(conteudo), encoding='utf-8')
+        os.utime(caminho, ns=(mtime * 10**9, mtime * 10**9))
+        assert store.atual().versao == versao
+
+
+def test_dicionario_padrao_carrega_listas_do_config():
+    dicionarios = obter_dicionarios()
+    assert dicionarios.sites_apostas.contem('Pagamento BETANO')
+    assert dicionarios.processadoras.contem('PAGSEGURO INTERNET IP S.A.')
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib
+import sys
+sys.path.append('attached_assets')
+
+import pandas as pd
+
+financial_analysis = importlib.import_module('financial_analysis_1750515734457_1750930356985')
+
+
+def _transacoes():
+    return pd.DataFrame({
+        'date': pd.to_datetime(['2025-01-05', '2025-01-06', '2025-01-07', '2025-02-01', '2025-02-02', '2025-02-03']),
+        'description': ['SALARIO', 'ALUGUEL', 'MERCADO', 'FREELA', 'UBER', 'FARMACIA'],
+        'value': [5000.0, -1800.0, -300.0, 1200.0, -40.0, -95.0],
+        'specific_category': ['Salário', 'Moradia', 'Alimentação', 'Outros/Diversos', 'Transporte', 'Saúde'],
+        'original_type_op': ['PIX', 'Débito', 'Débito', 'PIX', 'Débito', 'Débito'],
+    })
+
+
+def test_varios_limites_e_fluxos_numa_chamada():
+    maiores = financial_analysis.maiores_transacoes(_transacoes(), limites=[1, 3])
+    assert maiores['Saída'][1]['description'].tolist() == ['ALUGUEL']
+    assert maiores['Saída'][3]['description'].tolist() == ['ALUGUEL', 'MERCADO', 'FARMACIA']
+    assert maiores['Entrada'][3]['description'].tolist() == ['SALARIO', 'FREELA']
+
+
+def test_top_k_por_mes():
+    maiores = financial_analysis.maiores_transacoes(_transacoes(), limites=1, fluxos=('Saída',), por='mes')
+    assert maiores['Saída'][1]['description'].tolist() == ['ALUGUEL', 'FARMACIA']
+
+
+def test_formato_legado():
+    assert financial_analysis.extrair_maiores_transacoes(_transacoes(), 'Saída', 1) == [{
+        'DATA': '06/01/2025', 'TIPO': 'Débito', 'CATEGORIA_ESPECIFICA': 'Moradia',
+        'DESCRICAO': 'ALUGUEL', 'VALOR': 'R$ 1.800,00',
+    }]
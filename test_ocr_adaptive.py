@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import sys
+sys.path.append('attached_assets')
+
+import numpy as np
+import pytest
+
+from ocr_adaptive import CachePreprocessamento, binarizar, caixa_antes_da_rotacao, estimar_inclinacao
+from ocr_engine import ImagemBruta, linhas_de_tsv
+
+
+def pagina_com_linhas(inclinacao_graus: float, largura: int = 800, altura: int = 600) -> np.ndarray:
+    """Página cinza-clara com "linhas de texto" escuras descendo `inclinacao_graus` para a direita."""
+    pixels = np.full((altura, largura), 230, dtype=np.uint8)
+    xs = np.arange(50, largura - 50)
+    for y0 in range(60, altura - 60, 40):
+        ys = np.round(y0 + xs * math.tan(math.radians(inclinacao_graus))).astype(int)
+        for espessura in range(3):
+            pixels[ys + espessura, xs] = 20
+    return pixels
+
+
+def test_binarizar_separa_tinta_do_fundo():
+    binaria = binarizar(pagina_com_linhas(0))
+    assert set(np.unique(binaria)) == {0, 255}
+    assert (binaria == 0).sum() == (pagina_com_linhas(0) == 20).sum()
+    assert set(np.unique(binarizar(np.full((10, 10), 200, dtype=np.uint8)))) == {255}
+
+
+@pytest.mark.parametrize('inclinacao', [0.0, 1.5, -2.0])
+def test_estimar_inclinacao(inclinacao):
+    assert estimar_inclinacao(binarizar(pagina_com_linhas(inclinacao))) == pytest.approx(inclinacao, abs=0.25)
+
+
+def test_caixa_antes_da_rotacao():
+    assert caixa_antes_da_rotacao((10, 20, 30, 40), 0.0, 100, 100) == pytest.approx((10, 20, 30, 40))
+    # Após girar 90° no sentido anti-horário, o ponto acima do centro estava à direita dele
+    x0, y0, x1, y1 = caixa_antes_da_rotacao((50, 20, 50, 20), 90.0, 100, 100)
+    assert (x0, y0) == pytest.approx((80, 50))
+
+
+def test_cache_preprocessamento_pelo_conteudo():
+    cache = CachePreprocessamento(tamanho=1)
+    pixels = pagina_com_linhas(0)
+    imagem, angulo = cache.preprocessar(ImagemBruta(pixels.tobytes(), 800, 600, 800))
+    assert angulo == 0.0 and set(np.frombuffer(imagem.dados, dtype=np.uint8)) == {0, 255}
+    # Mesmo conteúdo em outro buffer: vem do cache
+    assert cache.preprocessar(ImagemBruta(bytearray(pixels.tobytes()), 800, 600, 800))[0] is imagem
+    cache.preprocessar(ImagemBruta(pagina_com_linhas(0, altura=500).tobytes(), 800, 500, 800))
+    assert (cache.acertos, cache.falhas) == (1, 2)
+    assert cache.preprocessar(ImagemBruta(pixels.tobytes(), 800, 600, 800))[0] is not imagem  # Descartada (LRU de 1)
+
+
+def test_linhas_de_tsv():
+    tsv = (
+        "level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+        "1\t1\t0\t0\t0\t0\t0\t0\t1000\t1000\t-1\t\n"
+        "5\t1\t1\t1\t1\t1\t10\t20\t50\t12\t96.0\t01/05\n"
+        "5\t1\t1\t1\t1\t2\t70\t18\t80\t14\t40.0\tPIX\n"
+        "5\t2\t1\t1\t1\t1\t5\t5\t20\t10\t90\tR$\n"
+    )
+    primeira, segunda, terceira = linhas_de_tsv(tsv, 3)
+    assert primeira == [{'texto': '01/05 PIX', 'confianca': 68.0, 'caixa': (10, 18, 150, 32)}]
+    assert [linha['texto'] for linha in segunda] == ['R$'] and terceira == []
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('attached_assets')
+
+import pytest
+
+from brazilian_banks_parser import BrazilianBanksParser
+from parser_registry import BANCOS_PADRAO, REGISTRO_PARSERS, RegistroParsers
+from transaction_regex import OrcamentoRegex
+
+
+@pytest.mark.parametrize('nome_arquivo, banco', [
+    ('extrato_c6_interno.pdf', 'C6 Bank'),  # 'c6' tem prioridade sobre 'inter'
+    ('NU_PAGAMENTOS_fatura.csv', 'Nubank'),
+    ('extrato_inter_maio.csv', 'Banco Inter'),
+    ('fatura_itau.pdf', 'Itaú'),
+    ('documento.pdf', 'Desconhecido'),
+])
+def test_banco_por_arquivo(nome_arquivo, banco):
+    assert REGISTRO_PARSERS.banco_por_arquivo(nome_arquivo) == banco
+
+
+def test_selecionar_ordena_por_sniff_e_filtra_tipo_e_entrada():
+    texto = "NU PAGAMENTOS S.A.\nExtrato de conta\nNUBANK\n12/03 - Pix recebido - R$ 10,00\n"
+    assert [p.nome for p in REGISTRO_PARSERS.selecionar('extrato_bancario', 'texto', 'extrato.pdf', texto)] == ['nubank_extrato_pdf']
+    # Nome do arquivo de um banco, texto citando outro: o nome pesa mais
+    candidatos = REGISTRO_PARSERS.selecionar('extrato_bancario', 'texto', 'extrato_caixa.pdf', "PIX PARA NUBANK")
+    assert [p.nome for p in candidatos] == ['caixa_extrato_pdf', 'nubank_extrato_pdf']
+    assert [p.nome for p in REGISTRO_PARSERS.selecionar('fatura_cartao', 'tabela', 'fatura_nubank.csv')] == ['nubank_fatura_csv']
+    assert REGISTRO_PARSERS.selecionar('extrato_bancario', 'tabela', 'extrato.csv') == []
+
+
+def test_modulo_do_parser_so_e_importado_no_uso():
+    registro = RegistroParsers(BANCOS_PADRAO, [{
+        'nome': 'inexistente', 'banco': 'PicPay', 'modulo': 'modulo_que_nao_existe', 'funcao': 'parse',
+        'tipos_documento': ['extrato_bancario'], 'entradas': ['texto'],
+    }])
+    [parser] = registro.selecionar('extrato_bancario', 'texto', 'extrato_picpay.pdf')
+    with pytest.raises(ModuleNotFoundError):
+        parser.funcao
+
+
+def test_tabela_roteada_pelo_cabecalho_sem_nome_de_arquivo():
+    # Acentos, maiúsculas, pontos e ordem das colunas não mudam a assinatura
+    colunas = ['DATA MOV', 'historico', 'Nr Doc', 'Saldo', 'Valor']
+    assert REGISTRO_PARSERS.parser_por_cabecalho(colunas, 'extrato_bancario').nome == 'caixa_extrato_csv'
+    # Mesmo cabeçalho em dois formatos: o tipo do documento desempata; sem ele, nenhum parser
+    assert REGISTRO_PARSERS.parser_por_cabecalho(['Data', 'Descrição', 'Valor'], 'fatura_cartao').nome == 'inter_fatura_csv'
+    assert REGISTRO_PARSERS.parser_por_cabecalho(['Data', 'Descrição', 'Valor'], 'extrato_bancario').nome == 'nubank_extrato_csv'
+    assert REGISTRO_PARSERS.parser_por_cabecalho(['Data', 'Descrição', 'Valor'], 'desconhecido') is None
+    assert REGISTRO_PARSERS.parser_por_cabecalho(['Data', 'Observação'], 'extrato_bancario') is None
+
+
+def test_tabela_roteada_chega_ao_parser_com_os_nomes_que_ele_le(monkeypatch):
+    import pandas as pd
+    import parser_registry
+    import data_parsing_1750515734453_1750930357029 as data_parsing
+
+    # Na sessão, as funções auxiliares de data_parsing ficam visíveis para a célula dos parsers
+    modulo = parser_registry.carregar_funcao('dataframe_parsers', 'process_caixa_extrato_csv').__globals__
+    for nome in ('parse_date_string', 'parse_financial_value', '_identificar_tipo_transacao_simples'):
+        monkeypatch.setitem(modulo, nome, getattr(data_parsing, nome))
+
+    tabela = pd.DataFrame({'DATA MOV': ['05/05/2025'], 'historico': ['PIX RECEBIDO'], 'Nr Doc': ['1'], 'Saldo': ['150,00'], 'Valor': ['50,00']})
+    parser, roteada = REGISTRO_PARSERS.rotear_tabela(tabela, 'extrato_bancario')
+    assert parser.nome == 'caixa_extrato_csv'
+    assert list(roteada.columns) == ['Data Mov.', 'Histórico', 'Nr. Doc.', 'Saldo', 'Valor']
+    [transacao] = parser.funcao(roteada, 'extrato_bancario')
+    assert (transacao['description'], transacao['value'], transacao['balance']) == ('PIX RECEBIDO', 50.0, 150.0)
+    desconhecida = tabela.rename(columns={'Nr Doc': 'Outra'})
+    assert REGISTRO_PARSERS.rotear_tabela(desconhecida, 'extrato_bancario') == (None, desconhecida)
+
+
+def test_mapeamento_de_cabecalho_desconhecido_e_inferido_uma_vez(monkeypatch):
+    import types
+    import pandas as pd
+    import parser_registry
+
+    chamadas = []
+    def mapear(df):
+        chamadas.append(list(df.columns))
+        return {'data': df.columns[0], 'descricao': df.columns[1], 'valor': df.columns[2]}
+    monkeypatch.setitem(parser_registry._MODULOS_CARREGADOS, 'dataframe_parsers', types.SimpleNamespace(_mapear_colunas_automaticamente=mapear))
+
+    registro = RegistroParsers()
+    mapeamento = registro.mapeamento_colunas(pd.DataFrame(columns=['Data Lançamento', 'Descrição', 'Valor (R$)']))
+    assert mapeamento == {'data': 'Data Lançamento', 'descricao': 'Descrição', 'valor': 'Valor (R$)'}
+    # Mesmo formato com outra grafia: vem do cache, traduzido para as colunas desta tabela
+    mapeamento = registro.mapeamento_colunas(pd.DataFrame(columns=['DATA LANCAMENTO', 'descricao', 'valor (r$)']))
+    assert mapeamento == {'data': 'DATA LANCAMENTO', 'descricao': 'descricao', 'valor': 'valor (r$)'}
+    assert len(chamadas) == 1
+
+
+def test_modo_extracao_pdf_pelo_parser_reconhecido():
+    # Extrato da Caixa: o parser lê o texto, as tabelas não são extraídas
+    assert REGISTRO_PARSERS.modo_extracao_pdf('extrato.pdf', 'CAIXA ECONÔMICA FEDERAL\nExtrato por período') == 'texto'
+    assert REGISTRO_PARSERS.modo_extracao_pdf('fatura_c6.pdf') == 'texto'
+    # Banco sem parser de PDF registrado: tabelas só das páginas com grade
+    assert REGISTRO_PARSERS.modo_extracao_pdf('extrato_pagbank.pdf', 'PAGBANK') == 'auto'
+    # Só parsers do tipo do documento: a fatura do C6 não tem parser de PDF de extrato
+    assert REGISTRO_PARSERS.modo_extracao_pdf('fatura_c6.pdf', doc_type='fatura_cartao') == 'texto'
+    assert REGISTRO_PARSERS.modo_extracao_pdf('extrato_c6.pdf', doc_type='extrato_bancario') == 'auto'
+
+
+def test_modo_de_extracao_invalido_e_recusado():
+    from file_io_utils_1750515734455_1750930356999 import handle_uploaded_file
+    with pytest.raises(ValueError):
+        handle_uploaded_file('extrato.pdf', 'pdf', extraction_mode='tabela')
+
+
+@pytest.mark.parametrize('texto, banco', [
+    # O banco do cabeçalho vence os bancos das contrapartes nas transações
+    ("BANCO ITAU S.A. extrato conta corrente\n05/05/2025 TED BRADESCO JOAO 100,00 D", 'itau'),
+    ("Itaú Unibanco ag 1234 cc 12345-6\n05/05/2025 PIX SANTANDER MARIA 50,00 C", 'itau'),
+    ("NU PAGAMENTOS S.A.\nPix enviado CAIXA ECONOMICA FEDERAL", 'nubank'),
+    # Grafias sem acento e nomes curtos do banco
+    ("CAIXA ECONOMICA FEDERAL CEF extrato", 'caixa'),
+    ("Stone extrato da conta", 'stone'),
+    ("Extrato KEYSTONE LTDA", None),  # Só palavras inteiras
+])
+def test_detect_bank_pelo_cabecalho_com_contrapartes_de_outros_bancos(texto, banco):
+    assert BrazilianBanksParser().detect_bank(texto) == banco
+
+
+def test_selecionar_prefere_o_banco_do_cabecalho_ao_da_contraparte():
+    texto = "BANCO ITAU S.A. extrato conta corrente\n05/05/2025 TED BRADESCO JOAO 100,00 D 900,00 C\n"
+    candidatos = REGISTRO_PARSERS.selecionar('extrato_bancario', 'texto', 'extrato.pdf', texto)
+    assert [p.nome for p in candidatos] == ['itau_extrato_pdf', 'bradesco_extrato_pdf']
+
+
+def test_extratos_do_parser_unificado_sao_escolhidos_pelo_registro():
+    texto = "BANCO ITAÚ S.A.\nExtrato conta corrente\n05/05/2025 PIX RECEBIDO JOAO 250,00 C 1.250,00 C\n"
+    # O banco do parser unificado vem dos identificadores do registro, no código dos parsers
+    assert BrazilianBanksParser().detect_bank(texto) == REGISTRO_PARSERS.codigo_banco('Itaú') == 'itau'
+    assert BrazilianBanksParser().detect_bank("Banco do Brasil S.A. - extrato") == 'bb'
+    assert BrazilianBanksParser().detect_bank("sem banco") is None
+
+    [parser] = REGISTRO_PARSERS.selecionar('extrato_bancario', 'texto', 'extrato.pdf', texto)
+    assert parser.nome == 'itau_extrato_pdf'
+    [transacao] = parser.funcao(texto, 'extrato_bancario')
+    assert (transacao['value'], transacao['balance'], transacao['bank']) == (250.0, 1250.0, 'itau')
+
+
+def test_parsers_de_texto_informam_orcamento_de_regex_esgotado():
+    # Texto que cada parser reconhece como seu; com o prazo já vencido nada é extraído e o chamador fica sabendo
+    texto = "CAIXA ECONÔMICA FEDERAL\nExtrato por período\nSALDO ANTERIOR 1.000,00\n05/05/2025 PIX RECEBIDO JOAO 250,00 C 1.250,00 C\n"
+    for parser in REGISTRO_PARSERS.parsers:
+        if 'texto' not in parser.entradas:
+            continue
+        orcamento = OrcamentoRegex(segundos=-1.0)
+        assert parser.funcao(texto, parser.tipos_documento[0], orcamento) == []
+        assert orcamento.esgotado, parser.nome
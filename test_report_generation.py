@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import importlib
+import sys
+sys.path.append('attached_assets')
+
+import pandas as pd
+
+data_parsing = importlib.import_module('data_parsing_1750515734453_1750930357029')
+report_generation = importlib.import_module('report_generation_1750515734458_1750930356953')
+# Função que o módulo espera encontrar na sessão (ver comentários de import em report_generation)
+report_generation.extrair_cabecalho_fatura = data_parsing.extrair_cabecalho_fatura
+
+
+def _transacoes(valores, categorias):
+    return pd.DataFrame({'value': valores, 'specific_category': categorias, 'description': 'x'})
+
+
+def test_resumo_extrato_numerico_combina_periodos():
+    maio = report_generation.resumir_extrato(_transacoes([1000.0, 250.5], ['Salário', 'PIX Recebido']),
+                                             _transacoes([-300.0], ['Alimentação']))
+    junho = report_generation.resumir_extrato(_transacoes([1000.0], ['Salário']), _transacoes([], []))
+    assert maio.dtypes.eq('float64').all()
+
+    combinado = maio.add(junho, fill_value=0)
+    assert combinado.loc['Salário', 'Entrada'] == 2000.0
+    assert combinado.loc['Alimentação', 'Saída'] == -300.0
+
+    formatado = report_generation.formatar_resumo_extrato(combinado)
+    assert formatado.loc['Total Geral', 'Entrada'] == 'R$ 2.250,50'
+    assert formatado.loc['Alimentação', '% do Total de Saída'] == '100.00%'
+
+
+def test_tabela_metricas_e_formatacao_pt_br():
+    texto = "Valor da fatura: R$ 1.234,56\nVencimento: 10/06/2025"
+    tabela = report_generation.resumir_fatura(_transacoes([-1500.0, -500.0], ['Alimentação', 'Transporte']),
+                                              _transacoes([], []), texto)
+    assert tabela['Valor'].dtype == 'float64'
+    assert tabela['Data'].dtype.kind == 'M'
+
+    formatado = report_generation.formatar_tabela_metricas(tabela).set_index('Métrica')['Valor']
+    assert formatado['Valor Total da Fatura (Vencimento)'] == 'R$ 1.234,56'
+    assert formatado['Data de Vencimento'] == '10/06/2025'
+    assert formatado['Limite Total do Cartão'] == 'Não Identificado'
+    assert formatado['- Alimentação'] == 'R$ -1.500,00 (75,00%)'
+
+
+def test_resumo_geral_sem_entradas():
+    vazio = _transacoes([], [])
+    tabela = report_generation.resumir_financeiro_geral(vazio, _transacoes([-10.0], ['Outros/Diversos']), vazio, vazio)
+    formatado = report_generation.formatar_tabela_metricas(tabela).set_index('Métrica')['Valor']
+    assert formatado['Saídas (Extrato) em % das Entradas (Extrato)'] == 'N/A (Sem Entradas)'
+    assert formatado['Total de Saídas (Extrato)'] == 'R$ -10,00'
+
+
+def test_cabecalho_fatura_lido_das_janelas_e_consolidado():
+    corpo = 'COMPRA 10/05 LOJA 12,00\n' * 2000  # Lançamentos entre o resumo e o boleto
+    primeira = data_parsing.extrair_cabecalho_fatura(
+        'Valor da fatura: R$ 980,00\nLimite total: R$ 3.000,00\n' + corpo + 'Vencimento: 15/07/2025\nPagamento mínimo ou parcial'
+    )
+    assert primeira['total_fatura'] == 980.0
+    assert primeira['limite_total'] == 3000.0
+    assert primeira['vencimento'].strftime('%d/%m/%Y') == '15/07/2025'
+    assert primeira['pagamento_minimo'] is True
+
+    segunda = data_parsing.extrair_cabecalho_fatura('Disponível R$ 1.200,00\n' + corpo + 'Limite total: R$ 9.999,00')
+    consolidado = data_parsing.consolidar_cabecalhos_fatura([{'arquivo': 'a.pdf', **primeira}, segunda])
+    assert consolidado['limite_total'] == 3000.0
+    assert consolidado['limite_disponivel'] == 1200.0
+    assert 'arquivo' not in consolidado
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import sys
+sys.path.append('attached_assets')
+
+import pandas as pd
+
+from brazilian_banks_parser import BrazilianBanksParser
+from parser_registry import REGISTRO_PARSERS
+from transaction_dedup import DeduplicadorTransacoes, normalizar_descricao
+
+
+def test_normaliza_descricao_bruta_e_limpa():
+    # Caixa: código do histórico (CSV) e descrição limpa pelo parser do PDF
+    assert normalizar_descricao('CRED PIX FULANO') == normalizar_descricao('Recebimento PIX FULANO')
+    # Parser unificado: title case e pontuação removida
+    assert normalizar_descricao('PAG*Padaria São João') == normalizar_descricao('Pag Padaria Sao Joao')
+
+
+def test_sobreposicao_entre_pdf_e_csv_preserva_repeticoes_reais():
+    csv = pd.DataFrame({
+        'date': pd.to_datetime(['2025-05-05', '2025-05-05', '2025-05-05', '2025-05-06']),
+        'description': ['CAFE DO PONTO', 'CAFE DO PONTO', 'ENVIO PIX MARIA', 'CRED PIX JOAO'],
+        'value': [-6.5, -6.5, -100.0, 250.0],
+        'bank': REGISTRO_PARSERS.banco_por_arquivo('extrato_caixa_maio.csv'),
+    })
+    pdf = pd.DataFrame({
+        'date': ['2025-05-05T00:00:00', '2025-05-05T00:00:00', '2025-05-05T00:00:00', '2025-05-05T00:00:00', '2025-05-07T00:00:00'],
+        'description': ['Cafe Do Ponto', 'Cafe Do Ponto', 'Cafe Do Ponto', 'Transferência PIX MARIA', 'Recebimento PIX JOAO'],
+        'value': [-6.5, -6.5, -6.5, -100.0, 250.0],
+        'bank': 'Caixa Econômica Federal',  # Como o parser do extrato em PDF da Caixa grava
+    })
+    deduplicador = DeduplicadorTransacoes()
+    assert deduplicador.registrar(csv).all()  # Os dois cafés do mesmo dia são transações distintas
+    # Só o terceiro café e o PIX de outro dia são novos
+    assert deduplicador.registrar(pdf).tolist() == [False, False, True, False, True]
+    assert len(deduplicador) == 6
+
+    # Mesma transação em outro banco não é duplicata
+    outro_banco = csv.iloc[[0]].assign(bank=REGISTRO_PARSERS.banco_por_arquivo('extrato_nubank.csv'))
+    assert deduplicador.registrar(outro_banco).tolist() == [True]
+
+
+
+def test_pdf_com_codigo_do_parser_e_csv_pelo_nome_do_arquivo_sao_o_mesmo_banco():
+    texto = (
+        "BANCO INTER S.A.\nExtrato\n"
+        "05/05/2025 Compra cafe do ponto R$ 6,50\n"
+        "05/05/2025 Compra cafe do ponto R$ 6,50\n"
+        "06/05/2025 Pix recebido joao R$ 250,00\n"
+    )
+    pdf = pd.DataFrame(BrazilianBanksParser().parse_bank_statement(texto, 'inter'))
+    assert pdf['bank'].unique().tolist() == ['inter']  # Código do parser, não o nome do registro
+    deduplicador = DeduplicadorTransacoes()
+    assert deduplicador.registrar(pdf).all()
+
+    # CSV do mesmo período, com o banco completado pelo nome do arquivo (como em process_document)
+    csv = pd.DataFrame({
+        'date': pd.to_datetime(['2025-05-05', '2025-05-05', '2025-05-06', '2025-05-06']),
+        'description': ['COMPRA CAFE DO PONTO', 'COMPRA CAFE DO PONTO', 'PIX RECEBIDO JOAO', 'PIX RECEBIDO MARIA'],
+        'value': [-6.5, -6.5, 250.0, 80.0],
+    })
+    inter = csv.assign(bank=REGISTRO_PARSERS.banco_por_arquivo('extrato_inter_maio.csv'))
+    assert inter['bank'].iloc[0] == 'Banco Inter'
+    assert deduplicador.registrar(inter).tolist() == [False, False, False, True]
+
+    # Arquivo que não identifica o banco: compara só dia, valor e descrição, com qualquer banco
+    sem_banco = csv.assign(bank=REGISTRO_PARSERS.banco_por_arquivo('extrato.csv'))
+    assert sem_banco['bank'].iloc[0] == 'Desconhecido'
+    assert deduplicador.registrar(sem_banco).tolist() == [False, False, False, False]
+
+    # Banco identificado e diferente continua sendo outra transação
+    outro_banco = csv.iloc[[0]].assign(bank=REGISTRO_PARSERS.banco_por_arquivo('extrato_nubank.csv'))
+    assert deduplicador.registrar(outro_banco).tolist() == [True]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+sys.path.append('attached_assets')
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+from transaction_store import TransactionStore
+
+
+def _transacoes(linhas):
+    return pd.DataFrame(linhas, columns=['date', 'description', 'value', 'doc_type'])
+
+
+def test_anexa_por_mes_sem_duplicar(tmp_path):
+    store = TransactionStore(str(tmp_path), 'cliente 123/a')
+    maio = _transacoes([
+        ('2025-05-02', 'PIX RECEBIDO', 1500.0, 'extrato_bancario'),
+        ('2025-05-10', 'MERCADO', -120.5, 'extrato_bancario'),
+        ('2025-06-01', 'ALUGUEL', -900.0, 'extrato_bancario'),
+    ])
+    assert store.anexar(maio, documento='maio.pdf') == 3
+    assert store.meses() == ['2025-05', '2025-06']
+
+    # Segundo extrato repete uma transação de junho e traz uma nova
+    junho = _transacoes([
+        ('2025-06-01', 'ALUGUEL', -900.0, 'extrato_bancario'),
+        ('2025-06-05', 'SALARIO', 4000.0, 'extrato_bancario'),
+        (None, 'SEM DATA', 10.0, 'extrato_bancario'),
+    ])
+    assert store.anexar(junho, documento='junho.pdf') == 2
+    assert len(os.listdir(os.path.join(store.diretorio, 'mes=2025-05'))) == 1  # Maio não foi reescrito
+
+    tudo = store.carregar()
+    assert len(tudo) == 5
+    assert tudo['date'].dtype.kind == 'M'
+    assert sorted(store.carregar(meses=['2025-06'])['documento']) == ['junho.pdf', 'maio.pdf']
+
+
+def test_compactar_mantem_as_transacoes(tmp_path):
+    store = TransactionStore(str(tmp_path), 'c1')
+    for dia in range(1, 4):
+        store.anexar(_transacoes([(f'2025-05-0{dia}', 'PIX', -10.0 * dia, 'extrato_bancario')]))
+    store.compactar('2025-05')
+    assert os.listdir(os.path.join(store.diretorio, 'mes=2025-05')) == ['parte-000004.arrow']
+    assert store.carregar()['value'].tolist() == [-10.0, -20.0, -30.0]
+
+
+def test_assinatura_muda_com_as_partes_e_acompanha_o_indice_salvo(tmp_path):
+    from balance_index import RunningBalanceIndex
+
+    store = TransactionStore(str(tmp_path), 'c1')
+    store.anexar(_transacoes([('2025-05-01', 'PIX', -10.0, 'extrato_bancario')]))
+    assinatura = store.assinatura()
+    assert assinatura == store.assinatura()  # Só lê os metadados das partes, sem mudar nada
+
+    caminho = str(tmp_path / 'indice.npz')
+    assert RunningBalanceIndex.assinatura_salva(caminho) is None
+    RunningBalanceIndex.de_transacoes(store.carregar()).salvar(caminho, assinatura)
+    assert RunningBalanceIndex.assinatura_salva(caminho) == assinatura
+
+    store.anexar(_transacoes([('2025-05-02', 'PIX', -20.0, 'extrato_bancario')]))
+    depois_do_anexo = store.assinatura()
+    assert depois_do_anexo != assinatura
+    store.compactar('2025-05')
+    assert store.assinatura() not in (assinatura, depois_do_anexo)